@@ -2,7 +2,7 @@
 import asyncio
 import threading
 from importlib import import_module
-from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
 
 from httpx import HTTPStatusError
 
@@ -10,8 +10,12 @@ from api4jenkins.mix import UrlMixIn
 
 from .credential import AsyncCredentials, Credentials
 from .exceptions import ItemNotFoundError
-from .http import new_async_http_client, new_http_client
-from .item import AsyncItem, Item
+from .http import (AdaptiveLimiter, CircuitBreaker, RateLimiter,
+                   ResponseCache, SingleFlight, new_async_http_client,
+                   new_http_client, new_json_decoder)
+from .batch import AsyncBuildBatch, BuildBatch, BuildRequest
+from .index import JobIndex
+from .item import AsyncItem, Item, new_item, resolve_class
 from .job import AsyncFolder, AsyncProject, Folder
 from .node import AsyncNodes, Nodes
 from .plugin import AsyncPluginsManager, PluginsManager
@@ -29,6 +33,26 @@ class Jenkins(Item, UrlMixIn):
 
     :param url: URL of Jenkins server, ``str``
     :param auth: (optional) Auth ``tuple`` to enable Basic/Digest/Custom HTTP Auth.
+    :param pool: (optional) connection pool settings, ``httpx.Limits`` or
+        ``dict`` with keys ``max_connections``, ``max_keepalive_connections``,
+        ``keepalive_expiry`` and ``http2``
+    :param retry: (optional) :class:`Retry <api4jenkins.http.Retry>` or ``int``
+        as maximum retries, retry transient errors with backoff
+    :param rate_limiter: (optional) :class:`RateLimiter <api4jenkins.http.RateLimiter>`
+        to throttle all requests, available as attribute ``rate_limiter``
+    :param circuit_breaker: (optional) :class:`CircuitBreaker <api4jenkins.http.CircuitBreaker>`
+        to fail fast while Jenkins is unavailable, available as attribute
+        ``circuit_breaker``
+    :param cache: (optional) :class:`ResponseCache <api4jenkins.http.ResponseCache>`
+        to reuse ``api/json`` responses, available as attribute ``cache``
+    :param single_flight: (optional) share one request among identical
+        concurrent ``GET`` requests, default is ``True``, available as
+        attribute ``single_flight``
+    :param json_decoder: (optional) callable or module name, e.g. ``orjson``,
+        to decode ``api/json``, default is the first installed one of
+        ``orjson``, ``ujson`` and ``json``
+    :param index: (optional) :class:`JobIndex <api4jenkins.index.JobIndex>`
+        to resolve full name of job locally, available as attribute ``index``
     :param \*\*kwargs: other kwargs are same as `httpx.Client <https://www.python-httpx.org/api/#client>`_
 
     Usage::
@@ -39,10 +63,20 @@ class Jenkins(Item, UrlMixIn):
         <Jenkins: http://127.0.0.1:8080/>
         >>> j.version
         '2.176.2'
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             pool={'max_connections': 50, 'keepalive_expiry': 30})
     '''
 
     def __init__(self, url: str, **kwargs: Any) -> None:
+        # options of client itself, others are passed to http client
+        self.single_flight: Optional[SingleFlight] = SingleFlight() \
+            if kwargs.pop('single_flight', True) else None
+        self.json_decoder = new_json_decoder(kwargs.pop('json_decoder', None))
+        self.index: Optional[JobIndex] = kwargs.pop('index', None)
         self.http_client = new_http_client(**kwargs)
+        self.rate_limiter: Optional[RateLimiter] = kwargs.get('rate_limiter')
+        self.circuit_breaker: Optional[CircuitBreaker] = kwargs.get('circuit_breaker')
+        self.cache: Optional[ResponseCache] = kwargs.get('cache')
         self._crumb: Optional[Dict[str, str]] = None
         self._auth: Optional[Tuple[str, str]] = kwargs.get('auth')
         self._sync_lock = threading.Lock()
@@ -64,14 +98,29 @@ class Jenkins(Item, UrlMixIn):
             >>> print(job)
             <FreeStyleProject: http://127.0.0.1:8080/job/freestylejob/>
         '''
+        if self.index is not None:
+            return self._get_indexed_job(full_name)
         folder, name = self._resolve_name(full_name)
-        if folder.exists():
-            return folder.get(name)
+        return folder.get(name)
 
-    def iter(self, depth: int = 0) -> Iterator[Item]:
+    def _get_indexed_job(self, full_name: str) -> Optional[Item]:
+        parent, name = self._parse_name(full_name)
+        key = f'{parent}/{name}' if parent else name
+        if (item := self.index.get(key)) is None:
+            try:
+                api_json = Folder(self, self._name2url(parent)).api_json(tree='jobs[name,url]')
+            except ItemNotFoundError:
+                return None
+            self.index.refresh(parent, api_json.get('jobs', []))
+            item = self.index.get(key)
+        return new_item(self, 'api4jenkins.job', item) if item else None
+
+    def iter(self, depth: int = 0, stream: bool = False) -> Iterator[Item]:
         '''Iterate jobs with depth
 
         :param depth: ``int``, depth to iterate, default is 0
+        :param stream: ``bool``, yield jobs while response is received
+            instead of loading whole response, default is False
         :returns: iterator of jobs
 
         Usage::
@@ -83,7 +132,25 @@ class Jenkins(Item, UrlMixIn):
             <FreeStyleProject: http://127.0.0.1:8080/job/freestylejob/>
             ...
         '''
-        yield from Folder(self, self.url)(depth)
+        yield from Folder(self, self.url)(depth, stream)
+
+    def crawl(self, depth: int = 0, workers: int = 8) -> Iterator[Item]:
+        '''Iterate same jobs as :meth:`iter`, but list folders one by one with
+        ``workers`` concurrent requests, for controllers on which nested query
+        of :meth:`iter` is too slow
+
+        :param depth: ``int``, depth to iterate, default is 0
+        :param workers: ``int``, max concurrent listings, default is 8
+        :returns: iterator of jobs, in order of listings completed
+
+        Usage::
+
+            >>> from api4jenkins import Jenkins
+            >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'))
+            >>> for job in j.crawl(depth=10, workers=16):
+            ...     print(job)
+        '''
+        yield from Folder(self, self.url).crawl(depth, workers)
 
     def create_job(self, full_name: str, xml: str, recursive: bool = False) -> Any:
         '''Create new jenkins job with given xml configuration
@@ -113,7 +180,9 @@ class Jenkins(Item, UrlMixIn):
         if recursive and not folder.exists():
             self.create_job(folder.full_name, EMPTY_FOLDER_XML,
                             recursive=recursive)
-        return folder.create(name, xml)
+        resp = folder.create(name, xml)
+        self._invalidate_index(folder, name)
+        return resp
 
     def copy_job(self, full_name: str, dest: str) -> Any:
         '''Create job by copying other job, the source job and dest job are in
@@ -132,7 +201,9 @@ class Jenkins(Item, UrlMixIn):
             <FreeStyleProject: http://127.0.0.1:8080/job/folder/job/newjob/>
         '''
         folder, name = self._resolve_name(full_name)
-        return folder.copy(name, dest)
+        resp = folder.copy(name, dest)
+        self._invalidate_index(folder, dest)
+        return resp
 
     def delete_job(self, full_name: str) -> None:
         '''Delete job
@@ -179,6 +250,28 @@ class Jenkins(Item, UrlMixIn):
         job = self._get_job_and_check(full_name)
         return job.build(**params)
 
+    def build_jobs(self, requests: Iterable[BuildRequest], workers: int = 8, wait: bool = False,
+                   interval: float = 1, timeout: Optional[float] = None,
+                   max_errors: int = 3) -> BuildBatch:
+        '''Build many jobs, see :class:`BuildBatch <api4jenkins.batch.BuildBatch>`
+
+        :param requests: full name of job or tuple of full name and parameters
+        :param workers: (optional) concurrent requests to trigger, default is 8
+        :param wait: (optional) wait builds to complete, default is False
+        :param interval: (optional) seconds between polls, default is 1
+        :param timeout: (optional) seconds to wait, ``None`` means forever
+        :param max_errors: (optional) consecutive failed ticks to give up, default is 3
+        :returns: ``BuildBatch`` yields ``(request, build)``
+
+        Usage::
+
+            >>> from api4jenkins import Jenkins
+            >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'))
+            >>> for request, build in j.build_jobs(['job1', ('job2', {'arg': 'v'})]):
+            ...     print(request, build)
+        '''
+        return BuildBatch(self, requests, workers, wait, interval, timeout, max_errors)
+
     def _get_job_and_check(self, full_name: str) -> Item:
         job = self.get_job(full_name)
         if job is None:
@@ -220,6 +313,10 @@ class Jenkins(Item, UrlMixIn):
         parent, name = self._parse_name(full_name)
         return Folder(self, self._name2url(parent)), name
 
+    def _invalidate_index(self, folder: Any, name: str) -> None:
+        if self.index is not None:
+            self.index.invalidate(f'{folder.full_name}/{name}')
+
     # def exists(self):
     #     '''Check if Jenkins server is up
 
@@ -295,12 +392,43 @@ def _patch_to(module: str, cls: Any, func: Optional[Any] = None) -> None:
         setattr(_class, func.__name__, func)
     else:
         setattr(_module, cls.__name__, cls)
+    resolve_class.cache_clear()
 
 
 class AsyncJenkins(AsyncItem, UrlMixIn):
+    r'''Constructs  :class:`AsyncJenkins <AsyncJenkins>`, accepts same
+    arguments as :class:`Jenkins <Jenkins>`.
+
+    Set ``http2=True`` (requires ``pip install api4jenkins[http2]``) to let
+    concurrent requests share few multiplexed connections when Jenkins is
+    served over HTTP/2, e.g. behind reverse proxy.
+
+    :param adaptive_limiter: (optional) :class:`AdaptiveLimiter <api4jenkins.http.AdaptiveLimiter>`
+        to adjust concurrent requests with latency and errors, available as
+        attribute ``adaptive_limiter``
+
+    Usage::
+
+        >>> import asyncio
+        >>> from api4jenkins import AsyncJenkins
+        >>> async def main():
+        ...     j = AsyncJenkins('https://jenkins.example.com/', auth=('admin', 'admin'),
+        ...                      http2=True, pool={'max_connections': 10})
+        ...     print(await j.version)
+        >>> asyncio.run(main())
+        2.176.2
+    '''
 
     def __init__(self, url: str, **kwargs: Any) -> None:
+        self.single_flight: Optional[SingleFlight] = SingleFlight() \
+            if kwargs.pop('single_flight', True) else None
+        self.json_decoder = new_json_decoder(kwargs.pop('json_decoder', None))
+        self.index: Optional[JobIndex] = kwargs.pop('index', None)
         self.http_client = new_async_http_client(**kwargs)
+        self.rate_limiter: Optional[RateLimiter] = kwargs.get('rate_limiter')
+        self.adaptive_limiter: Optional[AdaptiveLimiter] = kwargs.get('adaptive_limiter')
+        self.circuit_breaker: Optional[CircuitBreaker] = kwargs.get('circuit_breaker')
+        self.cache: Optional[ResponseCache] = kwargs.get('cache')
         self._crumb = None
         self._async_lock = asyncio.Lock()
         self._auth = kwargs.get('auth')
@@ -309,12 +437,29 @@ class AsyncJenkins(AsyncItem, UrlMixIn):
             self, f'{self.url}user/{self._auth[0]}/') if self._auth else None
 
     async def get_job(self, full_name: str) -> Optional[AsyncItem]:
+        if self.index is not None:
+            return await self._get_indexed_job(full_name)
         folder, name = self._resolve_name(full_name)
-        if await folder.exists():
-            return await folder.get(name)
+        return await folder.get(name)
 
-    async def aiter(self, depth: int = 0) -> AsyncIterator[AsyncItem]:
-        async for job in AsyncFolder(self, self.url)(depth):
+    async def _get_indexed_job(self, full_name: str) -> Optional[AsyncItem]:
+        parent, name = self._parse_name(full_name)
+        key = f'{parent}/{name}' if parent else name
+        if (item := self.index.get(key)) is None:
+            try:
+                api_json = await AsyncFolder(self, self._name2url(parent)).api_json(tree='jobs[name,url]')
+            except ItemNotFoundError:
+                return None
+            self.index.refresh(parent, api_json.get('jobs', []))
+            item = self.index.get(key)
+        return new_item(self, 'api4jenkins.job', item) if item else None
+
+    async def aiter(self, depth: int = 0, stream: bool = False) -> AsyncIterator[AsyncItem]:
+        async for job in AsyncFolder(self, self.url)(depth, stream):
+            yield job
+
+    async def crawl(self, depth: int = 0, workers: int = 8) -> AsyncIterator[AsyncItem]:
+        async for job in AsyncFolder(self, self.url).crawl(depth, workers):
             yield job
 
     async def create_job(self, full_name: str, xml: str, recursive: bool = False) -> Any:
@@ -322,11 +467,15 @@ class AsyncJenkins(AsyncItem, UrlMixIn):
         if recursive and not await folder.exists():
             await self.create_job(folder.full_name, EMPTY_FOLDER_XML,
                                   recursive=recursive)
-        return await folder.create(name, xml)
+        resp = await folder.create(name, xml)
+        self._invalidate_index(folder, name)
+        return resp
 
     async def copy_job(self, full_name: str, dest: str) -> Any:
         folder, name = self._resolve_name(full_name)
-        return await folder.copy(name, dest)
+        resp = await folder.copy(name, dest)
+        self._invalidate_index(folder, dest)
+        return resp
 
     async def delete_job(self, full_name: str) -> None:
         job = await self.get_job(full_name)
@@ -351,6 +500,11 @@ class AsyncJenkins(AsyncItem, UrlMixIn):
         job = await self._get_job_and_check(full_name)
         return await job.duplicate(new_name, recursive)
 
+    def build_jobs(self, requests: Iterable[BuildRequest], workers: int = 8, wait: bool = False,
+                   interval: float = 1, timeout: Optional[float] = None,
+                   max_errors: int = 3) -> AsyncBuildBatch:
+        return AsyncBuildBatch(self, requests, workers, wait, interval, timeout, max_errors)
+
     async def _get_job_and_check(self, full_name: str) -> AsyncItem:
         job = await self.get_job(full_name)
         if job is None:
@@ -370,6 +524,10 @@ class AsyncJenkins(AsyncItem, UrlMixIn):
         parent, name = self._parse_name(full_name)
         return AsyncFolder(self, self._name2url(parent)), name
 
+    def _invalidate_index(self, folder: Any, name: str) -> None:
+        if self.index is not None:
+            self.index.invalidate(f'{folder.full_name}/{name}')
+
     # async def exists(self):
     #     try:
     #         await self._request('HEAD', self.url)
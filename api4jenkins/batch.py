@@ -0,0 +1,243 @@
+# encoding: utf-8
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, AsyncIterator, Dict, Iterable, Iterator, List,
+                    Optional, Set, Tuple, Union)
+
+from .node import _nodes_tree
+from .queue import _REQUEST_ERRORS, _is_done
+
+BuildRequest = Union[str, Tuple[str, Dict[str, Any]]]
+
+
+def _parse_request(request: BuildRequest) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(request, str):
+        return request, {}
+    full_name, params = request
+    return full_name, dict(params or {})
+
+
+def _running_urls(api_json: Dict[str, Any]) -> Set[str]:
+    urls = set()
+    for computer in api_json['computer']:
+        for kind in ['executors', 'oneOffExecutors']:
+            for executor in computer.get(kind) or []:
+                if execable := executor.get('currentExecutable'):
+                    urls.add(execable['url'])
+    return urls
+
+
+class _Tracker:
+    '''state shared by sync and async batch, queue items and builds are
+    keyed by queue id and url to requests, Jenkins merges identical
+    triggers into one queue item'''
+
+    def __init__(self, timeout: Optional[float], max_errors: int) -> None:
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.max_errors = max_errors
+        self.errors = 0
+        self.queued: Dict[int, Tuple[Any, List[BuildRequest]]] = {}
+        self.running: Dict[str, Tuple[Any, List[BuildRequest]]] = {}
+
+    def queue(self, item: Any, requests: List[BuildRequest]) -> None:
+        self.queued.setdefault(item.id, (item, []))[1].extend(requests)
+
+    def run(self, build: Any, requests: List[BuildRequest]) -> None:
+        self.running.setdefault(build.url, (build, []))[1].extend(requests)
+
+    def left(self, ids: Iterable[int]) -> List[Tuple[Any, List[BuildRequest]]]:
+        '''queue items which are not in queue listing, they are kept until
+        they are resolved, so a failed poll is retried in next tick'''
+        ids = set(ids)
+        return [entry for id, entry in self.queued.items() if id not in ids]
+
+    def fail(self, error: Exception) -> None:
+        '''count failed tick, raise error after ``max_errors`` consecutive ones'''
+        self.errors += 1
+        if self.errors >= self.max_errors:
+            raise error
+
+    def check(self, interval: float) -> None:
+        if self.deadline is not None and time.monotonic() + interval > self.deadline:
+            raise TimeoutError(f'Timed out with {len(self.queued)} queued '
+                               f'and {len(self.running)} running builds')
+
+
+class _Batch:
+
+    def __init__(self, jenkins: Any, requests: Iterable[BuildRequest], workers: int = 8,
+                 wait: bool = False, interval: float = 1, timeout: Optional[float] = None,
+                 max_errors: int = 3) -> None:
+        self.jenkins = jenkins
+        self.requests = list(requests)
+        self.workers = workers
+        self.wait = wait
+        self.interval = interval
+        self.timeout = timeout
+        self.max_errors = max_errors
+        self.results: Dict[Optional[str], List[BuildRequest]] = {}
+        self.errors: List[Tuple[BuildRequest, Exception]] = []
+
+    def _done(self, request: BuildRequest, result: Optional[str]) -> None:
+        self.results.setdefault(result, []).append(request)
+
+
+class BuildBatch(_Batch):
+    '''Trigger many jobs with bounded concurrency and track them together,
+    all queue items are checked with one request to queue per tick, and
+    running builds with one request to executors per tick when waiting.
+
+    :param jenkins: :class:`Jenkins <api4jenkins.Jenkins>`
+    :param requests: full name of job or tuple of full name and parameters
+    :param workers: (optional) concurrent requests to trigger, default is 8
+    :param wait: (optional) wait builds to complete, default is False
+    :param interval: (optional) seconds between ticks, default is 1
+    :param timeout: (optional) seconds to wait, ``None`` means forever
+    :param max_errors: (optional) consecutive ticks with failed request to
+        queue, item or executors before error is raised, default is 3
+
+    Iterate it to get ``(request, build)`` when build starts, or completes if
+    ``wait`` is True, ``build`` is None if queue item is cancelled, or the
+    exception if request failed to trigger, other requests are still tracked.
+    Results of completed builds are collected in ``results`` as result to
+    requests, failed requests in ``errors`` as ``(request, exception)``.
+
+    Usage::
+
+        >>> batch = j.build_jobs([('folder/job', {'VERSION': '1.0'}), 'job2'],
+        ...                      workers=16, wait=True)
+        >>> for request, build in batch:
+        ...     print(request, build)
+        >>> batch.results
+        {'SUCCESS': [('folder/job', {'VERSION': '1.0'})], 'FAILURE': ['job2']}
+    '''
+
+    def _trigger(self, request: BuildRequest) -> Any:
+        full_name, params = _parse_request(request)
+        return self.jenkins.build_job(full_name, **params)
+
+    def __iter__(self) -> Iterator[Tuple[BuildRequest, Any]]:
+        tracker = _Tracker(self.timeout, self.max_errors)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            triggering = {pool.submit(self._trigger, request): request for request in self.requests}
+            try:
+                while triggering or tracker.queued or tracker.running:
+                    for future in [f for f in triggering if f.done()]:
+                        request = triggering.pop(future)
+                        try:
+                            tracker.queue(future.result(), [request])
+                        except _REQUEST_ERRORS as e:
+                            self.errors.append((request, e))
+                            yield request, e
+                    try:
+                        if tracker.queued:
+                            yield from self._check_queue(tracker)
+                        if tracker.running:
+                            yield from self._check_running(tracker)
+                        tracker.errors = 0
+                    except _REQUEST_ERRORS as e:
+                        tracker.fail(e)
+                    if triggering or tracker.queued or tracker.running:
+                        tracker.check(self.interval)
+                        time.sleep(self.interval)
+            finally:
+                for future in triggering:
+                    future.cancel()
+
+    def _check_queue(self, tracker: _Tracker) -> Iterator[Tuple[BuildRequest, Any]]:
+        items = self.jenkins.queue.api_json(tree='items[id]')['items']
+        for item, requests in tracker.left(item['id'] for item in items):
+            data, build = item._poll()
+            if not _is_done(data, build):
+                # executor is assigned but build is not created yet
+                continue
+            del tracker.queued[item.id]
+            if build is None:
+                for request in requests:
+                    self._done(request, None)
+                    yield request, None
+            elif self.wait:
+                tracker.run(build, requests)
+            else:
+                for request in requests:
+                    yield request, build
+
+    def _check_running(self, tracker: _Tracker) -> Iterator[Tuple[BuildRequest, Any]]:
+        urls = _running_urls(self.jenkins.nodes.api_json(tree=_nodes_tree))
+        for url in [url for url in tracker.running if url not in urls]:
+            build, requests = tracker.running[url]
+            data = build.api_json(tree='result,building')
+            if not data['building']:
+                del tracker.running[url]
+                for request in requests:
+                    self._done(request, data['result'])
+                    yield request, build
+
+
+class AsyncBuildBatch(_Batch):
+
+    async def _trigger(self, semaphore: asyncio.Semaphore, request: BuildRequest) -> Any:
+        full_name, params = _parse_request(request)
+        async with semaphore:
+            return await self.jenkins.build_job(full_name, **params)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[BuildRequest, Any]]:
+        tracker = _Tracker(self.timeout, self.max_errors)
+        semaphore = asyncio.Semaphore(self.workers)
+        triggering = {asyncio.ensure_future(self._trigger(semaphore, request)): request
+                      for request in self.requests}
+        try:
+            while triggering or tracker.queued or tracker.running:
+                for task in [t for t in triggering if t.done()]:
+                    request = triggering.pop(task)
+                    try:
+                        tracker.queue(task.result(), [request])
+                    except _REQUEST_ERRORS as e:
+                        self.errors.append((request, e))
+                        yield request, e
+                try:
+                    if tracker.queued:
+                        async for pair in self._check_queue(tracker):
+                            yield pair
+                    if tracker.running:
+                        async for pair in self._check_running(tracker):
+                            yield pair
+                    tracker.errors = 0
+                except _REQUEST_ERRORS as e:
+                    tracker.fail(e)
+                if triggering or tracker.queued or tracker.running:
+                    tracker.check(self.interval)
+                    await asyncio.sleep(self.interval)
+        finally:
+            for task in triggering:
+                task.cancel()
+
+    async def _check_queue(self, tracker: _Tracker) -> AsyncIterator[Tuple[BuildRequest, Any]]:
+        items = (await self.jenkins.queue.api_json(tree='items[id]'))['items']
+        for item, requests in tracker.left(item['id'] for item in items):
+            data, build = await item._poll()
+            if not _is_done(data, build):
+                # executor is assigned but build is not created yet
+                continue
+            del tracker.queued[item.id]
+            if build is None:
+                for request in requests:
+                    self._done(request, None)
+                    yield request, None
+            elif self.wait:
+                tracker.run(build, requests)
+            else:
+                for request in requests:
+                    yield request, build
+
+    async def _check_running(self, tracker: _Tracker) -> AsyncIterator[Tuple[BuildRequest, Any]]:
+        urls = _running_urls(await self.jenkins.nodes.api_json(tree=_nodes_tree))
+        for url in [url for url in tracker.running if url not in urls]:
+            build, requests = tracker.running[url]
+            data = await build.api_json(tree='result,building')
+            if not data['building']:
+                del tracker.running[url]
+                for request in requests:
+                    self._done(request, data['result'])
+                    yield request, build
@@ -1,6 +1,7 @@
 # encoding: utf-8
 
 import asyncio
+import codecs
 import re
 import time
 import urllib.parse
@@ -121,24 +122,69 @@ def _make_full_url(base_url: str, href: str) -> str:
     return f"{parsed.scheme}://{parsed.netloc}{href}"
 
 
+class _LogTail:
+    '''split log received by progressive requests into lines, bytes of
+    incomplete character and text of incomplete line are kept for next
+    response, because responses end at any byte offset'''
+
+    def __init__(self) -> None:
+        self.decoder: Optional[codecs.IncrementalDecoder] = None
+        self.partial = ''
+
+    def feed(self, resp: Response, chunk: bytes) -> List[str]:
+        if self.decoder is None:
+            self.decoder = codecs.getincrementaldecoder(resp.encoding or 'utf-8')(errors='replace')
+        *lines, self.partial = (self.partial + self.decoder.decode(chunk)).split('\n')
+        return [line.rstrip('\r') for line in lines]
+
+    def close(self) -> List[str]:
+        if self.decoder is not None:
+            self.partial += self.decoder.decode(b'', final=True)
+        return [self.partial] if self.partial else []
+
+
+def _next_offset(resp: Response, start: int) -> int:
+    return int(resp.headers.get('X-Text-Size', start))
+
+
+# every response returns all log written since ``start``, large one means
+# tailer is behind and next part is requested without waiting
+_BACKLOG = 1024 * 1024
+
+
 class Build(Item, DescriptionMixIn, DeletionMixIn, ActionsMixIn):
 
     def console_text(self) -> Iterator[str]:
         with self.handle_stream('GET', 'consoleText') as resp:
             yield from resp.iter_lines()
 
-    def progressive_output(self, html: bool = False) -> Iterator[str]:
+    def progressive_output(self, html: bool = False, interval: float = 1,
+                           max_interval: float = 10) -> Iterator[str]:
+        '''Tail console log until build completes, next part is requested at
+        once after a large response, after ``interval`` when log grows slowly,
+        and with interval doubled while build is idle
+
+        :param html: (optional) get log as html, default is False
+        :param interval: (optional) seconds to wait after new log, default is 1
+        :param max_interval: (optional) maximum seconds to wait when no new log, default is 10
+        :returns: iterator of lines
+        '''
         url = 'logText/progressiveHtml' if html else 'logText/progressiveText'
-        start = 0
+        start, delay, tail = 0, interval, _LogTail()
         while True:
-            resp = self.handle_req('GET', url, params={'start': start})
-            time.sleep(1)
-            if start == resp.headers.get('X-Text-Size'):
-                continue
-            yield from resp.iter_lines()
-            if not resp.headers.get('X-More-Data'):
-                break
-            start = resp.headers['X-Text-Size']
+            with self.handle_stream('GET', url, params={'start': start}) as resp:
+                for chunk in resp.iter_bytes():
+                    yield from tail.feed(resp, chunk)
+                size, more = _next_offset(resp, start), resp.headers.get('X-More-Data')
+            if not more:
+                yield from tail.close()
+                return
+            if size > start:
+                start, delay, received = size, interval, size - start
+                if received >= _BACKLOG:
+                    continue
+            time.sleep(delay)
+            delay = min(delay * 2, max_interval)
 
     def stop(self) -> Response:
         return self.handle_req('POST', 'stop')
@@ -228,19 +274,26 @@ class AsyncBuild(AsyncItem, AsyncDescriptionMixIn, AsyncDeletionMixIn, AsyncActi
             async for line in resp.aiter_lines():
                 yield line
 
-    async def progressive_output(self, html: bool = False) -> AsyncIterator[str]:
+    async def progressive_output(self, html: bool = False, interval: float = 1,
+                                 max_interval: float = 10) -> AsyncIterator[str]:
         url = 'logText/progressiveHtml' if html else 'logText/progressiveText'
-        start = 0
+        start, delay, tail = 0, interval, _LogTail()
         while True:
-            resp = await self.handle_req('GET', url, params={'start': start})
-            await asyncio.sleep(1)
-            if start == resp.headers.get('X-Text-Size'):
-                continue
-            async for line in resp.aiter_lines():
-                yield line
-            if not resp.headers.get('X-More-Data'):
-                break
-            start = resp.headers['X-Text-Size']
+            async with self.handle_stream('GET', url, params={'start': start}) as resp:
+                async for chunk in resp.aiter_bytes():
+                    for line in tail.feed(resp, chunk):
+                        yield line
+                size, more = _next_offset(resp, start), resp.headers.get('X-More-Data')
+            if not more:
+                for line in tail.close():
+                    yield line
+                return
+            if size > start:
+                start, delay, received = size, interval, size - start
+                if received >= _BACKLOG:
+                    continue
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_interval)
 
     async def stop(self) -> Response:
         return await self.handle_req('POST', 'stop')
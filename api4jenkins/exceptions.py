@@ -25,3 +25,7 @@ class BadRequestError(JenkinsAPIException):
 
 class ServerError(JenkinsAPIException):
     pass
+
+
+class CircuitOpenError(JenkinsAPIException):
+    pass
@@ -1,12 +1,26 @@
 # encoding: utf-8
+import asyncio
+import contextlib
 import inspect
+import json
 import logging
-from typing import Any, Dict
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from functools import partial
+from importlib import import_module
+from typing import (Any, AsyncIterator, Callable, Deque, Dict, Iterable,
+                    Iterator, NamedTuple, Optional, Union)
 
-from httpx import (AsyncClient, AsyncHTTPTransport, Client, HTTPTransport,
-                   Request, Response)
+from httpx import (AsyncBaseTransport, AsyncByteStream, AsyncClient,
+                   AsyncHTTPTransport, BaseTransport, Client, ConnectError,
+                   ConnectTimeout, Headers, HTTPTransport, Limits, Request, Response,
+                   SyncByteStream, TransportError, URL)
 
-from .exceptions import AuthenticationError, BadRequestError, ItemNotFoundError
+from .exceptions import (AuthenticationError, BadRequestError,
+                         CircuitOpenError, ItemNotFoundError)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +45,47 @@ def check_response(response: Response) -> None:
     response.raise_for_status()
 
 
+# same as default limits of httpx
+_POOL_DEFAULTS = {
+    'max_connections': 100,
+    'max_keepalive_connections': 20,
+    'keepalive_expiry': 5.0,
+}
+
+
+def _apply_pool(kwargs: Dict[str, Any]) -> None:
+    '''Translate ``pool`` option to ``limits`` and ``http2`` of transport.
+
+    ``pool`` can be instance of ``httpx.Limits`` or ``dict`` with keys:
+    ``max_connections``, ``max_keepalive_connections``, ``keepalive_expiry``
+    and ``http2``, the missing keys keep default value of httpx.
+    '''
+    pool = kwargs.pop('pool', None)
+    if pool is None:
+        return
+    if isinstance(pool, Limits):
+        kwargs['limits'] = pool
+        return
+    options = dict(pool)
+    if 'http2' in options:
+        kwargs['http2'] = options.pop('http2')
+    unknown = set(options) - set(_POOL_DEFAULTS)
+    if unknown:
+        raise ValueError(f'Unknown pool options: {sorted(unknown)}, '
+                         f'expect: {list(_POOL_DEFAULTS) + ["http2"]}')
+    kwargs['limits'] = Limits(**{**_POOL_DEFAULTS, **options})
+
+
+def _check_http2(kwargs: Dict[str, Any]) -> None:
+    if not kwargs.get('http2'):
+        return
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError("http2=True requires package 'h2', install it with: "
+                          "pip install 'api4jenkins[http2]'") from None
+
+
 def _new_transport(obj: Any, kwargs: Dict[str, Any]) -> Any:
     init_args = {
         arg: kwargs.pop(arg)
@@ -40,8 +95,665 @@ def _new_transport(obj: Any, kwargs: Dict[str, Any]) -> Any:
     return obj(**init_args)
 
 
+class RetryBudget:
+    '''Limit retries to a ratio of requests, so retries can not multiply
+    load on an unhealthy Jenkins. Every request refills ``ratio`` token and
+    every retry takes one, at most ``burst`` retries are allowed in a row.
+
+    :param ratio: (optional) retries allowed per request, default is 0.2
+    :param burst: (optional) capacity of budget, default is 10
+    '''
+
+    def __init__(self, ratio: float = 0.2, burst: int = 10) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.burst)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class Retry:
+    '''Retry policy for both :class:`Jenkins <api4jenkins.Jenkins>` and
+    :class:`AsyncJenkins <api4jenkins.AsyncJenkins>`.
+
+    Idempotent requests are retried on connection errors and on responses
+    with status in ``statuses``, ``POST`` is retried only if ``retry_post``
+    is True, except the connection can not be established at all. Delay
+    between attempts is exponential backoff with full jitter, ``Retry-After``
+    header of response takes precedence if ``respect_retry_after`` is True.
+
+    :param total: (optional) maximum retries for one request, default is 3
+    :param backoff_factor: (optional) base delay in seconds, default is 0.5
+    :param max_backoff: (optional) upper bound of delay in seconds, default is 30
+    :param statuses: (optional) status codes to retry
+    :param methods: (optional) idempotent methods to retry
+    :param retry_post: (optional) retry ``POST`` as well, default is False
+    :param respect_retry_after: (optional) default is True
+    :param budget: (optional) :class:`RetryBudget` shared by all requests
+
+    Usage::
+
+        >>> from api4jenkins import Jenkins
+        >>> from api4jenkins.http import Retry
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             retry=Retry(total=5, backoff_factor=1))
+    '''
+
+    def __init__(self, total: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: Iterable[int] = (429, 502, 503, 504),
+                 methods: Iterable[str] = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'),
+                 retry_post: bool = False, respect_retry_after: bool = True,
+                 budget: Optional[RetryBudget] = None) -> None:
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        if retry_post:
+            self.methods |= {'POST'}
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+
+    def start(self) -> None:
+        if self.budget:
+            self.budget.deposit()
+
+    def is_retry(self, request: Request, attempt: int,
+                 response: Optional[Response] = None,
+                 error: Optional[Exception] = None) -> bool:
+        if attempt >= self.total:
+            return False
+        if error is not None:
+            # request was not sent if connection is not established
+            retryable = isinstance(error, (ConnectError, ConnectTimeout)) or \
+                request.method in self.methods
+        else:
+            retryable = response is not None and \
+                response.status_code in self.statuses and \
+                request.method in self.methods
+        return retryable and (self.budget is None or self.budget.withdraw())
+
+    def get_backoff(self, attempt: int, response: Optional[Response] = None) -> float:
+        if self.respect_retry_after and response is not None:
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+        return random.uniform(0, delay)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _new_retry(retry: Union[None, int, Retry]) -> Optional[Retry]:
+    if retry is None or isinstance(retry, Retry):
+        return retry
+    return Retry(total=retry)
+
+
+class RetryTransport(BaseTransport):
+    def __init__(self, transport: BaseTransport, retry: Retry) -> None:
+        self._transport = transport
+        self.retry = retry
+
+    def handle_request(self, request: Request) -> Response:
+        self.retry.start()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self._transport.handle_request(request)
+            except TransportError as e:
+                if not self.retry.is_retry(request, attempt, error=e):
+                    raise
+            else:
+                if not self.retry.is_retry(request, attempt, response=response):
+                    return response
+                response.close()
+            delay = self.retry.get_backoff(attempt, response)
+            attempt += 1
+            logger.debug(f'Retry {attempt}/{self.retry.total}: {request.method} '
+                         f'{request.url} in {delay:.2f}s')
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class RateLimiter:
+    '''Token bucket to limit requests per second and requests in flight,
+    it can be shared by threads and by coroutines.
+
+    :param rate: (optional) requests per second, ``None`` means no limit
+    :param burst: (optional) requests can be sent at once, default is ``rate``
+    :param max_in_flight: (optional) concurrent requests, ``None`` means no limit
+
+    Time waited for the limits is counted in ``throttled_time`` (seconds) and
+    ``throttled_requests``.
+
+    Usage::
+
+        >>> from api4jenkins import Jenkins
+        >>> from api4jenkins.http import RateLimiter
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             rate_limiter=RateLimiter(rate=20, max_in_flight=8))
+        >>> j.rate_limiter.throttled_time
+        0.0
+    '''
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                 max_in_flight: Optional[int] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(int(rate or 1), 1)
+        self.max_in_flight = max_in_flight
+        self.throttled_time = 0.0
+        self.throttled_requests = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(
+            max_in_flight) if max_in_flight else None
+        self._async_in_flight: Optional[asyncio.Semaphore] = None
+
+    def _reserve(self) -> float:
+        '''take one token, return seconds to wait until it is available'''
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._updated) * self.rate,
+                               self.burst) - 1
+            self._updated = now
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def _record(self, begin: float) -> None:
+        waited = time.monotonic() - begin
+        if waited > 0.001:
+            with self._lock:
+                self.throttled_time += waited
+                self.throttled_requests += 1
+
+    def acquire(self) -> None:
+        begin = time.monotonic()
+        if self._in_flight:
+            self._in_flight.acquire()
+        if delay := self._reserve():
+            time.sleep(delay)
+        self._record(begin)
+
+    def release(self) -> None:
+        if self._in_flight:
+            self._in_flight.release()
+
+    async def async_acquire(self) -> None:
+        begin = time.monotonic()
+        if self.max_in_flight:
+            if self._async_in_flight is None:
+                self._async_in_flight = asyncio.Semaphore(self.max_in_flight)
+            await self._async_in_flight.acquire()
+        if delay := self._reserve():
+            await asyncio.sleep(delay)
+        self._record(begin)
+
+    def async_release(self) -> None:
+        if self._async_in_flight:
+            self._async_in_flight.release()
+
+
+class _ClosingStream(SyncByteStream):
+    '''call ``callback`` once when response is closed'''
+
+    def __init__(self, stream: SyncByteStream, callback: Any) -> None:
+        self._stream = stream
+        self._callback = callback
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._callback:
+                self._callback, callback = None, self._callback
+                callback()
+
+
+class _AsyncClosingStream(AsyncByteStream):
+    def __init__(self, stream: AsyncByteStream, callback: Any) -> None:
+        self._stream = stream
+        self._callback = callback
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._callback:
+                self._callback, callback = None, self._callback
+                callback()
+
+
+class RateLimitTransport(BaseTransport):
+    def __init__(self, transport: BaseTransport, limiter: RateLimiter) -> None:
+        self._transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: Request) -> Response:
+        self.limiter.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self.limiter.release()
+            raise
+        # request is in flight until its body is consumed or closed
+        response.stream = _ClosingStream(response.stream, self.limiter.release)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class CircuitBreaker:
+    '''Fail fast when Jenkins is unavailable, e.g. during restart, instead of
+    piling up timeouts, it can be shared by threads and coroutines.
+
+    It opens after ``failure_threshold`` consecutive transport errors or 5xx
+    responses, then every request raises
+    :class:`CircuitOpenError <api4jenkins.exceptions.CircuitOpenError>`
+    without being sent. After ``reset_timeout`` seconds it turns to half open
+    and lets ``half_open_max`` probe requests through, it closes if probe
+    succeeds, otherwise opens again.
+
+    :param failure_threshold: (optional) default is 5
+    :param reset_timeout: (optional) seconds, default is 30
+    :param half_open_max: (optional) default is 1
+
+    Usage::
+
+        >>> from api4jenkins import Jenkins
+        >>> from api4jenkins.http import CircuitBreaker
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             circuit_breaker=CircuitBreaker(failure_threshold=3))
+        >>> j.circuit_breaker.state
+        'closed'
+    '''
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max: int = 1) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and \
+                time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def before_request(self, request: Request) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return
+            remaining = max(self._opened_at + self.reset_timeout - time.monotonic(), 0)
+        raise CircuitOpenError(f'Circuit breaker is {state}, skip {request.method} '
+                               f'{request.url}, retry in {remaining:.1f}s')
+
+    def after_request(self, response: Optional[Response] = None,
+                      error: Optional[Exception] = None) -> None:
+        failed = error is not None or (response is not None and response.status_code >= 500)
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+            if not failed:
+                self.failures = 0
+                self._state = self.CLOSED
+                return
+            self.failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self.failures >= self.failure_threshold):
+                logger.warning(f'Circuit breaker opens after {self.failures} failures')
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        '''free probe slot of request which ends without outcome, e.g.
+        cancelled, neither success nor failure is counted'''
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+
+
+class CircuitBreakerTransport(BaseTransport):
+    def __init__(self, transport: BaseTransport, breaker: CircuitBreaker) -> None:
+        self._transport = transport
+        self.breaker = breaker
+
+    def handle_request(self, request: Request) -> Response:
+        self.breaker.before_request(request)
+        try:
+            response = self._transport.handle_request(request)
+        except TransportError as e:
+            self.breaker.after_request(error=e)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.after_request(response)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+# marks request of ``handle_stream``, which is not buffered by cache
+STREAM_EXTENSION = 'api4jenkins.stream'
+
+_ENCODING_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding')
+
+
+class _CacheEntry(NamedTuple):
+    headers: Any
+    content: bytes
+    stored_at: float
+
+
+def _item_url(url: URL) -> str:
+    '''url of item which request belongs to, e.g. job/a/ for job/a/build'''
+    url = str(url.copy_with(query=None, fragment=None))
+    if url.endswith('api/json'):
+        return url[:-len('api/json')]
+    return url.rsplit('/', 1)[0] + '/'
+
+
+class ResponseCache:
+    '''Bounded LRU cache for ``api/json`` responses, the key is url with
+    query, so same ``tree`` and ``depth`` hit same entry.
+
+    Entry younger than ``ttl`` seconds is returned without request, elder
+    one is revalidated with ``If-None-Match``/``If-Modified-Since`` if
+    Jenkins provided ``ETag``/``Last-Modified``, or fetched again. Any
+    request other than ``GET``/``HEAD``, e.g. ``configure``, ``delete`` and
+    ``build``, invalidates entries of the item, its parents and its children.
+    Streamed requests, e.g. ``iter(stream=True)``, bypass cache to avoid
+    buffering whole response.
+
+    :param maxsize: (optional) maximum entries, default is 1024
+    :param ttl: (optional) seconds, default is 5
+
+    Usage::
+
+        >>> from api4jenkins import Jenkins
+        >>> from api4jenkins.http import ResponseCache
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             cache=ResponseCache(maxsize=4096, ttl=10))
+        >>> j.cache.hits, j.cache.misses
+        (0, 0)
+    '''
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, response: Response) -> None:
+        # content is decoded already, drop headers of encoded body
+        headers = Headers(response.headers)
+        for name in _ENCODING_HEADERS:
+            headers.pop(name, None)
+        with self._lock:
+            self._entries[key] = _CacheEntry(headers, response.content, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = entry._replace(stored_at=time.monotonic())
+
+    def invalidate(self, url: str) -> None:
+        '''remove entries of item with given url, its parents and children'''
+        with self._lock:
+            for key in list(self._entries):
+                item_url = _item_url(URL(key))
+                if item_url.startswith(url) or url.startswith(item_url):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def is_fresh(self, entry: _CacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def prepare(self, request: Request) -> Optional[Any]:
+        '''return cached response or entry to revalidate, or None'''
+        if request.method not in ('GET', 'HEAD'):
+            self.invalidate(_item_url(request.url))
+            return None
+        if request.method != 'GET' or not request.url.path.endswith('api/json') \
+                or request.extensions.get(STREAM_EXTENSION):
+            return None
+        key = str(request.url)
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self.is_fresh(entry):
+            self.hits += 1
+            return Response(200, headers=entry.headers, content=entry.content,
+                            request=request)
+        if 'ETag' in entry.headers:
+            request.headers['If-None-Match'] = entry.headers['ETag']
+        if 'Last-Modified' in entry.headers:
+            request.headers['If-Modified-Since'] = entry.headers['Last-Modified']
+        return entry
+
+    def finish(self, request: Request, response: Response,
+               entry: Optional[_CacheEntry]) -> Response:
+        '''store response or answer 304 with entry, response must be read'''
+        key = str(request.url)
+        if entry is not None and response.status_code == 304:
+            self.revalidated += 1
+            self.hits += 1
+            self.touch(key, entry)
+            return Response(200, headers=entry.headers, content=entry.content,
+                            request=request)
+        if entry is not None:
+            self.misses += 1
+        if response.status_code == 200:
+            self.put(key, response)
+        return response
+
+
+def _is_cacheable(request: Request, cached: Any) -> bool:
+    return request.method == 'GET' and request.url.path.endswith('api/json') \
+        and not request.extensions.get(STREAM_EXTENSION) and not isinstance(cached, Response)
+
+
+class CacheTransport(BaseTransport):
+    def __init__(self, transport: BaseTransport, cache: ResponseCache) -> None:
+        self._transport = transport
+        self.cache = cache
+
+    def handle_request(self, request: Request) -> Response:
+        cached = self.cache.prepare(request)
+        if isinstance(cached, Response):
+            return cached
+        response = self._transport.handle_request(request)
+        if not _is_cacheable(request, cached):
+            return response
+        response.read()
+        return self.cache.finish(request, response, cached)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    '''Share one call among identical concurrent calls, callers which
+    arrive while call is in flight get its result or exception instead of
+    issuing their own, nothing is kept after call completes.
+
+    Usage::
+
+        >>> flight = SingleFlight()
+        >>> flight.do('key', lambda: 1)
+        1
+    '''
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._calls: Dict[Any, _Call] = {}
+        self._tasks: Dict[Any, asyncio.Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Any, func: Any) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def async_do(self, key: Any, func: Any) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(func())
+            task.add_done_callback(partial(self._discard, key))
+        else:
+            self.shared += 1
+        # shield task, so cancelling one caller does not fail others
+        return await asyncio.shield(task)
+
+    def _discard(self, key: Any, task: 'asyncio.Future[Any]') -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()
+
+
+_JSON_DECODERS = ('orjson', 'ujson', 'json')
+
+
+def new_json_decoder(decoder: Union[str, Callable[[bytes], Any], None] = None) -> Callable[[bytes], Any]:
+    '''Return function to decode json body.
+
+    :param decoder: (optional) callable, or name of module which provides
+        ``loads``, e.g. ``orjson``, the first installed one of ``orjson``,
+        ``ujson`` and ``json`` is used if it is ``None``
+    '''
+    if callable(decoder):
+        return decoder
+    if decoder:
+        return import_module(decoder).loads
+    for name in _JSON_DECODERS:
+        with contextlib.suppress(ImportError):
+            return import_module(name).loads
+    return json.loads
+
+
 def new_http_client(**kwargs) -> Client:
+    retry = _new_retry(kwargs.pop('retry', None))
+    limiter = kwargs.pop('rate_limiter', None)
+    breaker = kwargs.pop('circuit_breaker', None)
+    cache = kwargs.pop('cache', None)
+    _apply_pool(kwargs)
+    _check_http2(kwargs)
     trans = _new_transport(HTTPTransport, kwargs)
+    if limiter:
+        trans = RateLimitTransport(trans, limiter)
+    if breaker:
+        trans = CircuitBreakerTransport(trans, breaker)
+    if retry:
+        trans = RetryTransport(trans, retry)
+    if cache is not None:
+        trans = CacheTransport(trans, cache)
     return Client(
         transport=trans,
         **kwargs,
@@ -58,8 +770,241 @@ async def async_check_response(response: Response) -> None:
     check_response(response)
 
 
+class AsyncRetryTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, retry: Retry) -> None:
+        self._transport = transport
+        self.retry = retry
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self.retry.start()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except TransportError as e:
+                if not self.retry.is_retry(request, attempt, error=e):
+                    raise
+            else:
+                if not self.retry.is_retry(request, attempt, response=response):
+                    return response
+                await response.aclose()
+            delay = self.retry.get_backoff(attempt, response)
+            attempt += 1
+            logger.debug(f'Retry {attempt}/{self.retry.total}: {request.method} '
+                         f'{request.url} in {delay:.2f}s')
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncRateLimitTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, limiter: RateLimiter) -> None:
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await self.limiter.async_acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.limiter.async_release()
+            raise
+        response.stream = _AsyncClosingStream(response.stream, self.limiter.async_release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# smoothing factors of latency averages, about 10 and 100 requests
+_SHORT_SMOOTHING = 0.1
+_LONG_SMOOTHING = 0.01
+
+
+class AdaptiveLimiter:
+    '''Adaptive concurrency limit for :class:`AsyncJenkins <api4jenkins.AsyncJenkins>`
+    with AIMD (additive increase, multiplicative decrease).
+
+    The limit grows by about one per round trip while short term average of
+    latency stays below ``latency_tolerance`` times of long term average, and
+    it is multiplied by ``backoff_ratio`` on 5xx response, transport error or
+    latency spike. Both are exponential moving averages over all requests, so
+    a steady mix of cheap and expensive requests is not taken as a spike.
+    Requests started before last decrease do not decrease it again, so a
+    burst of failures only counts once. Cancelled requests only release
+    their slots.
+
+    :param initial: (optional) initial limit, default is 10
+    :param min_limit: (optional) default is 1
+    :param max_limit: (optional) default is 200
+    :param backoff_ratio: (optional) default is 0.5
+    :param latency_tolerance: (optional) default is 2.0
+
+    Usage::
+
+        >>> from api4jenkins import AsyncJenkins
+        >>> from api4jenkins.http import AdaptiveLimiter
+        >>> j = AsyncJenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...                  adaptive_limiter=AdaptiveLimiter(initial=20))
+        >>> j.adaptive_limiter.limit
+        20
+    '''
+
+    def __init__(self, initial: int = 10, min_limit: int = 1, max_limit: int = 200,
+                 backoff_ratio: float = 0.5, latency_tolerance: float = 2.0) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+        self._limit = float(initial)
+        self._last_drop = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> float:
+        '''wait for a free slot, return start time of request'''
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # slot was granted at same time, give it back
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return time.monotonic()
+
+    def release(self, start: float, elapsed: Optional[float] = None,
+                response: Optional[Response] = None,
+                error: Optional[Exception] = None) -> None:
+        '''release slot and adjust limit with outcome of request'''
+        if error is not None or (response is not None and response.status_code >= 500):
+            self._decrease(start)
+        elif elapsed is not None:
+            if self.short_latency is None or self.long_latency is None:
+                self.short_latency = self.long_latency = elapsed
+            else:
+                self.short_latency += (elapsed - self.short_latency) * _SHORT_SMOOTHING
+                self.long_latency += (elapsed - self.long_latency) * _LONG_SMOOTHING
+            if self.short_latency > self.long_latency * self.latency_tolerance:
+                self._decrease(start)
+            else:
+                self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+        self._release_slot()
+
+    def _decrease(self, start: float) -> None:
+        if start < self._last_drop:
+            return
+        self._last_drop = time.monotonic()
+        self._limit = max(self._limit * self.backoff_ratio, self.min_limit)
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class AsyncAdaptiveTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, limiter: AdaptiveLimiter) -> None:
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: Request) -> Response:
+        start = await self.limiter.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            self.limiter.release(start, error=e)
+            raise
+        except BaseException:
+            # cancelled by caller, not a failure of server
+            self.limiter.release(start)
+            raise
+        elapsed = time.monotonic() - start
+        response.stream = _AsyncClosingStream(
+            response.stream, partial(self.limiter.release, start, elapsed, response))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncCircuitBreakerTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, breaker: CircuitBreaker) -> None:
+        self._transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self.breaker.before_request(request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except TransportError as e:
+            self.breaker.after_request(error=e)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.after_request(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncCacheTransport(AsyncBaseTransport):
+    def __init__(self, transport: AsyncBaseTransport, cache: ResponseCache) -> None:
+        self._transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: Request) -> Response:
+        cached = self.cache.prepare(request)
+        if isinstance(cached, Response):
+            return cached
+        response = await self._transport.handle_async_request(request)
+        if not _is_cacheable(request, cached):
+            return response
+        await response.aread()
+        return self.cache.finish(request, response, cached)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
 def new_async_http_client(**kwargs) -> AsyncClient:
+    retry = _new_retry(kwargs.pop('retry', None))
+    limiter = kwargs.pop('rate_limiter', None)
+    adaptive_limiter = kwargs.pop('adaptive_limiter', None)
+    breaker = kwargs.pop('circuit_breaker', None)
+    cache = kwargs.pop('cache', None)
+    _apply_pool(kwargs)
+    _check_http2(kwargs)
     trans = _new_transport(AsyncHTTPTransport, kwargs)
+    if adaptive_limiter:
+        trans = AsyncAdaptiveTransport(trans, adaptive_limiter)
+    if limiter:
+        trans = AsyncRateLimitTransport(trans, limiter)
+    if breaker:
+        trans = AsyncCircuitBreakerTransport(trans, breaker)
+    if retry:
+        trans = AsyncRetryTransport(trans, retry)
+    if cache is not None:
+        trans = AsyncCacheTransport(trans, cache)
     return AsyncClient(
         transport=trans,
         **kwargs,
@@ -0,0 +1,89 @@
+# encoding: utf-8
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+
+class JobIndex:
+    '''Local index of jobs to resolve full name to url and ``_class`` without
+    request, entries are kept in sqlite database and refreshed folder by
+    folder, listing of parent folder is requested when a job is missing or
+    expired. One index should be used for one Jenkins only.
+
+    :param path: (optional) path of sqlite database, default is ``:memory:``
+    :param ttl: (optional) seconds an entry is trusted, ``None`` means until
+        it's invalidated, default is 3600
+
+    Usage::
+
+        >>> from api4jenkins import Jenkins
+        >>> from api4jenkins.index import JobIndex
+        >>> j = Jenkins('http://127.0.0.1:8080/', auth=('admin', 'admin'),
+        ...             index=JobIndex('/tmp/jenkins-jobs.db'))
+        >>> j.get_job('folder/freestylejob')
+        <FreeStyleProject: http://127.0.0.1:8080/job/folder/job/freestylejob/>
+    '''
+
+    def __init__(self, path: Union[str, Path] = ':memory:', ttl: Optional[float] = 3600) -> None:
+        self.path = str(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS jobs (
+                full_name TEXT PRIMARY KEY, url TEXT NOT NULL,
+                class TEXT NOT NULL, parent TEXT NOT NULL, seen REAL NOT NULL)''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_parent ON jobs (parent)')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def get(self, full_name: str) -> Optional[Dict[str, Any]]:
+        '''return ``_class`` and ``url`` of job, None if missing or expired'''
+        with self._lock:
+            row = self._conn.execute('SELECT url, class, seen FROM jobs WHERE full_name = ?',
+                                     (full_name,)).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[2] > self.ttl):
+            return None
+        return {'_class': row[1], 'url': row[0]}
+
+    def refresh(self, parent: str, jobs: Iterable[Dict[str, Any]]) -> None:
+        '''replace jobs in folder ``parent`` with listing of it, jobs
+        which are gone are removed with their sub jobs
+
+        :param parent: full name of folder, empty string for Jenkins
+        :param jobs: items of ``jobs[name,url]`` of the folder
+        '''
+        now = time.time()
+        rows = {_join(parent, job['name']): (job['url'], job['_class']) for job in jobs}
+        with self._lock, self._conn:
+            for (full_name,) in self._conn.execute(
+                    'SELECT full_name FROM jobs WHERE parent = ?', (parent,)).fetchall():
+                if full_name not in rows:
+                    self._delete(full_name)
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?)',
+                [(name, url, _class, parent, now) for name, (url, _class) in rows.items()])
+
+    def invalidate(self, full_name: str) -> None:
+        '''remove job and its sub jobs'''
+        with self._lock, self._conn:
+            self._delete(full_name.strip('/'))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM jobs')
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _delete(self, full_name: str) -> None:
+        self._conn.execute('DELETE FROM jobs WHERE full_name = ? OR substr(full_name, 1, ?) = ?',
+                           (full_name, len(full_name) + 1, f'{full_name}/'))
+
+
+def _join(parent: str, name: str) -> str:
+    return f'{parent}/{name}' if parent else name
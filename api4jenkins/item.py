@@ -1,14 +1,20 @@
 # encoding: utf-8
 
 import contextlib
+import json
 import re
+import threading
+from functools import lru_cache, partial
 from importlib import import_module
-from typing import Any, Dict, List, Optional, Union, Iterator, AsyncIterator
-from httpx import Response
+from types import MappingProxyType
+from typing import (Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Tuple, Union)
+from httpx import URL, Response
 
 import api4jenkins
 
 from .exceptions import ItemNotFoundError
+from .http import STREAM_EXTENSION
 
 
 def camel(s: str) -> str:
@@ -33,37 +39,277 @@ def append_slash(url: str) -> str:
     return url if url[-1] == '/' else f'{url}/'
 
 
-def _new_item() -> Any:
-    delimiter = re.compile(r'[.$]')
+_delimiter = re.compile(r'[.$]')
+_custom_classes: Dict[str, Tuple[Optional[type], Optional[type]]] = {}
+
+
+def register_class(jenkins_class: str, cls: Optional[type] = None,
+                   async_cls: Optional[type] = None) -> None:
+    '''Register classes to describe items of ``_class``, it takes precedence
+    over classes found in modules
+
+    :param jenkins_class: full or short name of ``_class``, e.g.
+        ``com.example.MyProject`` or ``MyProject``
+    :param cls: (optional) class for :class:`Jenkins <api4jenkins.Jenkins>`
+    :param async_cls: (optional) class for :class:`AsyncJenkins <api4jenkins.AsyncJenkins>`
+
+    Usage::
+
+        >>> from api4jenkins.item import register_class
+        >>> from api4jenkins.job import AsyncProject, Project
+        >>> class MyProject(Project): ...
+        >>> class AsyncMyProject(AsyncProject): ...
+        >>> register_class('com.example.MyProject', MyProject, AsyncMyProject)
+    '''
+    _custom_classes[jenkins_class] = (cls, async_cls)
+    resolve_class.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def resolve_class(module: str, jenkins_class: str, jenkins_type: type) -> Optional[type]:
+    '''Return class to describe ``_class`` in module, None if not found'''
+    is_async = issubclass(jenkins_type, api4jenkins.AsyncJenkins)
+    class_name = _delimiter.split(jenkins_class)[-1]
+    for key in (jenkins_class, class_name):
+        if cls := _custom_classes.get(key, (None, None))[is_async]:
+            return cls
+    if is_async:
+        class_name = f'Async{class_name}'
+    return getattr(import_module(module), class_name, None)
+
+
+def new_item(jenkins: Any, module: str, item: Dict[str, Any]) -> Any:
+    _class = resolve_class(module, item['_class'], type(jenkins))
+    if _class is None:
+        class_name = _delimiter.split(item['_class'])[-1]
+        msg = f'''{module} has no class {class_name} to describe
+              {item["url"]}, register new class with api4jenkins.item.register_class,
+              see: https://api4jenkins.readthedocs.io/en/latest/user/example.html#patch'''
+        raise AttributeError(msg)
+    return _class(jenkins, item['url'])
+
+
+class AttrRegistry:
+    '''Process wide registry of :attr:`dynamic_attrs` per item class, shared
+    by sync and async classes, e.g. ``FreeStyleProject`` is key of both
+    ``FreeStyleProject`` and ``AsyncFreeStyleProject``. Missing class is
+    discovered with ``tree=*`` which returns top level values only, it can
+    be warmed at startup to avoid discovery at all.
+
+    Usage::
+
+        >>> import json
+        >>> from api4jenkins.item import attr_registry
+        >>> attr_registry.warm(json.load(open('attrs.json')))
+        >>> json.dump(attr_registry.as_dict(), open('attrs.json', 'w'))
+    '''
+
+    def __init__(self) -> None:
+        self._names: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(item_class: type) -> str:
+        return re.sub('^Async', '', item_class.__name__)
+
+    def get(self, cls: type) -> Optional[List[str]]:
+        return self._names.get(self.key(cls))
+
+    def register(self, cls: type, api_json: Mapping[str, Any]) -> List[str]:
+        '''register names of values with simple type in api_json'''
+        types = (int, str, bool, type(None))
+        names = [snake(k) for k in api_json if isinstance(api_json[k], types)]
+        with self._lock:
+            return self._names.setdefault(self.key(cls), names)
+
+    def warm(self, schema: Mapping[str, Iterable[str]]) -> None:
+        '''add attribute names keyed by class name, e.g. output of as_dict'''
+        with self._lock:
+            for key, names in schema.items():
+                self._names[key] = list(names)
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {key: list(names) for key, names in self._names.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._names.clear()
+
+
+attr_registry = AttrRegistry()
+
+_DELIMITERS = frozenset(' \t\n\r,]}')
+
+
+class JSONArrayParser:
+    '''Incremental parser which yields elements of array at ``path`` of
+    json object as soon as they are complete, e.g. ``suites.cases`` yields
+    every case of every suite. Other values are skipped, only incomplete
+    element is buffered.
+
+    Usage::
+
+        >>> parser = JSONArrayParser('jobs')
+        >>> list(parser.feed('{"jobs": [{"name": "a"}, {"na'))
+        [{'name': 'a'}]
+        >>> list(parser.feed('me": "b"}]}'))
+        [{'name': 'b'}]
+        >>> parser.close()
+    '''
+    _ws = re.compile(r'[ \t\n\r]*')
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, path: str) -> None:
+        self.keys = path.split('.')
+        self.done = False
+        self._buf = ''
+        self._pos = 0
+        self._state = 'object'
+        self._level = 0
+
+    def feed(self, text: str) -> Iterator[Any]:
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        while not self.done:
+            pos = self._ws.match(self._buf, self._pos).end()
+            if pos == len(self._buf):
+                self._pos = pos
+                return
+            char = self._buf[pos]
+            if self._state == 'object':
+                self._expect(char, '{', pos)
+                self._pos, self._state = pos + 1, 'key'
+            elif self._state == 'key' and char == ',':
+                self._pos = pos + 1
+            elif self._state == 'key' and char == '}':
+                self._pos = pos + 1
+                if self._level == 0:
+                    self.done = True
+                self._level, self._state = self._level - 1, 'array'
+            elif self._state == 'key':
+                if not self._read_member(pos):
+                    return
+            elif char == ',':
+                self._pos = pos + 1
+            elif char == ']':
+                self._pos, self._state = pos + 1, 'key'
+                if self._level == 0:
+                    self.done = True
+            elif self._level == len(self.keys) - 1:
+                value = self._decode(pos)
+                if value is None:
+                    return
+                self._pos = value[1]
+                yield value[0]
+            else:
+                self._level, self._state = self._level + 1, 'object'
+
+    def close(self) -> None:
+        if not self.done:
+            raise json.JSONDecodeError('Unexpected end of data',
+                                       self._buf, len(self._buf))
+
+    def _read_member(self, pos: int) -> bool:
+        key = self._decode(pos)
+        if key is None:
+            return False
+        pos = self._ws.match(self._buf, key[1]).end()
+        if pos == len(self._buf):
+            return False
+        self._expect(self._buf[pos], ':', pos)
+        pos = self._ws.match(self._buf, pos + 1).end()
+        if pos == len(self._buf):
+            return False
+        if key[0] == self.keys[self._level] and self._buf[pos] == '[':
+            self._pos, self._state = pos + 1, 'array'
+            return True
+        value = self._decode(pos)
+        if value is None:
+            return False
+        self._pos = value[1]
+        return True
 
-    def func(jenkins: Any, module: str, item: Dict[str, Any]) -> Any:
-        class_name = delimiter.split(item['_class'])[-1]
-        if isinstance(jenkins, api4jenkins.AsyncJenkins):
-            class_name = f'Async{class_name}'
-        mod = import_module(module)
-        if not hasattr(mod, class_name):
-            msg = f'''{mod} has no class {class_name} to describe
-                  {item["url"]}, patch new class with api4jenkins._patch_to,
-                  see: https://api4jenkins.readthedocs.io/en/latest/user/example.html#patch'''
-            raise AttributeError(msg)
-        _class = getattr(mod, class_name)
-        return _class(jenkins, item['url'])
+    def _decode(self, pos: int) -> Optional[Any]:
+        '''return value and its end, None if value is incomplete'''
+        try:
+            value, end = self._decoder.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            return None
+        # number and literal are complete only if delimiter follows them
+        if self._buf[pos] not in '{["' and self._buf[end:end + 1] not in _DELIMITERS:
+            return None
+        return value, end
 
-    return func
+    def _expect(self, char: str, expected: str, pos: int) -> None:
+        if char != expected:
+            raise json.JSONDecodeError(f'Expecting {expected!r}', self._buf, pos)
+
+
+class Snapshot:
+    '''Immutable view of fields of item which are fetched with one request,
+    fields are accessed as attributes in snake case like item.
+
+    Usage::
+
+        >>> snapshot = build.snapshot('result', 'duration', 'timestamp')
+        >>> snapshot.result, snapshot.duration
+        ('SUCCESS', 1520)
+        >>> snapshot = snapshot.refresh()
+    '''
+    __slots__ = ('_data', '_fields', '_item')
+
+    def __init__(self, item: Any, fields: Tuple[str, ...], data: Dict[str, Any]) -> None:
+        object.__setattr__(self, '_item', item)
+        object.__setattr__(self, '_fields', fields)
+        object.__setattr__(self, '_data', MappingProxyType(data))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[camel(name)]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __str__(self) -> str:
+        return f'<{type(self).__name__}: {self._item.url}>'
 
+    def __dir__(self) -> List[str]:
+        return list(super().__dir__()) + [snake(k) for k in self._data]
 
-new_item = _new_item()
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+    def refresh(self) -> Any:
+        '''Fetch same fields again, return new snapshot, or coroutine of it
+        for async item'''
+        return self._item.snapshot(*self._fields)
+
+
+def _snapshot_tree(fields: Tuple[str, ...]) -> str:
+    return ','.join(camel(field) for field in fields)
 
 
 class BaseItem:
+    # items are created in bulk when iterating folders, builds or nodes, keep
+    # common attributes in slots, __dict__ is allocated only by subclasses
+    # which set other attributes
+    __slots__ = ('__dict__', 'jenkins', 'url')
     headers: Dict[str, str] = {'Content-Type': 'text/xml; charset=utf-8'}
-    _attr_names: List[str] = []
 
     def __init__(self, jenkins: Any, url: str) -> None:
         self.jenkins = jenkins
         self.url = append_slash(url)
-        self._request = jenkins.http_client.request
-        self._stream = jenkins.http_client.stream
+
+    @property
+    def _request(self) -> Any:
+        return self.jenkins.http_client.request
+
+    @property
+    def _stream(self) -> Any:
+        return self.jenkins.http_client.stream
 
     def _new_item(self, module: str, item: Dict[str, Any]) -> Any:
         return new_item(self.jenkins, module, item)
@@ -80,11 +326,11 @@ class BaseItem:
             headers.update(crumb)
             kwargs['headers'] = headers
 
-    @classmethod
-    def _get_attr_names(cls, api_json: Dict[str, Any]) -> None:
-        types = (int, str, bool, type(None))
-        cls._attr_names = [snake(k)
-                           for k in api_json if isinstance(api_json[k], types)]
+    def _flight_key(self, method: str, entry: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        '''key to share identical GET in flight, None if it can not be shared'''
+        if method != 'GET' or not self.jenkins.single_flight or set(kwargs) - {'params'}:
+            return None
+        return str(URL(self.url + entry, params=kwargs.get('params')))
 
 
 class Item(BaseItem):
@@ -93,18 +339,46 @@ class Item(BaseItem):
         params = {'depth': depth}
         if tree:
             params['tree'] = tree
-        return self.handle_req('GET', 'api/json', params=params).json()
+        return self.jenkins.json_decoder(self.handle_req('GET', 'api/json', params=params).content)
+
+    def iter_json(self, path: str, tree: str = '', depth: int = 0) -> Iterator[Any]:
+        '''Yield elements of array at ``path`` of api json while response is
+        received, see :class:`JSONArrayParser`, e.g. ``suites.cases``'''
+        params = {'depth': depth}
+        if tree:
+            params['tree'] = tree
+        parser = JSONArrayParser(path)
+        with self.handle_stream('GET', 'api/json', params=params) as response:
+            for text in response.iter_text():
+                yield from parser.feed(text)
+                if parser.done:
+                    return
+        parser.close()
 
     def handle_req(self, method: str, entry: str, **kwargs: Any) -> Response:
+        key = self._flight_key(method, entry, kwargs)
         self._add_crumb(self.jenkins.crumb, kwargs)
-        return self._request(method, self.url + entry, **kwargs)
+        if key is None:
+            return self._request(method, self.url + entry, **kwargs)
+        return self.jenkins.single_flight.do(
+            key, partial(self._request, method, self.url + entry, **kwargs))
 
     @contextlib.contextmanager
     def handle_stream(self, method: str, entry: str, **kwargs: Any) -> Iterator[Response]:
         self._add_crumb(self.jenkins.crumb, kwargs)
+        kwargs['extensions'] = {**kwargs.get('extensions', {}), STREAM_EXTENSION: True}
         with self._stream(method, self.url + entry, **kwargs) as response:
             yield response
 
+    def snapshot(self, *fields: str) -> Snapshot:
+        '''Fetch fields with one request and return :class:`Snapshot`,
+        all :attr:`dynamic_attrs` are fetched if fields are not given
+
+        :param fields: attribute names in snake case, e.g. ``result``
+        '''
+        fields = fields or tuple(self.dynamic_attrs)
+        return Snapshot(self, fields, self.api_json(tree=_snapshot_tree(fields)))
+
     def exists(self) -> bool:
         try:
             self.api_json(tree='_class')
@@ -114,9 +388,10 @@ class Item(BaseItem):
 
     @property
     def dynamic_attrs(self) -> List[str]:
-        if not self._attr_names:
-            self._get_attr_names(self.api_json())
-        return self._attr_names
+        names = attr_registry.get(type(self))
+        if names is None:
+            names = attr_registry.register(type(self), self.api_json(tree='*'))
+        return names
 
     def __getattr__(self, name: str) -> Any:
         if name in self.dynamic_attrs:
@@ -142,18 +417,40 @@ class AsyncItem(BaseItem):
         params = {'depth': depth}
         if tree:
             params['tree'] = tree
-        return (await self.handle_req('GET', 'api/json', params=params)).json()
+        return self.jenkins.json_decoder((await self.handle_req('GET', 'api/json', params=params)).content)
+
+    async def iter_json(self, path: str, tree: str = '', depth: int = 0) -> AsyncIterator[Any]:
+        params = {'depth': depth}
+        if tree:
+            params['tree'] = tree
+        parser = JSONArrayParser(path)
+        async with self.handle_stream('GET', 'api/json', params=params) as response:
+            async for text in response.aiter_text():
+                for element in parser.feed(text):
+                    yield element
+                if parser.done:
+                    return
+        parser.close()
 
     async def handle_req(self, method: str, entry: str, **kwargs: Any) -> Response:
+        key = self._flight_key(method, entry, kwargs)
         self._add_crumb(await self.jenkins.crumb, kwargs)
-        return await self._request(method, self.url + entry, **kwargs)
+        if key is None:
+            return await self._request(method, self.url + entry, **kwargs)
+        return await self.jenkins.single_flight.async_do(
+            key, partial(self._request, method, self.url + entry, **kwargs))
 
     @contextlib.asynccontextmanager
     async def handle_stream(self, method: str, entry: str, **kwargs: Any) -> AsyncIterator[Response]:
         self._add_crumb(await self.jenkins.crumb, kwargs)
+        kwargs['extensions'] = {**kwargs.get('extensions', {}), STREAM_EXTENSION: True}
         async with self._stream(method, self.url + entry, **kwargs) as response:
             yield response
 
+    async def snapshot(self, *fields: str) -> Snapshot:
+        fields = fields or tuple(await self.dynamic_attrs)
+        return Snapshot(self, fields, await self.api_json(tree=_snapshot_tree(fields)))
+
     async def exists(self) -> bool:
         try:
             await self.api_json(tree='_class')
@@ -163,9 +460,10 @@ class AsyncItem(BaseItem):
 
     @property
     async def dynamic_attrs(self) -> List[str]:
-        if not self._attr_names:
-            self._get_attr_names(await self.api_json())
-        return self._attr_names
+        names = attr_registry.get(type(self))
+        if names is None:
+            names = attr_registry.register(type(self), await self.api_json(tree='*'))
+        return names
 
     async def __getattr__(self, name: str) -> Any:
         if name in (await self.dynamic_attrs):
@@ -1,10 +1,14 @@
 # encoding: utf-8
+import asyncio
 import json
 import xml.etree.ElementTree as ET
-from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partialmethod
+from types import MappingProxyType
 from pathlib import PurePosixPath
-from urllib.parse import unquote_plus
-from typing import Optional, Dict, List, Any, Union, Iterator, AsyncIterator, Tuple
+from urllib.parse import quote, unquote, unquote_plus
+from typing import Optional, Dict, List, Any, Union, Iterator, AsyncIterator, Tuple, Mapping
 
 try:
     from typing import override
@@ -15,6 +19,7 @@ except ImportError:
 from httpx import Response
 
 from .credential import AsyncCredentials, Credentials
+from .exceptions import ItemNotFoundError
 from .item import AsyncItem, Item, append_slash, new_item, snake
 from .mix import (
     AsyncConfigurationMixIn,
@@ -42,6 +47,10 @@ class NameMixIn:
     def full_name(self) -> str:
         return unquote_plus(self.jenkins._url2name(self.url))
 
+    def _invalidate_index(self) -> None:
+        if self.jenkins.index is not None:
+            self.jenkins.index.invalidate(self.full_name)
+
     @property
     def full_display_name(self) -> str:
         return unquote_plus(self.full_name.replace('/', ' » '))
@@ -53,15 +62,21 @@ class Job(Item, ConfigurationMixIn, DescriptionMixIn, DeletionMixIn, NameMixIn):
         path = path.strip('/')
         params = {'destination': f'/{path}', 'json': json.dumps({'destination': f'/{path}'})}
         resp = self.handle_req('POST', 'move/move', data=params)
+        self._invalidate_index()
         self.url = resp.headers['Location']
         return resp
 
     def rename(self, name: str) -> Response:
         resp = self.handle_req('POST', 'confirmRename',
                                params={'newName': name})
+        self._invalidate_index()
         self.url = append_slash(resp.headers['Location'])
         return resp
 
+    def delete(self) -> Any:
+        super().delete()
+        self._invalidate_index()
+
     def duplicate(self, path: str, recursive: bool = False) -> None:
         self.jenkins.create_job(path, self.configure(), recursive=recursive)
 
@@ -80,6 +95,20 @@ def _make_query(depth: int) -> str:
     return query
 
 
+def _parse_item(jenkins: Any, name: str, response: Response) -> Optional[Dict[str, Any]]:
+    '''return job or build of direct lookup, None if response is not
+    trustworthy, e.g. login page from proxy or item with other name'''
+    try:
+        item = jenkins.json_decoder(response.content)
+    except ValueError:
+        return None
+    if not isinstance(item, dict) or '_class' not in item or not item.get('url'):
+        return None
+    if unquote(item['url'].rstrip('/').rsplit('/', 1)[-1]) != name:
+        return None
+    return item
+
+
 def _iter_jobs(jenkins: Any, item: Dict[str, Any]) -> Iterator[Any]:
     yield new_item(jenkins, __name__, item)
     if jobs := item.get('jobs'):
@@ -87,25 +116,77 @@ def _iter_jobs(jenkins: Any, item: Dict[str, Any]) -> Iterator[Any]:
             yield from _iter_jobs(jenkins, job)
 
 
+def _crawl_tree(level: int, depth: int) -> str:
+    '''listing of one folder, first sub job tells if a job is non-empty folder'''
+    return 'jobs[url,jobs[url]{0,1}]' if level < depth else 'jobs[url]'
+
+
+def _list_jobs(folder: Any, level: int, depth: int) -> Tuple[int, List[Dict[str, Any]]]:
+    try:
+        return level, folder.api_json(tree=_crawl_tree(level, depth))['jobs']
+    except ItemNotFoundError:
+        # sub folder was removed while crawling
+        if level == 0:
+            raise
+        return level, []
+
+
 class Folder(Job):
     def create(self, name: str, xml: str) -> Response:
         return self.handle_req('POST', 'createItem', params={'name': name}, headers=self.headers, content=xml)
 
     def get(self, name: str) -> Optional[Any]:
-        for item in self.api_json(tree='jobs[name,url]')['jobs']:
-            if name == item['name']:
+        '''Get job by name with one request to job, listing of folder is
+        used only if response is not trustworthy'''
+        try:
+            resp = self.handle_req('GET', f'job/{quote(name)}/api/json',
+                                   params={'tree': '_class,url'})
+            if item := _parse_item(self.jenkins, name, resp):
                 return self._new_item(__name__, item)
+            for item in self.api_json(tree='jobs[name,url]')['jobs']:
+                if name == item['name']:
+                    return self._new_item(__name__, item)
+        except ItemNotFoundError:
+            pass
         return None
 
     @override
-    def iter(self, depth: int = 0) -> Iterator[Any]:  # type: ignore[override]
+    def iter(self, depth: int = 0, stream: bool = False) -> Iterator[Any]:  # type: ignore[override]
         """Override base Item.iter() to provide job iteration.
         Note: This intentionally changes the return type from NoReturn to Iterator
         as part of the design pattern where base class prohibits iteration
-        but concrete implementations enable it."""
-        for item in self.api_json(tree=_make_query(depth))['jobs']:
+        but concrete implementations enable it.
+        Set ``stream`` to yield jobs while response is received."""
+        query = _make_query(depth)
+        items = self.iter_json('jobs', tree=query) if stream else self.api_json(tree=query)['jobs']
+        for item in items:
             yield from _iter_jobs(self.jenkins, item)
 
+    def crawl(self, depth: int = 0, workers: int = 8) -> Iterator[Any]:
+        '''Iterate same jobs as :meth:`iter`, but list folders level by level
+        with one request per folder instead of one nested query, sub folders
+        are listed concurrently once they are found
+
+        :param depth: ``int``, depth to iterate, default is 0
+        :param workers: ``int``, max concurrent listings, default is 8
+        :returns: iterator of jobs, in order of listings completed
+        '''
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(_list_jobs, self, 0, depth)}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        level, items = future.result()
+                        for item in items:
+                            job = self._new_item(__name__, item)
+                            yield job
+                            if level < depth and item.get('jobs'):
+                                pending.add(pool.submit(_list_jobs, job, level + 1, depth))
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def copy(self, src: str, dest: str) -> Response:
         params = {'name': dest, 'mode': 'copy', 'from': src}
         return self.handle_req('POST', 'createItem', params=params)
@@ -121,8 +202,8 @@ class Folder(Job):
     def credentials(self) -> Credentials:
         return Credentials(self.jenkins, f'{self.url}credentials/store/folder/')
 
-    def __call__(self, depth: int) -> Iterator[Any]:
-        yield from self.iter(depth)
+    def __call__(self, depth: int, stream: bool = False) -> Iterator[Any]:
+        yield from self.iter(depth, stream)
 
 
 class WorkflowMultiBranchProject(Folder, EnableMixIn):
@@ -145,7 +226,7 @@ class OrganizationFolder(WorkflowMultiBranchProject):
             yield from resp.iter_lines()
 
 
-def _set_get_methods(job: Any, func: Any) -> None:
+def _set_get_methods(cls: type, func: Any) -> None:
     for key in [
         'firstBuild',
         'lastBuild',
@@ -156,15 +237,127 @@ def _set_get_methods(job: Any, func: Any) -> None:
         'lastSuccessfulBuild',
         'lastUnsuccessfulBuild',
     ]:
-        setattr(job, snake(f'get_{key}'), partial(func, key))
+        setattr(cls, snake(f'get_{key}'), partialmethod(func, key))
 
 
 def _get_build(job: Any, api_json: Dict[str, Any], number: Union[int, str]) -> Optional[Any]:
+    # builds are newest first, keep newest build of repeated name as the scan
+    job._build_names = {item['displayName']: item for item in reversed(api_json['builds'])}
     for item in api_json['builds']:
         if number in [item['number'], item['displayName']]:
             return job._new_item('api4jenkins.build', item)
 
 
+def _check_indexed_build(jenkins: Any, item: Dict[str, Any], name: str,
+                         response: Response) -> Optional[Dict[str, Any]]:
+    '''return build of index if it still exists with the display name'''
+    build = _parse_item(jenkins, str(item['number']), response)
+    if build and build.get('displayName') == name:
+        return build
+    return None
+
+
+def _page_tree(key: str, fields: str, start: int, page_size: Optional[int]) -> str:
+    if not page_size:
+        return f'{key}[{fields}]'
+    return f'{key}[{fields}]{{{start},{start + page_size}}}'
+
+
+class _Pages:
+    '''offsets of pages over builds, which are newest first and change
+    while paging. Builds started since last page shift offsets forward, so
+    builds not older than last yielded one are dropped. Pages overlap by
+    one build, first build of page older than last yielded one means builds
+    were deleted and offsets shifted backward, then previous page is
+    requested again'''
+
+    def __init__(self, page_size: Optional[int]) -> None:
+        self.page_size = page_size
+        self.overlap = 1 if page_size and page_size > 1 else 0
+        self.start = 0
+        self.last: Optional[int] = None
+        self.done = False
+
+    def tree(self, key: str, fields: str) -> str:
+        return _page_tree(key, fields, self.start, self.page_size)
+
+    def feed(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        '''return builds of page not yielded yet and move to next page'''
+        size = len(items)
+        if self.last is not None:
+            if self.overlap and items and items[0]['number'] < self.last:
+                self.start = max(self.start - self.page_size, 0)
+                return []
+            items = [item for item in items if item['number'] < self.last]
+        if not self.page_size or size < self.page_size:
+            self.done = True
+            return items
+        if items:
+            self.last = items[-1]['number']
+        self.start += self.page_size - self.overlap
+        return items
+
+
+def _iter_pages(job: Any, key: str, fields: str, page_size: Optional[int]) -> Iterator[Dict[str, Any]]:
+    '''yield builds page by page with range ``{start,end}``, next page is
+    requested only when previous one is consumed, see :class:`_Pages`'''
+    pages = _Pages(page_size)
+    while not pages.done:
+        yield from pages.feed(job.api_json(tree=pages.tree(key, fields))[key])
+
+
+async def _aiter_pages(job: Any, key: str, fields: str, page_size: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+    pages = _Pages(page_size)
+    while not pages.done:
+        for item in pages.feed((await job.api_json(tree=pages.tree(key, fields)))[key]):
+            yield item
+
+
+_RESULTS = ['SUCCESS', 'UNSTABLE', 'FAILURE', 'NOT_BUILT', 'ABORTED']
+_BUILD_FIELDS = 'number,url,result,timestamp,duration,building'
+
+
+def _to_millis(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.timestamp()
+    return value * 1000
+
+
+def _new_build_filter(result: Optional[str] = None, since: Any = None, until: Any = None,
+                      min_duration: Optional[float] = None, max_duration: Optional[float] = None,
+                      building: Optional[bool] = None, cause: Optional[str] = None) -> Tuple[str, Any, Any]:
+    '''return fields to project, function to match build and function to
+    check if rest of builds are too old, since they are newest first'''
+    if result is not None and result not in _RESULTS:
+        raise ValueError(f'Expect one of {_RESULTS}')
+    since, until = _to_millis(since), _to_millis(until)
+    min_duration, max_duration = _to_millis(min_duration), _to_millis(max_duration)
+    fields = _BUILD_FIELDS
+    if cause:
+        fields += ',actions[causes[shortDescription]]'
+
+    def _has_cause(item: Dict[str, Any]) -> bool:
+        return any(cause in c.get('shortDescription', '') or c.get('_class', '').endswith(cause)
+                   for action in item.get('actions', []) if action
+                   for c in action.get('causes', []))
+
+    def match(item: Dict[str, Any]) -> bool:
+        return all((result is None or item['result'] == result,
+                    since is None or item['timestamp'] >= since,
+                    until is None or item['timestamp'] < until,
+                    min_duration is None or item['duration'] >= min_duration,
+                    max_duration is None or item['duration'] <= max_duration,
+                    building is None or item['building'] == building,
+                    not cause or _has_cause(item)))
+
+    def expired(item: Dict[str, Any]) -> bool:
+        return since is not None and item['timestamp'] < since
+
+    return fields, match, expired
+
+
 def _parse_build_params(params: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
     reserved = ['token', 'delay']
     entry = 'buildWithParameters'
@@ -179,15 +372,12 @@ def _parse_build_params(params: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Di
 
 
 class Project(Job, EnableMixIn):
-    def __init__(self, jenkins: Any, url: str) -> None:
-        super().__init__(jenkins, url)
+    _build_names: Mapping[str, Dict[str, Any]] = MappingProxyType({})
 
-        def _get_build_by_key(key: str) -> Any:
-            item = self.api_json(tree=f'{key}[url]')[key]
-            if item:
-                return self._new_item('api4jenkins.build', item)
-
-        _set_get_methods(self, _get_build_by_key)
+    def _get_build_by_key(self, key: str) -> Any:
+        item = self.api_json(tree=f'{key}[url]')[key]
+        if item:
+            return self._new_item('api4jenkins.build', item)
 
     def build(self, **params) -> 'QueueItem':
         entry, params, files = _parse_build_params(params)
@@ -196,19 +386,46 @@ class Project(Job, EnableMixIn):
         return QueueItem(self.jenkins, resp.headers['Location'])
 
     def get(self, number: Union[int, str]) -> Optional[Any]:
+        '''Get build by number with one request to build, or by display name
+        with index of builds, build found in index is checked with one request
+        to it, index is refreshed when name is not in it or build is gone'''
+        if isinstance(number, int):
+            try:
+                resp = self.handle_req('GET', f'{number}/api/json', params={'tree': '_class,url'})
+            except ItemNotFoundError:
+                return None
+            if item := _parse_item(self.jenkins, str(number), resp):
+                return self._new_item('api4jenkins.build', item)
+        elif (item := self._build_names.get(number)) and (item := self._get_indexed_build(item, number)):
+            return self._new_item('api4jenkins.build', item)
         return _get_build(self, self.api_json(tree='builds[number,displayName,url]'), number)
 
+    def _get_indexed_build(self, item: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+        # index may be stale, build can be deleted or renamed since listing
+        try:
+            resp = self.handle_req('GET', f"{item['number']}/api/json",
+                                   params={'tree': '_class,url,displayName'})
+        except ItemNotFoundError:
+            return None
+        return _check_indexed_build(self.jenkins, item, name, resp)
+
     @override
-    def iter(self) -> Iterator[Any]:  # type: ignore[override]
+    def iter(self, page_size: Optional[int] = 100) -> Iterator[Any]:  # type: ignore[override]
         """Override base Item.iter() to provide build iteration.
         Note: This intentionally changes the return type from NoReturn to Iterator
         as part of the design pattern where base class prohibits iteration
-        but concrete implementations enable it."""
-        for item in self.api_json(tree='builds[number,url]')['builds']:
+        but concrete implementations enable it.
+        Builds are requested ``page_size`` at a time while iterating, set
+        it to None to request all in one response."""
+        for item in _iter_pages(self, 'builds', 'number,url', page_size):
             yield self._new_item('api4jenkins.build', item)
 
-    def iter_all_builds(self) -> Iterator[Any]:
-        for item in self.api_json(tree='allBuilds[number,url]')['allBuilds']:
+    def iter_all_builds(self, stream: bool = False, page_size: Optional[int] = 100) -> Iterator[Any]:
+        '''Iterate all builds, ``page_size`` at a time, or in one streamed
+        response if ``stream`` is True'''
+        items = self.iter_json('allBuilds', tree='allBuilds[number,url]') if stream \
+            else _iter_pages(self, 'allBuilds', 'number,url', page_size)
+        for item in items:
             yield self._new_item('api4jenkins.build', item)
 
     def set_next_build_number(self, number: int) -> None:
@@ -233,10 +450,45 @@ class Project(Job, EnableMixIn):
         'SUCCESS', 'UNSTABLE', 'FAILURE', 'NOT_BUILT', 'ABORTED'
         see: https://javadoc.jenkins-ci.org/hudson/model/Result.html
         """
-        expect = ['SUCCESS', 'UNSTABLE', 'FAILURE', 'NOT_BUILT', 'ABORTED']
-        if result not in expect:
-            raise ValueError(f'Expect one of {expect}')
-        yield from filter(lambda build: build.result == result, self)
+        yield from self.filter_builds(result=result)
+
+    def filter_builds(self, *, all_builds: bool = False, page_size: Optional[int] = 100,
+                      **filters: Any) -> Iterator[Any]:
+        '''Filter builds with fields of builds listing, no request is sent for
+        each build
+
+        :param result: (optional) one of 'SUCCESS', 'UNSTABLE', 'FAILURE',
+            'NOT_BUILT', 'ABORTED'
+        :param since: (optional) ``datetime`` or seconds since epoch, builds
+            started before it are skipped and paging stops at first of them
+        :param until: (optional) ``datetime`` or seconds since epoch
+        :param min_duration: (optional) seconds
+        :param max_duration: (optional) seconds
+        :param building: (optional) ``bool``
+        :param cause: (optional) part of short description or class name of
+            cause, e.g. 'Started by timer' or 'TimerTriggerCause'
+        :param all_builds: (optional) filter ``allBuilds`` instead of latest
+            builds, default is False
+        :param page_size: (optional) builds per request, default is 100
+        :returns: iterator of builds
+
+        Usage::
+
+            >>> from datetime import datetime, timedelta
+            >>> for build in job.filter_builds(result='FAILURE',
+            ...                                since=datetime.now() - timedelta(days=1)):
+            ...     print(build)
+        '''
+        fields, match, expired = _new_build_filter(**filters)
+        key = 'allBuilds' if all_builds else 'builds'
+        for item in _iter_pages(self, key, fields, page_size):
+            if expired(item):
+                return
+            if match(item):
+                yield self._new_item('api4jenkins.build', item)
+
+
+_set_get_methods(Project, Project._get_build_by_key)
 
 
 class WorkflowJob(Project):
@@ -287,14 +539,20 @@ class AsyncJob(AsyncItem, AsyncConfigurationMixIn, AsyncDescriptionMixIn, AsyncD
         path = path.strip('/')
         params = {'destination': f'/{path}', 'json': json.dumps({'destination': f'/{path}'})}
         resp = await self.handle_req('POST', 'move/move', data=params)
+        self._invalidate_index()
         self.url = resp.headers['Location']
         return resp
 
     async def rename(self, name: str) -> Response:
         resp = await self.handle_req('POST', 'confirmRename', params={'newName': name})
+        self._invalidate_index()
         self.url = append_slash(resp.headers['Location'])
         return resp
 
+    async def delete(self) -> Any:
+        await super().delete()
+        self._invalidate_index()
+
     async def duplicate(self, path: str, recursive: bool = False) -> None:
         await self.jenkins.create_job(path, await self.configure(), recursive=recursive)
 
@@ -311,22 +569,62 @@ class AsyncFolder(AsyncJob):
         return await self.handle_req('POST', 'createItem', params={'name': name}, headers=self.headers, content=xml)
 
     async def get(self, name: str) -> Optional[Any]:
-        resp = await self.api_json(tree='jobs[name,url]')
-        for item in resp['jobs']:
-            if name == item['name']:
+        try:
+            resp = await self.handle_req('GET', f'job/{quote(name)}/api/json',
+                                         params={'tree': '_class,url'})
+            if item := _parse_item(self.jenkins, name, resp):
                 return self._new_item(__name__, item)
+            for item in (await self.api_json(tree='jobs[name,url]'))['jobs']:
+                if name == item['name']:
+                    return self._new_item(__name__, item)
+        except ItemNotFoundError:
+            pass
         return None
 
     @override
-    async def aiter(self, depth: int = 0) -> AsyncIterator[Any]:  # type: ignore[override]
+    async def aiter(self, depth: int = 0, stream: bool = False) -> AsyncIterator[Any]:  # type: ignore[override]
         """Override base AsyncItem.aiter() to provide async job iteration.
         Note: This intentionally changes the return type from Coroutine to AsyncIterator
         as part of the design pattern where base class prohibits iteration
-        but concrete implementations enable it."""
-        for item in (await self.api_json(tree=_make_query(depth)))['jobs']:
+        but concrete implementations enable it.
+        Set ``stream`` to yield jobs while response is received."""
+        query = _make_query(depth)
+        if stream:
+            async for item in self.iter_json('jobs', tree=query):
+                for job in _iter_jobs(self.jenkins, item):
+                    yield job
+            return
+        for item in (await self.api_json(tree=query))['jobs']:
             for job in _iter_jobs(self.jenkins, item):
                 yield job
 
+    async def crawl(self, depth: int = 0, workers: int = 8) -> AsyncIterator[Any]:
+        semaphore = asyncio.Semaphore(workers)
+
+        async def list_jobs(folder: Any, level: int) -> Tuple[int, List[Dict[str, Any]]]:
+            async with semaphore:
+                try:
+                    return level, (await folder.api_json(tree=_crawl_tree(level, depth)))['jobs']
+                except ItemNotFoundError:
+                    if level == 0:
+                        raise
+                    return level, []
+
+        pending = {asyncio.ensure_future(list_jobs(self, 0))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    level, items = task.result()
+                    for item in items:
+                        job = self._new_item(__name__, item)
+                        yield job
+                        if level < depth and item.get('jobs'):
+                            pending.add(asyncio.ensure_future(list_jobs(job, level + 1)))
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def copy(self, src: str, dest: str) -> Response:
         params = {'name': dest, 'mode': 'copy', 'from': src}
         return await self.handle_req('POST', 'createItem', params=params)
@@ -342,8 +640,8 @@ class AsyncFolder(AsyncJob):
     def credentials(self) -> AsyncCredentials:
         return AsyncCredentials(self.jenkins, f'{self.url}credentials/store/folder/')
 
-    async def __call__(self, depth: int) -> AsyncIterator[Any]:
-        async for job in self.aiter(depth):
+    async def __call__(self, depth: int, stream: bool = False) -> AsyncIterator[Any]:
+        async for job in self.aiter(depth, stream):
             yield job
 
 
@@ -370,15 +668,12 @@ class AsyncOrganizationFolder(AsyncWorkflowMultiBranchProject):
 
 
 class AsyncProject(AsyncJob, AsyncEnableMixIn):
-    def __init__(self, jenkins: Any, url: str) -> None:
-        super().__init__(jenkins, url)
+    _build_names: Mapping[str, Dict[str, Any]] = MappingProxyType({})
 
-        async def _get_build_by_key(key: str) -> Any:
-            item = (await self.api_json(tree=f'{key}[url]'))[key]
-            if item:
-                return self._new_item('api4jenkins.build', item)
-
-        _set_get_methods(self, _get_build_by_key)
+    async def _get_build_by_key(self, key: str) -> Any:
+        item = (await self.api_json(tree=f'{key}[url]'))[key]
+        if item:
+            return self._new_item('api4jenkins.build', item)
 
     async def build(self, **params: Any) -> 'AsyncQueueItem':
         from .queue import AsyncQueueItem  # Local import to avoid circular dependency
@@ -387,21 +682,38 @@ class AsyncProject(AsyncJob, AsyncEnableMixIn):
         return AsyncQueueItem(self.jenkins, resp.headers['Location'])
 
     async def get(self, number: Union[int, str]) -> Optional[Any]:
+        if isinstance(number, int):
+            try:
+                resp = await self.handle_req('GET', f'{number}/api/json', params={'tree': '_class,url'})
+            except ItemNotFoundError:
+                return None
+            if item := _parse_item(self.jenkins, str(number), resp):
+                return self._new_item('api4jenkins.build', item)
+        elif (item := self._build_names.get(number)) and (item := await self._get_indexed_build(item, number)):
+            return self._new_item('api4jenkins.build', item)
         return _get_build(self, await self.api_json(tree='builds[number,displayName,url]'), number)
 
+    async def _get_indexed_build(self, item: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+        try:
+            resp = await self.handle_req('GET', f"{item['number']}/api/json",
+                                         params={'tree': '_class,url,displayName'})
+        except ItemNotFoundError:
+            return None
+        return _check_indexed_build(self.jenkins, item, name, resp)
+
     @override
-    async def aiter(self) -> AsyncIterator[Any]:  # type: ignore[override]
+    async def aiter(self, page_size: Optional[int] = 100) -> AsyncIterator[Any]:  # type: ignore[override]
         """Override base AsyncItem.aiter() to provide async build iteration.
         Note: This intentionally changes the return type from Coroutine to AsyncIterator
         as part of the design pattern where base class prohibits iteration
         but concrete implementations enable it."""
-        data = await self.api_json(tree='builds[number,url]')
-        for item in data['builds']:
+        async for item in _aiter_pages(self, 'builds', 'number,url', page_size):
             yield self._new_item('api4jenkins.build', item)
 
-    async def iter_all_builds(self) -> AsyncIterator[Any]:
-        data = await self.api_json(tree='allBuilds[number,url]')
-        for item in data['allBuilds']:
+    async def iter_all_builds(self, stream: bool = False, page_size: Optional[int] = 100) -> AsyncIterator[Any]:
+        items = self.iter_json('allBuilds', tree='allBuilds[number,url]') if stream \
+            else _aiter_pages(self, 'allBuilds', 'number,url', page_size)
+        async for item in items:
             yield self._new_item('api4jenkins.build', item)
 
     async def set_next_build_number(self, number: int) -> None:
@@ -426,12 +738,21 @@ class AsyncProject(AsyncJob, AsyncEnableMixIn):
         'SUCCESS', 'UNSTABLE', 'FAILURE', 'NOT_BUILT', 'ABORTED'
         see: https://javadoc.jenkins-ci.org/hudson/model/Result.html
         """
-        expect = ['SUCCESS', 'UNSTABLE', 'FAILURE', 'NOT_BUILT', 'ABORTED']
-        if result not in expect:
-            raise ValueError(f'Expect one of {expect}')
-        async for build in self:
-            if await build.result == result:
-                yield build
+        async for build in self.filter_builds(result=result):
+            yield build
+
+    async def filter_builds(self, *, all_builds: bool = False, page_size: Optional[int] = 100,
+                            **filters: Any) -> AsyncIterator[Any]:
+        fields, match, expired = _new_build_filter(**filters)
+        key = 'allBuilds' if all_builds else 'builds'
+        async for item in _aiter_pages(self, key, fields, page_size):
+            if expired(item):
+                return
+            if match(item):
+                yield self._new_item('api4jenkins.build', item)
+
+
+_set_get_methods(AsyncProject, AsyncProject._get_build_by_key)
 
 
 class AsyncWorkflowJob(AsyncProject):
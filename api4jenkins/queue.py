@@ -1,20 +1,94 @@
 # encoding: utf-8
+import asyncio
 import re
-from typing import Any, Iterator, AsyncIterator, Optional
-from httpx import Response
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, AsyncIterator, List, Optional, Tuple, Union
+from httpx import HTTPError, Response
+from .exceptions import ItemNotFoundError, JenkinsAPIException
 from .item import AsyncItem, Item
 from .mix import (ActionsMixIn, AsyncActionsMixIn)
 from .job import Job, AsyncJob
 from .build import Build, AsyncBuild
 
 
+_watch_tree = 'items[id,url,_class,why]'
+_poll_tree = '_class,cancelled,executable[url]'
+
+# failures of a poll which are worth retrying, anything else is a bug
+_REQUEST_ERRORS = (HTTPError, JenkinsAPIException, OSError, ValueError)
+
+# queue id of running builds, in one request instead of requests per build
+_executables_tree = ('computer[executors[currentExecutable[url,queueId]],'
+                     'oneOffExecutors[currentExecutable[url,queueId]]]')
+
+
+def _find_executable(api_json: Dict[str, Any], id: int) -> Optional[Dict[str, Any]]:
+    for computer in api_json['computer']:
+        for kind in ['executors', 'oneOffExecutors']:
+            for executor in computer.get(kind) or []:
+                # PlaceholderExecutable of pipeline has no queueId
+                execable = executor.get('currentExecutable')
+                if execable and execable.get('queueId') == id:
+                    return execable
+    return None
+
+
+def _next_interval(deadline: Optional[float], interval: float) -> float:
+    if deadline is not None and time.monotonic() + interval > deadline:
+        raise TimeoutError('Timed out waiting for build of queue item')
+    return interval
+
+
+def _is_done(data: Dict[str, Any], build: Optional[Any]) -> bool:
+    '''LeftItem gets executable after executor creates its build, only
+    cancelled item leaves queue without one'''
+    return build is not None or bool(data.get('cancelled'))
+
+
+def _is_fresh(polled_at: Optional[float], interval: float, polling: bool) -> bool:
+    if polled_at is None:
+        return False
+    return polling or time.monotonic() - polled_at <= interval
+
+
+def _index_items(items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    return {item['id']: item for item in items}
+
+
 class Queue(Item):
-    def get(self, id: str) -> Optional['QueueItem']:
-        for item in self.api_json(tree='items[id,url]')['items']:
-            if item['id'] == int(id):
-                return QueueItem(self.jenkins,
-                               f"{self.jenkins.url}{item['url']}")
-        return None
+    def get(self, id: Union[int, str], watcher: Optional['QueueWatcher'] = None) -> Optional['QueueItem']:
+        '''Get queue item by id with one request to item, which also finds
+        item left queue recently
+
+        :param id: id of queue item
+        :param watcher: (optional) :class:`QueueWatcher <api4jenkins.queue.QueueWatcher>`,
+            its last poll of queue is looked up before request if it's fresh
+        :returns: ``QueueItem`` or None
+        '''
+        if watcher is not None and watcher.is_fresh() and (item := watcher.get(id)):
+            return QueueItem(self.jenkins, f"{self.jenkins.url}{item['url']}")
+        try:
+            self.handle_req('GET', f'item/{int(id)}/api/json', params={'tree': 'id'})
+        except ItemNotFoundError:
+            return None
+        return QueueItem(self.jenkins, f'{self.url}item/{int(id)}/')
+
+    def get_many(self, ids: Iterable[Union[int, str]],
+                 watcher: Optional['QueueWatcher'] = None) -> Dict[int, Optional['QueueItem']]:
+        '''Get queue items of ids from one listing of queue, or from last
+        poll of ``watcher`` if it's fresh
+
+        :param ids: ids of queue items
+        :param watcher: (optional) :class:`QueueWatcher <api4jenkins.queue.QueueWatcher>`
+        :returns: ``dict`` of id to ``QueueItem``, None if it is not in queue
+        '''
+        if watcher is not None and watcher.is_fresh():
+            index = watcher.items
+        else:
+            index = _index_items(self.api_json(tree='items[id,url]')['items'])
+        return {int(id): QueueItem(self.jenkins, f"{self.jenkins.url}{index[int(id)]['url']}")
+                if int(id) in index else None for id in ids}
 
     def cancel(self, id: str) -> Response:
         return self.handle_req('POST', 'cancelItem', params={'id': id})
@@ -23,6 +97,11 @@ class Queue(Item):
         for item in self.api_json(tree='items[url]')['items']:
             yield QueueItem(self.jenkins, f"{self.jenkins.url}{item['url']}")
 
+    def watch(self, interval: float = 1, max_errors: int = 3) -> 'QueueWatcher':
+        '''Create :class:`QueueWatcher <api4jenkins.queue.QueueWatcher>` to
+        share one poll of queue among all waiting queue items'''
+        return QueueWatcher(self, interval, max_errors)
+
 # https://javadoc.jenkins.io/hudson/model/Queue.html#buildables
 #  (enter) --> waitingList --+--> blockedProjects
 #                            |        ^
@@ -52,24 +131,60 @@ class QueueItem(Item, ActionsMixIn):
         task = self.api_json(tree='task[url]')['task']
         return self._new_item('api4jenkins.job', task)
 
+    def _poll(self) -> Tuple[Dict[str, Any], Optional[Build]]:
+        '''return ``_class`` and ``cancelled`` of item and its build if
+        item left queue with one'''
+        data = self.api_json(tree=_poll_tree)
+        if data.get('executable'):
+            self._build = self._new_item('api4jenkins.build', data['executable'])
+        return data, self._build
+
     def get_build(self) -> Optional[Build]:
+        '''Get build of item with one request to item, executors are searched
+        with one projected request only if item may be just started
+
+        :returns: build or None if item is blocked, waiting or cancelled
+        '''
         if not self._build:
-            _class = self._class
+            data, _ = self._poll()
             # BlockedItem does not have build
-            if _class.endswith('$LeftItem'):
-                executable = self.api_json('executable[url]')['executable']
-                self._build = self._new_item(
-                    'api4jenkins.build', executable)
-            elif _class.endswith(('$BuildableItem', '$WaitingItem')):
-                for build in self.jenkins.nodes.iter_builds():
-                    # https://javadoc.jenkins.io/hudson/model/Run.html#getQueueId--
-                    # https://javadoc.jenkins.io/hudson/model/Queue.Item.html#getId--
-                    # ensure build exists, see https://github.com/joelee2012/api4jenkins/issues/49
-                    if build.exists() and int(build.queue_id) == self.id:
-                        self._build = build
-                        break
+            if not self._build and data['_class'].endswith(('$BuildableItem', '$WaitingItem')):
+                # https://javadoc.jenkins.io/hudson/model/Run.html#getQueueId--
+                # https://javadoc.jenkins.io/hudson/model/Queue.Item.html#getId--
+                api_json = self.jenkins.nodes.api_json(tree=_executables_tree)
+                if execable := _find_executable(api_json, self.id):
+                    self._build = self._new_item('api4jenkins.build', execable)
         return self._build
 
+    def wait_for_build(self, timeout: Optional[float] = None, interval: float = 0.5,
+                       max_interval: float = 10, watcher: Optional['QueueWatcher'] = None) -> Optional[Build]:
+        '''Wait until build of item starts, ``executable`` of item is polled
+        with interval doubled after each poll, item which left queue keeps
+        being polled until its build is created unless it is cancelled
+
+        :param timeout: (optional) seconds to wait, ``None`` means forever
+        :param interval: (optional) seconds of first interval, default is 0.5
+        :param max_interval: (optional) maximum seconds of interval, default is 10
+        :param watcher: (optional) :class:`QueueWatcher <api4jenkins.queue.QueueWatcher>`
+            to wait with instead of polling item
+        :returns: build or None if item is cancelled
+        :raises TimeoutError: if build does not start in ``timeout``
+
+        Usage::
+
+            >>> item = j.build_job('freestylejob')
+            >>> build = item.wait_for_build(timeout=300)
+        '''
+        if watcher is not None:
+            return watcher.wait_for_build(self, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            data, build = self._poll()
+            if _is_done(data, build):
+                return build
+            time.sleep(_next_interval(deadline, interval))
+            interval = min(interval * 2, max_interval)
+
     def cancel(self) -> Response:
         return self.jenkins.queue.cancel(str(self.id))
 
@@ -91,17 +206,158 @@ class LeftItem(QueueItem):
 class WaitingItem(QueueItem):
     pass
 
+
+class _Watch:
+    '''waiters of one queue item'''
+
+    def __init__(self, item: Any) -> None:
+        self.item = item
+        self.waiters = 0
+        self.errors = 0
+        self.build: Optional[Any] = None
+        self.error: Optional[BaseException] = None
+        self.event = threading.Event()
+
+
+class QueueWatcher:
+    '''Wait queue items with one request to queue per interval for all of
+    them, which lists ``items[id,url,_class,why]``, item which is not in the
+    listing any more is requested to get its build until it's created or
+    item is cancelled. Polling runs in a daemon thread while any item is
+    waited. Last listing is kept in ``items`` as id to item, which
+    :meth:`Queue.get` and :meth:`Queue.get_many` use while watcher is
+    polling or listing is not older than ``interval``. Failed request is
+    retried in next poll, waiters get the error after ``max_errors``
+    consecutive failures.
+
+    :param queue: :class:`Queue <api4jenkins.queue.Queue>`
+    :param interval: (optional) seconds between polls, default is 1
+    :param max_errors: (optional) consecutive failures of request to give
+        up, default is 3
+
+    Usage::
+
+        >>> watcher = j.queue.watch(interval=2)
+        >>> items = [j.build_job(name) for name in ['job1', 'job2']]
+        >>> # from many threads
+        >>> build = watcher.wait_for_build(items[0], timeout=300)
+        >>> build = items[1].wait_for_build(watcher=watcher)
+    '''
+
+    def __init__(self, queue: Queue, interval: float = 1, max_errors: int = 3) -> None:
+        self.queue = queue
+        self.interval = interval
+        self.max_errors = max_errors
+        self.polls = 0
+        self.polled_at: Optional[float] = None
+        self.errors = 0
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self._watches: Dict[int, _Watch] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, id: Union[int, str]) -> Optional[Dict[str, Any]]:
+        '''return item in last poll of queue, None if it's not in queue'''
+        return self.items.get(int(id))
+
+    def is_fresh(self) -> bool:
+        '''whether ``items`` can be trusted, polling stops once no item
+        is waited, then listing gets stale'''
+        return _is_fresh(self.polled_at, self.interval, self._thread is not None)
+
+    def wait_for_build(self, item: QueueItem, timeout: Optional[float] = None) -> Optional[Build]:
+        '''Wait until build of item starts
+
+        :param item: :class:`QueueItem <api4jenkins.queue.QueueItem>`
+        :param timeout: (optional) seconds to wait, ``None`` means forever
+        :returns: build or None if item is cancelled
+        :raises TimeoutError: if build does not start in ``timeout``
+        '''
+        with self._lock:
+            watch = self._watches.setdefault(item.id, _Watch(item))
+            watch.waiters += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        try:
+            if not watch.event.wait(timeout):
+                raise TimeoutError(f'Timed out waiting for build of {item}')
+        finally:
+            with self._lock:
+                watch.waiters -= 1
+                if not watch.waiters and self._watches.get(item.id) is watch:
+                    del self._watches[item.id]
+        if watch.error:
+            raise watch.error
+        return watch.build
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                watches = list(self._watches.values())
+            try:
+                self._poll(watches)
+                self.errors = 0
+            except _REQUEST_ERRORS as e:
+                self.errors += 1
+                if self.errors >= self.max_errors:
+                    for watch in watches:
+                        self._finish(watch, error=e)
+            time.sleep(self.interval)
+
+    def _poll(self, watches: List[_Watch]) -> None:
+        items = self.queue.api_json(tree=_watch_tree)['items']
+        self.polled_at = time.monotonic()
+        self.polls += 1
+        self.items = _index_items(items)
+        for watch in watches:
+            if watch.item.id in self.items:
+                continue
+            try:
+                data, build = watch.item._poll()
+            except _REQUEST_ERRORS as e:
+                watch.errors += 1
+                if watch.errors >= self.max_errors:
+                    self._finish(watch, error=e)
+                continue
+            watch.errors = 0
+            if _is_done(data, build):
+                self._finish(watch, build)
+
+    def _finish(self, watch: _Watch, build: Optional[Any] = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._watches.get(watch.item.id) is watch:
+                del self._watches[watch.item.id]
+        watch.build, watch.error = build, error
+        watch.event.set()
+
 # async class
 
 
 class AsyncQueue(AsyncItem):
 
-    async def get(self, id: str) -> Optional['AsyncQueueItem']:
-        for item in (await self.api_json(tree='items[id,url]'))['items']:
-            if item['id'] == int(id):
-                return AsyncQueueItem(self.jenkins,
-                                    f"{self.jenkins.url}{item['url']}")
-        return None
+    async def get(self, id: Union[int, str],
+                  watcher: Optional['AsyncQueueWatcher'] = None) -> Optional['AsyncQueueItem']:
+        if watcher is not None and watcher.is_fresh() and (item := watcher.get(id)):
+            return AsyncQueueItem(self.jenkins, f"{self.jenkins.url}{item['url']}")
+        try:
+            await self.handle_req('GET', f'item/{int(id)}/api/json', params={'tree': 'id'})
+        except ItemNotFoundError:
+            return None
+        return AsyncQueueItem(self.jenkins, f'{self.url}item/{int(id)}/')
+
+    async def get_many(self, ids: Iterable[Union[int, str]],
+                       watcher: Optional['AsyncQueueWatcher'] = None) -> Dict[int, Optional['AsyncQueueItem']]:
+        if watcher is not None and watcher.is_fresh():
+            index = watcher.items
+        else:
+            index = _index_items((await self.api_json(tree='items[id,url]'))['items'])
+        return {int(id): AsyncQueueItem(self.jenkins, f"{self.jenkins.url}{index[int(id)]['url']}")
+                if int(id) in index else None for id in ids}
 
     async def cancel(self, id: str) -> Response:
         return await self.handle_req('POST', 'cancelItem', params={'id': id})
@@ -110,6 +366,9 @@ class AsyncQueue(AsyncItem):
         for item in (await self.api_json(tree='items[url]'))['items']:
             yield AsyncQueueItem(self.jenkins, f"{self.jenkins.url}{item['url']}")
 
+    def watch(self, interval: float = 1, max_errors: int = 3) -> 'AsyncQueueWatcher':
+        return AsyncQueueWatcher(self, interval, max_errors)
+
 
 class AsyncQueueItem(AsyncItem, AsyncActionsMixIn):
 
@@ -130,24 +389,35 @@ class AsyncQueueItem(AsyncItem, AsyncActionsMixIn):
         data = await self.api_json(tree='task[url]')
         return self._new_item('api4jenkins.job', data['task'])
 
+    async def _poll(self) -> Tuple[Dict[str, Any], Optional[AsyncBuild]]:
+        data = await self.api_json(tree=_poll_tree)
+        if data.get('executable'):
+            self._build = self._new_item('api4jenkins.build', data['executable'])
+        return data, self._build
+
     async def get_build(self) -> Optional[AsyncBuild]:
         if not self._build:
-            _class = await self._class
+            data, _ = await self._poll()
             # BlockedItem does not have build
-            if _class.endswith('$LeftItem'):
-                data = await self.api_json('executable[url]')
-                self._build = self._new_item(
-                    'api4jenkins.build', data['executable'])
-            elif _class.endswith(('$BuildableItem', '$WaitingItem')):
-                async for build in self.jenkins.nodes.iter_builds():
-                    # https://javadoc.jenkins.io/hudson/model/Run.html#getQueueId--
-                    # https://javadoc.jenkins.io/hudson/model/Queue.Item.html#getId--
-                    # ensure build exists, see https://github.com/joelee2012/api4jenkins/issues/49
-                    if await build.exists() and int(await build.queue_id) == self.id:
-                        self._build = build
-                        break
+            if not self._build and data['_class'].endswith(('$BuildableItem', '$WaitingItem')):
+                api_json = await self.jenkins.nodes.api_json(tree=_executables_tree)
+                if execable := _find_executable(api_json, self.id):
+                    self._build = self._new_item('api4jenkins.build', execable)
         return self._build
 
+    async def wait_for_build(self, timeout: Optional[float] = None, interval: float = 0.5,
+                             max_interval: float = 10,
+                             watcher: Optional['AsyncQueueWatcher'] = None) -> Optional[AsyncBuild]:
+        if watcher is not None:
+            return await watcher.wait_for_build(self, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            data, build = await self._poll()
+            if _is_done(data, build):
+                return build
+            await asyncio.sleep(_next_interval(deadline, interval))
+            interval = min(interval * 2, max_interval)
+
     async def cancel(self) -> Response:
         return await self.jenkins.queue.cancel(str(self.id))
 
@@ -166,3 +436,94 @@ class AsyncLeftItem(AsyncQueueItem):
 
 class AsyncWaitingItem(AsyncQueueItem):
     pass
+
+
+class AsyncQueueWatcher:
+
+    def __init__(self, queue: AsyncQueue, interval: float = 1, max_errors: int = 3) -> None:
+        self.queue = queue
+        self.interval = interval
+        self.max_errors = max_errors
+        self.polls = 0
+        self.polled_at: Optional[float] = None
+        self.errors = 0
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self._watches: Dict[int, Tuple[AsyncQueueItem, asyncio.Future[Any]]] = {}
+        self._waiters: Dict[int, int] = {}
+        self._errors: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def get(self, id: Union[int, str]) -> Optional[Dict[str, Any]]:
+        return self.items.get(int(id))
+
+    def is_fresh(self) -> bool:
+        return _is_fresh(self.polled_at, self.interval, self._task is not None)
+
+    async def wait_for_build(self, item: AsyncQueueItem, timeout: Optional[float] = None) -> Optional[AsyncBuild]:
+        if item.id not in self._watches:
+            self._watches[item.id] = (item, asyncio.get_running_loop().create_future())
+        future = self._watches[item.id][1]
+        self._waiters[item.id] = self._waiters.get(item.id, 0) + 1
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        try:
+            # wait does not cancel shared future on timeout or cancellation of one waiter
+            done, _ = await asyncio.wait({future}, timeout=timeout)
+            if not done:
+                raise TimeoutError(f'Timed out waiting for build of {item}')
+            return future.result()
+        finally:
+            self._waiters[item.id] -= 1
+            if not self._waiters[item.id]:
+                del self._waiters[item.id]
+                if item.id in self._watches and self._watches[item.id][1] is future:
+                    del self._watches[item.id]
+                    self._errors.pop(item.id, None)
+
+    async def _run(self) -> None:
+        try:
+            while self._watches:
+                watches = list(self._watches.values())
+                try:
+                    await self._poll(watches)
+                    self.errors = 0
+                except _REQUEST_ERRORS as e:
+                    self.errors += 1
+                    if self.errors >= self.max_errors:
+                        for item, future in watches:
+                            self._finish(item, future, error=e)
+                if self._watches:
+                    await asyncio.sleep(self.interval)
+        finally:
+            self._task = None
+
+    async def _poll(self, watches: List[Tuple[AsyncQueueItem, 'asyncio.Future[Any]']]) -> None:
+        items = (await self.queue.api_json(tree=_watch_tree))['items']
+        self.polled_at = time.monotonic()
+        self.polls += 1
+        self.items = _index_items(items)
+        for item, future in watches:
+            if item.id in self.items:
+                continue
+            try:
+                data, build = await item._poll()
+            except _REQUEST_ERRORS as e:
+                self._errors[item.id] = self._errors.get(item.id, 0) + 1
+                if self._errors[item.id] >= self.max_errors:
+                    self._finish(item, future, error=e)
+                continue
+            self._errors.pop(item.id, None)
+            if _is_done(data, build):
+                self._finish(item, future, build)
+
+    def _finish(self, item: AsyncQueueItem, future: 'asyncio.Future[Any]', build: Optional[Any] = None,
+                error: Optional[BaseException] = None) -> None:
+        if item.id in self._watches and self._watches[item.id][1] is future:
+            del self._watches[item.id]
+            self._errors.pop(item.id, None)
+        if future.done():
+            return
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(build)
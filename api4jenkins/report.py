@@ -39,9 +39,25 @@ class ResultBase:
 
 class TestReport(Item, GetMixIn):
     def __iter__(self) -> Iterator['TestSuite']:
-        for suite in self.api_json()['suites']:
+        yield from self.iter()
+
+    def iter(self, stream: bool = False) -> Iterator['TestSuite']:  # type: ignore[override]
+        '''Iterate test suites, set ``stream`` to yield them while response
+        is received instead of loading whole report'''
+        suites = self.iter_json('suites') if stream else self.api_json()['suites']
+        for suite in suites:
             yield TestSuite(suite)
 
+    def iter_cases(self, stream: bool = False) -> Iterator['TestCase']:
+        '''Iterate test cases of all suites, set ``stream`` to yield them
+        while response is received, memory is bounded by size of case'''
+        if not stream:
+            for suite in self:
+                yield from suite
+            return
+        for case in self.iter_json('suites.cases'):
+            yield TestCase(case)
+
     @property
     def suites(self) -> Generator['TestSuite', None, None]:
         yield from self
@@ -162,10 +178,27 @@ class AsyncGetMixIn(Generic[T]):
 class AsyncTestReport(AsyncItem, AsyncGetMixIn[TestSuite]):
     async def __aiter__(self) -> AsyncIterator[TestSuite]:  # type: ignore[override]
         """Iterate over test suites in the report."""
+        async for suite in self.aiter():
+            yield suite
+
+    async def aiter(self, stream: bool = False) -> AsyncIterator[TestSuite]:
+        if stream:
+            async for suite in self.iter_json('suites'):
+                yield TestSuite(suite)
+            return
         data = await self.api_json()
         for suite in data['suites']:
             yield TestSuite(suite)
 
+    async def iter_cases(self, stream: bool = False) -> AsyncIterator['TestCase']:
+        if not stream:
+            async for suite in self.aiter():
+                for case in suite:
+                    yield case
+            return
+        async for case in self.iter_json('suites.cases'):
+            yield TestCase(case)
+
     @property
     async def suites(self) -> AsyncIterator[TestSuite]:
         async for suite in self:
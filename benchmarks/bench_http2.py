@@ -0,0 +1,64 @@
+# encoding: utf-8
+'''Latency of concurrent ``api_json`` scan over HTTP/1.1 and HTTP/2.
+
+It needs real Jenkins (or reverse proxy in front of it) which speaks HTTP/2,
+and ``pip install api4jenkins[http2]``. Jobs are discovered with
+``AsyncJenkins.aiter`` then fetched concurrently, e.g.::
+
+    PYTHONPATH=. python benchmarks/bench_http2.py https://jenkins.example.com/ \\
+        --user admin --token xxx --jobs 500 --depth 2
+'''
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from api4jenkins import AsyncJenkins
+
+
+async def scan(url: str, kwargs: Dict[str, Any], jobs: int, depth: int) -> Tuple[float, List[float]]:
+    j = AsyncJenkins(url, **kwargs)
+    items = []
+    async for job in j.aiter(depth):
+        items.append(job)
+        if len(items) == jobs:
+            break
+    latencies = []
+
+    async def fetch(job: Any) -> None:
+        begin = time.perf_counter()
+        await job.api_json()
+        latencies.append(time.perf_counter() - begin)
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(fetch(job) for job in items))
+    elapsed = time.perf_counter() - begin
+    await j.http_client.aclose()
+    return elapsed, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('url')
+    parser.add_argument('--user')
+    parser.add_argument('--token')
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--max-connections', type=int, default=100)
+    args = parser.parse_args()
+    auth = (args.user, args.token) if args.user else None
+    print(f'{"protocol":>9} {"jobs":>5} {"wall(s)":>8} {"p50(ms)":>8} {"p95(ms)":>8} {"max(ms)":>8}')
+    for http2 in (False, True):
+        pool = {'max_connections': args.max_connections, 'http2': http2}
+        elapsed, latencies = asyncio.run(
+            scan(args.url, {'auth': auth, 'pool': pool}, args.jobs, args.depth))
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        print(f'{"HTTP/2" if http2 else "HTTP/1.1":>9} {len(latencies):>5} {elapsed:>8.2f} '
+              f'{statistics.median(latencies or [0]) * 1000:>8.1f} {p95 * 1000:>8.1f} '
+              f'{max(latencies or [0]) * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
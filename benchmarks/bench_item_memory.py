@@ -0,0 +1,82 @@
+# encoding: utf-8
+'''Memory per item created by bulk iterators.
+
+Objects are built with ``new_item`` like ``Folder.iter``, ``Project.iter``
+and ``Nodes.iter`` do, and compared with a replica of the previous item
+layout, which kept ``jenkins``, ``url``, bound ``request``/``stream`` and
+per project build getters in instance ``__dict__``::
+
+    PYTHONPATH=. python benchmarks/bench_item_memory.py --items 100000
+'''
+import argparse
+import gc
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, List
+
+from api4jenkins import Jenkins
+from api4jenkins.item import append_slash, new_item
+
+URL = 'http://127.0.0.1:8080/'
+ITEMS = [
+    ('api4jenkins.job', 'hudson.model.FreeStyleProject', 'job/folder/job/job-{}/'),
+    ('api4jenkins.job', 'com.cloudbees.hudson.plugins.folder.Folder', 'job/folder-{}/'),
+    ('api4jenkins.build', 'hudson.model.FreeStyleBuild', 'job/folder/job/job/{}/'),
+    ('api4jenkins.node', 'hudson.slaves.SlaveComputer', 'computer/node-{}/'),
+]
+
+
+class LegacyItem:
+
+    def __init__(self, jenkins: Any, url: str) -> None:
+        self.jenkins = jenkins
+        self.url = append_slash(url)
+        self._request = jenkins.http_client.request
+        self._stream = jenkins.http_client.stream
+
+
+class LegacyProject(LegacyItem):
+
+    def __init__(self, jenkins: Any, url: str) -> None:
+        super().__init__(jenkins, url)
+
+        def _get_build_by_key(key: str) -> Any:
+            pass
+        for key in ['firstBuild', 'lastBuild', 'lastCompletedBuild', 'lastFailedBuild',
+                    'lastStableBuild', 'lastUnstableBuild', 'lastSuccessfulBuild',
+                    'lastUnsuccessfulBuild']:
+            setattr(self, f'get_{key}', partial(_get_build_by_key, key))
+        self._build_names = {}
+
+
+def measure(factory: Callable[[int], Any], total: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items: List[Any] = [factory(i) for i in range(total)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # exclude list and url strings, they are the same in both layouts
+    urls = sum(len(item.url) + 49 for item in items) + 8 * total
+    del items
+    return (after - before - urls) / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=100000)
+    args = parser.parse_args()
+    jenkins = Jenkins(URL)
+    print(f'{"class":<28} {"before(B)":>10} {"after(B)":>9}')
+    for module, _class, path in ITEMS:
+        def current(i: int) -> Any:
+            return new_item(jenkins, module, {'_class': _class, 'url': URL + path.format(i)})
+        cls = type(current(0))
+        legacy = LegacyProject if _class.endswith('Project') else LegacyItem
+        before = measure(lambda i: legacy(jenkins, URL + path.format(i)), args.items)
+        after = measure(current, args.items)
+        print(f'{cls.__name__:<28} {before:>10.0f} {after:>9.0f}')
+
+
+if __name__ == '__main__':
+    main()
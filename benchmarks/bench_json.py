@@ -0,0 +1,66 @@
+# encoding: utf-8
+'''Decode time of ``api_json`` payloads with installed json backends.
+
+Fixtures in ``tests/unit/tests_data`` are scaled up by repeating elements of
+their outermost lists, e.g. ``builds`` or ``computer``, then each payload is
+decoded with every installed backend::
+
+    PYTHONPATH=. python benchmarks/bench_json.py --scale 500 --rounds 20
+'''
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from api4jenkins.http import _JSON_DECODERS, new_json_decoder
+
+DATA_DIR = Path(__file__).parent.parent / 'tests' / 'unit' / 'tests_data'
+
+
+def scale(data: Any, factor: int) -> Any:
+    if isinstance(data, dict):
+        return {k: scale(v, factor) for k, v in data.items()}
+    if isinstance(data, list):
+        return data * factor
+    return data
+
+
+def load_payloads(factor: int) -> Dict[str, bytes]:
+    payloads = {}
+    for path in sorted(DATA_DIR.glob('*/*.json')):
+        data = scale(json.loads(path.read_text()), factor)
+        payloads[f'{path.parent.name}/{path.name}'] = json.dumps(data).encode()
+    return payloads
+
+
+def measure(decoder: Callable[[bytes], Any], payload: bytes, rounds: int) -> float:
+    begin = time.perf_counter()
+    for _ in range(rounds):
+        decoder(payload)
+    return (time.perf_counter() - begin) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    decoders = {}
+    for name in _JSON_DECODERS:
+        try:
+            decoders[name] = new_json_decoder(name)
+        except ImportError:
+            pass
+    payloads = load_payloads(args.scale)
+    print(f'{"fixture":<36} {"size(KB)":>9} ' + ' '.join(f'{n + "(ms)":>11}' for n in decoders))
+    totals: List[float] = [0.0] * len(decoders)
+    for name, payload in payloads.items():
+        cost = [measure(d, payload, args.rounds) for d in decoders.values()]
+        totals = [t + c for t, c in zip(totals, cost)]
+        print(f'{name:<36} {len(payload) / 1024:>9.1f} ' + ' '.join(f'{c * 1000:>11.2f}' for c in cost))
+    print(f'{"total":<36} {"":>9} ' + ' '.join(f'{t * 1000:>11.2f}' for t in totals))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# encoding: utf-8
+'''Per object cost of ``new_item`` with cached and uncached class resolution.
+
+Items are built from ``_class`` and ``url`` pairs of ``tests_data`` fixtures,
+uncached numbers call the resolver without its lru cache, as ``new_item`` did
+with ``import_module`` for every object::
+
+    PYTHONPATH=. python benchmarks/bench_new_item.py --items 100000
+'''
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from api4jenkins import AsyncJenkins, Jenkins
+from api4jenkins.item import new_item, resolve_class
+
+DATA_DIR = Path(__file__).parent.parent / 'tests' / 'unit' / 'tests_data'
+
+
+def load_items() -> List[Dict[str, Any]]:
+    items = []
+    for path in sorted(DATA_DIR.glob('job/*.json')):
+        data = json.loads(path.read_text())
+        if '_class' in data and 'url' in data:
+            items.append({'_class': data['_class'], 'url': data['url']})
+    return items
+
+
+def measure(func: Callable[[Dict[str, Any]], Any], items: List[Dict[str, Any]], total: int) -> float:
+    begin = time.perf_counter()
+    for i in range(total):
+        func(items[i % len(items)])
+    return (time.perf_counter() - begin) / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=100000)
+    args = parser.parse_args()
+    items = load_items()
+    print(f'{"client":<14} {"cached(us)":>11} {"uncached(us)":>13}')
+    for jenkins in (Jenkins('http://127.0.0.1:8080/'), AsyncJenkins('http://127.0.0.1:8080/')):
+        uncached = resolve_class.__wrapped__
+
+        def build(item: Dict[str, Any]) -> Any:
+            return uncached('api4jenkins.job', item['_class'], type(jenkins))(jenkins, item['url'])
+
+        cached = measure(lambda item: new_item(jenkins, 'api4jenkins.job', item), items, args.items)
+        cost = measure(build, items, args.items)
+        print(f'{type(jenkins).__name__:<14} {cached * 1e6:>11.2f} {cost * 1e6:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
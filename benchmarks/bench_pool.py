@@ -0,0 +1,67 @@
+# encoding: utf-8
+'''Requests/sec of ``api_json`` fan-out with different connection pool sizes.
+
+The sync client runs one thread per pooled connection, the async client runs
+``--workers`` concurrent requests which queue for the pooled connections.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/bench_pool.py --requests 2000 --workers 32
+'''
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api4jenkins import AsyncJenkins, Jenkins
+from api4jenkins.job import AsyncFreeStyleProject, FreeStyleProject
+
+import fake_jenkins
+
+
+def bench_sync(url: str, pool: dict, requests: int, workers: int) -> float:
+    j = Jenkins(url, pool=pool)
+    j._crumb = {}
+    jobs = [FreeStyleProject(j, f'{url}job/job{i}/') for i in range(requests)]
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda job: job.api_json(), jobs))
+    elapsed = time.perf_counter() - begin
+    j.http_client.close()
+    return requests / elapsed
+
+
+async def bench_async(url: str, pool: dict, requests: int, workers: int) -> float:
+    j = AsyncJenkins(url, pool=pool)
+    j._crumb = {}
+    sem = asyncio.Semaphore(workers)
+
+    async def fetch(i: int) -> None:
+        async with sem:
+            await AsyncFreeStyleProject(j, f'{url}job/job{i}/').api_json()
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(fetch(i) for i in range(requests)))
+    elapsed = time.perf_counter() - begin
+    await j.http_client.aclose()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    server, url = fake_jenkins.start()
+    print(f'{"max_connections":>16} {"sync req/s":>12} {"async req/s":>12}')
+    for size in args.sizes:
+        pool = {'max_connections': size, 'max_keepalive_connections': size}
+        sync_rps = bench_sync(url, pool, args.requests, size)
+        async_rps = asyncio.run(bench_async(url, pool, args.requests, args.workers))
+        print(f'{size:>16} {sync_rps:>12.0f} {async_rps:>12.0f}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
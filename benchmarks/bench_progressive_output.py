@@ -0,0 +1,81 @@
+# encoding: utf-8
+'''Throughput of ``Build.progressive_output`` tailing a growing log.
+
+Fake Jenkins serves a log of ``--size`` MB which grows at ``--rate`` MB/s
+(0 means complete at once), progressive requests get all bytes written so
+far. The previous implementation, which slept 1s after every request, is
+measured for comparison.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/bench_progressive_output.py --size 100 --rate 50
+'''
+import argparse
+import time
+from typing import Any, Callable, Dict, Iterator, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from api4jenkins import Jenkins
+from api4jenkins.build import FreeStyleBuild
+
+import fake_jenkins
+
+LINE = b'[2024-01-01T00:00:00.000Z] compiling module with some verbose output\n'
+
+
+def new_log(size: int, rate: float) -> Callable[[str], Any]:
+    log = LINE * (size // len(LINE))
+    begin = time.monotonic()
+
+    def payload(path: str) -> Tuple[bytes, Dict[str, str]]:
+        offset = int(parse_qs(urlparse(path).query)['start'][0])
+        written = len(log) if not rate else min(len(log), int((time.monotonic() - begin) * rate))
+        headers = {'Content-Type': 'text/plain;charset=UTF-8', 'X-Text-Size': str(written)}
+        if written < len(log):
+            headers['X-More-Data'] = 'true'
+        return log[offset:written], headers
+    return payload
+
+
+def legacy_output(build: FreeStyleBuild) -> Iterator[str]:
+    url = 'logText/progressiveText'
+    start = 0
+    while True:
+        resp = build.handle_req('GET', url, params={'start': start})
+        time.sleep(1)
+        if start == resp.headers.get('X-Text-Size'):
+            continue
+        yield from resp.iter_lines()
+        if not resp.headers.get('X-More-Data'):
+            break
+        start = resp.headers['X-Text-Size']
+
+
+def measure(output: Callable[[FreeStyleBuild], Iterator[str]], size: int, rate: float) -> Tuple[float, int, int]:
+    server, url = fake_jenkins.start(new_log(size, rate))
+    try:
+        jenkins = Jenkins(url)
+        build = FreeStyleBuild(jenkins, f'{url}job/job/1/')
+        requests = []
+        jenkins.http_client.event_hooks = {'request': [requests.append]}
+        begin = time.perf_counter()
+        lines = sum(1 for _ in output(build))
+        return time.perf_counter() - begin, lines, len(requests)
+    finally:
+        server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100, help='MB of log')
+    parser.add_argument('--rate', type=float, default=50, help='MB/s log grows')
+    args = parser.parse_args()
+    size, rate = args.size * 1024 * 1024, args.rate * 1024 * 1024
+    print(f'{"implementation":<16} {"seconds":>8} {"MB/s":>8} {"lines":>10} {"requests":>9}')
+    for name, output in [('legacy', legacy_output), ('adaptive', lambda b: b.progressive_output())]:
+        cost, lines, requests = measure(output, size, rate)
+        print(f'{name:<16} {cost:>8.2f} {args.size / cost:>8.1f} {lines:>10} {requests:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# encoding: utf-8
+'''Minimal in-process Jenkins stand-in for benchmarks.
+
+It answers every ``GET .../api/json`` with a small job payload and keeps
+connections alive, so client side overhead dominates the numbers. Payload
+function returns ``None`` to respond 404, or tuple of body and headers to
+respond raw bytes.
+'''
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _default_payload(path: str) -> Dict[str, Any]:
+    return {'_class': 'hudson.model.FreeStyleProject',
+            'url': f'http://127.0.0.1{path.split("api/json")[0]}',
+            'name': 'job', 'color': 'blue', 'buildable': True}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    payload: Callable[[str], Any] = staticmethod(_default_payload)
+
+    def do_GET(self) -> None:
+        if 'crumbIssuer' in self.path:
+            data = {'crumbRequestField': 'Jenkins-Crumb', 'crumb': 'benchmark'}
+        else:
+            data = self.payload(self.path)
+        if data is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        headers = {'Content-Type': 'application/json'}
+        if isinstance(data, tuple):
+            body, extra = data
+            headers.update(extra)
+        else:
+            body = json.dumps(data).encode()
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header('X-Jenkins', '2.440')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def start(payload: Optional[Callable[[str], Any]] = None) -> Tuple[ThreadingHTTPServer, str]:
+    '''Start server in daemon thread, return server and its base url'''
+    handler = type('Handler', (_Handler,), {})
+    if payload:
+        handler.payload = staticmethod(payload)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler, bind_and_activate=False)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    server.server_bind()
+    server.server_activate()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/'
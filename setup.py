@@ -29,6 +29,7 @@ setup(
     package_data={'': ['LICENSE']},
     python_requires='>=3.8',
     install_requires=requires,
+    extras_require={'http2': ['httpx[http2]']},
     license=about['__license__'],
     keywords=["RESTAPI", "Jenkins"],
     classifiers=[
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+import httpx
 import pytest
 
 from api4jenkins import AsyncJenkins, Jenkins
@@ -73,6 +74,35 @@ def mock_api_json(monkeypatch):
     monkeypatch.setattr(AsyncItem, 'api_json', _async_api_json)
 
 
+def _get_job(request):
+    url = str(request.url.copy_with(query=None))[:-len('api/json')]
+    for parent in ['jenkins/jenkins.json', 'job/folder.json']:
+        for job in load_json(parent)['jobs']:
+            if job['url'] == url:
+                return httpx.Response(200, json={'_class': job['_class'], 'url': url})
+    return httpx.Response(404)
+
+
+def _get_build(request):
+    number = int(request.url.path.split('/')[-3])
+    for build in load_json('job/pipeline.json')['builds']:
+        if build['number'] == number:
+            return httpx.Response(200, json={'_class': build['_class'], 'url': build['url'],
+                                             'displayName': build['displayName']})
+    return httpx.Response(404)
+
+
+@pytest.fixture(autouse=True)
+def mock_get_item(respx_mock):
+    '''answer lookup of job by name and build by number with tests_data'''
+    respx_mock.get(url__regex=r'/job/[^/]+/api/json', params={'tree': '_class,url'},
+                   name='get_job').mock(side_effect=_get_job)
+    respx_mock.get(url__regex=r'/job/[^/]+/\d+/api/json', params={'tree': '_class,url'},
+                   name='get_build').mock(side_effect=_get_build)
+    respx_mock.get(url__regex=r'/job/[^/]+/\d+/api/json', params={'tree': '_class,url,displayName'},
+                   name='check_build').mock(side_effect=_get_build)
+
+
 def load_json(file_):
     with open(DATA.joinpath(file_), 'rb') as f:
         return json.load(f)
@@ -0,0 +1,191 @@
+import asyncio
+import time
+
+import pytest
+
+from api4jenkins.build import Build, AsyncBuild
+from api4jenkins.exceptions import ItemNotFoundError
+from api4jenkins.item import AsyncItem, Item
+from api4jenkins.node import AsyncNodes, Nodes
+from api4jenkins.queue import AsyncQueue, AsyncQueueItem, Queue, QueueItem
+
+JOB = 'hudson.model.FreeStyleProject'
+BUILD = 'hudson.model.FreeStyleBuild'
+# sleep of time and asyncio are patched, keep originals to let workers run
+_sleep = time.sleep
+_async_sleep = asyncio.sleep
+
+
+class FakeJenkins:
+    '''jobs a, b and c are queued as 1, 2 and 3, build of a starts at tick 1
+    and completes at tick 2, c is cancelled at tick 1, build of b starts at
+    tick 2 and fails at tick 3, build in ``created`` is created by its
+    executor later than item left queue'''
+
+    def __init__(self, url):
+        self.url = url
+        self.tick = 0
+        self.trees = []
+        self.ids = {'a': 1, 'b': 2, 'c': 3}
+        self.starts = {1: (1, 2, 'SUCCESS'), 2: (2, 3, 'FAILURE')}
+        self.created = {}
+        # type name of item to count of next requests which fail
+        self.broken = {}
+
+    def build_url(self, id):
+        return f'{self.url}job/{"abc"[id - 1]}/1/'
+
+    def sleep(self, interval):
+        self.tick += 1
+        _sleep(0.05)
+
+    def api_json(self, item, tree):
+        self.trees.append((type(item).__name__, tree))
+        if self.broken.get(type(item).__name__):
+            self.broken[type(item).__name__] -= 1
+            raise ConnectionError('502 Bad Gateway')
+        if isinstance(item, (Queue, AsyncQueue)):
+            return {'items': [{'id': id} for id in self.ids.values()
+                              if self.tick < self.starts.get(id, (1,))[0]]}
+        if isinstance(item, (QueueItem, AsyncQueueItem)):
+            if item.id in self.starts and self.tick >= self.starts[item.id][0]:
+                if self.tick < self.created.get(item.id, 0):
+                    return {'_class': 'hudson.model.Queue$LeftItem', 'cancelled': False, 'executable': None}
+                return {'_class': 'hudson.model.Queue$LeftItem',
+                        'executable': {'_class': BUILD, 'url': self.build_url(item.id)}}
+            if item.id == 3 and self.tick >= 1:
+                return {'_class': 'hudson.model.Queue$LeftItem', 'cancelled': True, 'executable': None}
+            return {'_class': 'hudson.model.Queue$BuildableItem'}
+        if isinstance(item, (Nodes, AsyncNodes)):
+            running = [{'currentExecutable': {'_class': BUILD, 'url': self.build_url(id)}}
+                       for id, (start, end, _) in self.starts.items() if start <= self.tick < end]
+            return {'computer': [{'executors': running, 'oneOffExecutors': []}]}
+        if isinstance(item, (Build, AsyncBuild)):
+            id = 1 if '/a/' in item.url else 2
+            start, end, result = self.starts[id]
+            return {'building': self.tick < end, 'result': result if self.tick >= end else None}
+        raise TypeError(type(item))
+
+
+@pytest.fixture
+def fake(jenkins, monkeypatch):
+    fake = FakeJenkins(jenkins.url)
+
+    def build_job(full_name, **params):
+        if full_name not in fake.ids:
+            raise ItemNotFoundError(f'No such job: {full_name}')
+        return QueueItem(jenkins, f'{jenkins.url}queue/item/{fake.ids[full_name]}/')
+
+    def api_json(self, tree='', depth=0):
+        return fake.api_json(self, tree)
+    monkeypatch.setattr(jenkins, 'build_job', build_job)
+    monkeypatch.setattr(Item, 'api_json', api_json)
+    monkeypatch.setattr('api4jenkins.batch.time.sleep', fake.sleep)
+    return fake
+
+
+@pytest.fixture
+def async_fake(async_jenkins, monkeypatch):
+    fake = FakeJenkins(async_jenkins.url)
+
+    async def build_job(full_name, **params):
+        if full_name not in fake.ids:
+            raise ItemNotFoundError(f'No such job: {full_name}')
+        return AsyncQueueItem(async_jenkins, f'{async_jenkins.url}queue/item/{fake.ids[full_name]}/')
+
+    async def api_json(self, tree='', depth=0):
+        return fake.api_json(self, tree)
+
+    async def sleep(interval):
+        fake.tick += 1
+        await _async_sleep(0)
+    monkeypatch.setattr(async_jenkins, 'build_job', build_job)
+    monkeypatch.setattr(AsyncItem, 'api_json', api_json)
+    monkeypatch.setattr('api4jenkins.batch.asyncio.sleep', sleep)
+    return fake
+
+
+class TestBuildBatch:
+
+    def test_yield_started(self, jenkins, fake):
+        batch = jenkins.build_jobs(['a', ('b', {'arg': 1}), 'c'], workers=2)
+        pairs = [(request, build and build.url) for request, build in batch]
+        assert sorted(pairs, key=str) == sorted([('a', f'{jenkins.url}job/a/1/'),
+                                                 (('b', {'arg': 1}), f'{jenkins.url}job/b/1/'),
+                                                 ('c', None)], key=str)
+        assert batch.results == {None: ['c']}
+        # one queue listing per tick and one request per left item
+        assert fake.trees.count(('Queue', 'items[id]')) == fake.tick + 1
+        assert len([t for t in fake.trees if t[0] == 'QueueItem']) == 3
+
+    def test_wait_completed(self, jenkins, fake):
+        batch = jenkins.build_jobs(['a', 'b', 'c'], wait=True)
+        pairs = [(request, build and build.url) for request, build in batch]
+        assert pairs == [('c', None), ('a', f'{jenkins.url}job/a/1/'), ('b', f'{jenkins.url}job/b/1/')]
+        assert batch.results == {None: ['c'], 'SUCCESS': ['a'], 'FAILURE': ['b']}
+        assert fake.tick == 3
+        assert [t[0] for t in fake.trees].count('FreeStyleBuild') == 2
+
+    def test_merged_requests(self, jenkins, fake):
+        batch = jenkins.build_jobs(['a', 'a', 'c', 'c'], wait=True)
+        pairs = [(request, build and build.url) for request, build in batch]
+        assert pairs == [('c', None)] * 2 + [('a', f'{jenkins.url}job/a/1/')] * 2
+        assert batch.results == {None: ['c', 'c'], 'SUCCESS': ['a', 'a']}
+
+    def test_trigger_error(self, jenkins, fake):
+        batch = jenkins.build_jobs(['a', 'missing', 'b'], wait=True)
+        pairs = list(batch)
+        assert isinstance(pairs[0][1], ItemNotFoundError)
+        assert [request for request, _ in pairs] == ['missing', 'a', 'b']
+        assert batch.errors == [pairs[0]]
+        assert batch.results == {'SUCCESS': ['a'], 'FAILURE': ['b']}
+
+    def test_left_item_without_build(self, jenkins, fake):
+        fake.created[1] = 2
+        batch = jenkins.build_jobs(['a', 'c'])
+        pairs = [(request, build and build.url) for request, build in batch]
+        assert pairs == [('c', None), ('a', f'{jenkins.url}job/a/1/')]
+        assert batch.results == {None: ['c']}
+
+    def test_retry_failed_poll(self, jenkins, fake):
+        # poll of left item a fails at tick 1, poll of its build at tick 2
+        fake.broken = {'QueueItem': 1, 'FreeStyleBuild': 1}
+        batch = jenkins.build_jobs(['a', 'b', 'c'], wait=True)
+        assert sorted(request for request, _ in batch) == ['a', 'b', 'c']
+        assert batch.results == {None: ['c'], 'SUCCESS': ['a'], 'FAILURE': ['b']}
+
+    def test_give_up_failed_poll(self, jenkins, fake):
+        fake.broken = {'Queue': 2}
+        with pytest.raises(ConnectionError):
+            list(jenkins.build_jobs(['a', 'b'], max_errors=2))
+
+    def test_timeout(self, jenkins, fake, monkeypatch):
+        monkeypatch.setattr('api4jenkins.batch.time.monotonic', lambda: fake.tick)
+        fake.starts[2] = (100, 101, 'SUCCESS')
+        with pytest.raises(TimeoutError):
+            list(jenkins.build_jobs(['a', 'b'], interval=1, timeout=2.5))
+
+
+class TestAsyncBuildBatch:
+
+    async def test_wait_completed(self, async_jenkins, async_fake):
+        batch = async_jenkins.build_jobs(['a', 'b', 'c'], wait=True)
+        pairs = [(request, build and build.url) async for request, build in batch]
+        assert pairs == [('c', None), ('a', f'{async_jenkins.url}job/a/1/'),
+                         ('b', f'{async_jenkins.url}job/b/1/')]
+        assert batch.results == {None: ['c'], 'SUCCESS': ['a'], 'FAILURE': ['b']}
+
+    async def test_trigger_error(self, async_jenkins, async_fake):
+        async_fake.created[1] = 2
+        batch = async_jenkins.build_jobs(['a', 'a', 'missing'])
+        pairs = [(request, build) async for request, build in batch]
+        assert [request for request, _ in pairs] == ['missing', 'a', 'a']
+        assert isinstance(pairs[0][1], ItemNotFoundError)
+        assert {build.url for _, build in pairs[1:]} == {f'{async_jenkins.url}job/a/1/'}
+        assert batch.errors == [pairs[0]]
+
+    async def test_retry_failed_poll(self, async_jenkins, async_fake):
+        async_fake.broken = {'AsyncQueue': 1, 'AsyncQueueItem': 1}
+        batch = async_jenkins.build_jobs(['a', 'c'])
+        assert sorted([request async for request, _ in batch]) == ['a', 'c']
+        assert batch.results == {None: ['c']}
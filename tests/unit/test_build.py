@@ -5,6 +5,21 @@ from respx import MockResponse
 from api4jenkins.build import AsyncStage, AsyncStep, AsyncWorkflowRun, Stage, Step, WorkflowRun
 from api4jenkins.input import PendingInputAction
 
+_PROGRESSIVE_LINES = ['ab', 'cd\u00e9f', 'gh']
+
+
+def _progressive_responses():
+    '''log split in middle of line and of character, then idle 3 polls'''
+    data = 'ab\ncd\u00e9f\ngh'.encode()
+    parts = [(data[:4], 4), (data[4:10], 10), (b'', 10), (b'', 10), (b'', 10), (b'', 10), (data[10:], None)]
+    responses = []
+    for content, size in parts:
+        headers = {'Content-Type': 'text/plain;charset=UTF-8'}
+        if size:
+            headers.update({'X-More-Data': 'true', 'X-Text-Size': str(size)})
+        responses.append(MockResponse(headers=headers, content=content, status_code=200))
+    return responses
+
 
 class TestBuild:
     def test_console_text(self, build, respx_mock):
@@ -12,14 +27,33 @@ class TestBuild:
         respx_mock.get(f'{build.url}consoleText').respond(content=body)
         assert list(build.console_text()) == body.split('\n')
 
-    def test_progressive_output(self, build, respx_mock):
+    def test_progressive_output(self, build, respx_mock, monkeypatch):
+        monkeypatch.setattr('api4jenkins.build.time.sleep', lambda _: None)
         body = ['a', 'b']
-        headers = {'X-More-Data': 'True', 'X-Text-Size': '1'}
+        headers = {'X-More-Data': 'True', 'X-Text-Size': '2'}
         req_url = f'{build.url}logText/progressiveText'
         respx_mock.get(req_url).mock(
-            side_effect=[MockResponse(headers=headers, content=body[0], status_code=200), MockResponse(content=body[1], status_code=200)])
+            side_effect=[MockResponse(headers=headers, content='a\n', status_code=200), MockResponse(content=body[1], status_code=200)])
         assert list(build.progressive_output()) == body
 
+    def test_progressive_output_adaptive(self, build, respx_mock, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr('api4jenkins.build.time.sleep', sleeps.append)
+        req_url = f'{build.url}logText/progressiveText'
+        route = respx_mock.get(req_url).mock(side_effect=_progressive_responses())
+        assert list(build.progressive_output(interval=0.5, max_interval=1)) == _PROGRESSIVE_LINES
+        assert sleeps == [0.5, 0.5, 1, 1, 1, 1]
+        assert [call.request.url.params['start'] for call in route.calls] == \
+            ['0', '4', '10', '10', '10', '10', '10']
+
+    def test_progressive_output_backlog(self, build, respx_mock, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr('api4jenkins.build.time.sleep', sleeps.append)
+        monkeypatch.setattr('api4jenkins.build._BACKLOG', 4)
+        respx_mock.get(f'{build.url}logText/progressiveText').mock(side_effect=_progressive_responses())
+        assert list(build.progressive_output(interval=0.5, max_interval=1)) == _PROGRESSIVE_LINES
+        assert sleeps == [0.5, 1, 1, 1]
+
     def test_get_next_build(self, build):
         assert build.get_next_build() is None
 
@@ -170,15 +204,30 @@ class TestAsyncBuild:
         output = [line async for line in async_build.console_text()]
         assert output == body.split('\n')
 
-    async def test_progressive_output(self, async_build, respx_mock):
+    async def test_progressive_output(self, async_build, respx_mock, monkeypatch):
+        async def _sleep(delay):
+            pass
+        monkeypatch.setattr('api4jenkins.build.asyncio.sleep', _sleep)
         body = ['a', 'b']
-        headers = {'X-More-Data': 'True', 'X-Text-Size': '1'}
+        headers = {'X-More-Data': 'True', 'X-Text-Size': '2'}
         req_url = f'{async_build.url}logText/progressiveText'
         respx_mock.get(req_url).mock(
-            side_effect=[MockResponse(headers=headers, content=body[0], status_code=200), MockResponse(content=body[1], status_code=200)])
+            side_effect=[MockResponse(headers=headers, content='a\n', status_code=200), MockResponse(content=body[1], status_code=200)])
 
         assert [line async for line in async_build.progressive_output()] == body
 
+    async def test_progressive_output_adaptive(self, async_build, respx_mock, monkeypatch):
+        sleeps = []
+
+        async def _sleep(delay):
+            sleeps.append(delay)
+        monkeypatch.setattr('api4jenkins.build.asyncio.sleep', _sleep)
+        req_url = f'{async_build.url}logText/progressiveText'
+        respx_mock.get(req_url).mock(side_effect=_progressive_responses())
+        lines = [line async for line in async_build.progressive_output(interval=0.5, max_interval=1)]
+        assert lines == _PROGRESSIVE_LINES
+        assert sleeps == [0.5, 0.5, 1, 1, 1, 1]
+
     async def test_get_next_build(self, async_build):
         assert await async_build.get_next_build() is None
 
@@ -0,0 +1,580 @@
+# encoding: utf-8
+import asyncio
+import gzip
+import threading
+import time
+
+import httpx
+import pytest
+from respx import MockResponse
+
+from api4jenkins import AsyncJenkins, Jenkins
+from api4jenkins.exceptions import CircuitOpenError, ItemNotFoundError
+from api4jenkins.http import (AdaptiveLimiter, CircuitBreaker, RateLimiter,
+                              ResponseCache, Retry, RetryBudget,
+                              SingleFlight, _parse_retry_after,
+                              new_json_decoder)
+from api4jenkins.item import AsyncItem, Item
+
+from .conftest import load_json
+
+# conftest replaces api_json with fixture loader for each test
+_api_json = Item.api_json
+_async_api_json = AsyncItem.api_json
+
+
+def _new_jenkins(cls, url, **kwargs):
+    j = cls(url, **kwargs)
+    j._crumb = load_json('jenkins/crumb.json')
+    return j
+
+
+class TestRetry:
+
+    @pytest.mark.parametrize('method, status, error, expected',
+                             [('GET', 503, None, True),
+                              ('GET', 500, None, False),
+                              ('POST', 503, None, False),
+                              ('GET', None, httpx.ReadError('reset'), True),
+                              ('POST', None, httpx.ReadError('reset'), False),
+                              ('POST', None, httpx.ConnectError('refused'), True)])
+    def test_is_retry(self, method, status, error, expected):
+        retry = Retry()
+        request = httpx.Request(method, 'http://0.0.0.0:8080/')
+        response = httpx.Response(status) if status else None
+        assert retry.is_retry(request, 0, response, error) is expected
+
+    def test_is_retry_post(self):
+        request = httpx.Request('POST', 'http://0.0.0.0:8080/')
+        assert Retry(retry_post=True).is_retry(request, 0, httpx.Response(503))
+
+    def test_is_retry_exhausted(self):
+        request = httpx.Request('GET', 'http://0.0.0.0:8080/')
+        assert not Retry(total=2).is_retry(request, 2, httpx.Response(503))
+
+    def test_budget(self):
+        retry = Retry(budget=RetryBudget(ratio=0.5, burst=1))
+        request = httpx.Request('GET', 'http://0.0.0.0:8080/')
+        assert retry.is_retry(request, 0, httpx.Response(503))
+        assert not retry.is_retry(request, 0, httpx.Response(503))
+        retry.start()
+        retry.start()
+        assert retry.is_retry(request, 0, httpx.Response(503))
+
+    @pytest.mark.parametrize('value, expected',
+                             [(None, None), ('3', 3.0), ('-1', 0.0), ('abc', None),
+                              ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0)])
+    def test_parse_retry_after(self, value, expected):
+        assert _parse_retry_after(value) == expected
+
+    def test_get_backoff(self):
+        retry = Retry(backoff_factor=1, max_backoff=5)
+        assert 0 <= retry.get_backoff(0) <= 1
+        assert 0 <= retry.get_backoff(10) <= 5
+        response = httpx.Response(503, headers={'Retry-After': '2'})
+        assert retry.get_backoff(0, response) == 2
+        assert Retry(respect_retry_after=False, backoff_factor=0).get_backoff(0, response) == 0
+
+
+class TestRetryTransport:
+
+    def test_retry_status(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, retry=Retry(backoff_factor=0))
+        route = respx_mock.head(url).mock(
+            side_effect=[MockResponse(503), MockResponse(502),
+                         MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        assert jenkins.version == '1.2.3'
+        assert route.call_count == 3
+
+    def test_retry_error(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, retry=1)
+        route = respx_mock.head(url).mock(
+            side_effect=[httpx.ConnectError('refused'), MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        assert jenkins.version == '1.2.3'
+        assert route.call_count == 2
+
+    def test_retry_give_up(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, retry=Retry(total=2, backoff_factor=0))
+        route = respx_mock.head(url).respond(503)
+        with pytest.raises(httpx.HTTPStatusError):
+            jenkins.version
+        assert route.call_count == 3
+
+    def test_no_retry_post(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, retry=Retry(backoff_factor=0))
+        route = respx_mock.post(f'{url}createItem?name=job').respond(503)
+        with pytest.raises(httpx.HTTPStatusError):
+            jenkins.create_job('job', '<xml/>')
+        assert route.call_count == 1
+
+
+class TestAsyncRetryTransport:
+
+    async def test_retry_status(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, retry=Retry(backoff_factor=0))
+        route = respx_mock.head(url).mock(
+            side_effect=[MockResponse(503), MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        assert await jenkins.version == '1.2.3'
+        assert route.call_count == 2
+
+    async def test_retry_error(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, retry=Retry(backoff_factor=0))
+        route = respx_mock.head(url).mock(
+            side_effect=[httpx.ReadError('reset'), MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        assert await jenkins.version == '1.2.3'
+        assert route.call_count == 2
+
+    async def test_retry_post(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, retry=Retry(backoff_factor=0, retry_post=True))
+        route = respx_mock.post(f'{url}createItem?name=job').mock(
+            side_effect=[MockResponse(503), MockResponse(200)])
+        await jenkins.create_job('job', '<xml/>')
+        assert route.call_count == 2
+
+
+class TestRateLimiter:
+
+    def test_rate(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        begin = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+            limiter.release()
+        assert time.monotonic() - begin >= 0.09
+        assert limiter.throttled_requests >= 4
+        assert limiter.throttled_time > 0
+
+    def test_burst(self):
+        limiter = RateLimiter(rate=1, burst=5)
+        for _ in range(5):
+            limiter.acquire()
+        assert limiter.throttled_requests == 0
+
+    def test_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=1)
+        limiter.acquire()
+        threading.Timer(0.05, limiter.release).start()
+        limiter.acquire()
+        assert limiter.throttled_requests == 1
+
+    async def test_async_rate(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        async def acquire():
+            await limiter.async_acquire()
+            limiter.async_release()
+
+        begin = time.monotonic()
+        await asyncio.gather(*(acquire() for _ in range(6)))
+        assert time.monotonic() - begin >= 0.09
+        assert limiter.throttled_requests >= 4
+
+    async def test_async_max_in_flight(self):
+        limiter = RateLimiter(max_in_flight=2)
+        running = []
+
+        async def acquire():
+            await limiter.async_acquire()
+            running.append(1)
+            assert len(running) <= 2
+            await asyncio.sleep(0.01)
+            running.pop()
+            limiter.async_release()
+
+        await asyncio.gather(*(acquire() for _ in range(6)))
+        assert limiter.throttled_requests == 4
+
+
+class TestRateLimitTransport:
+
+    def test_release_after_close(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, rate_limiter=RateLimiter(max_in_flight=1))
+        respx_mock.get(f'{url}consoleText').respond(content='a\nb')
+        respx_mock.head(url).respond(headers={'X-Jenkins': '1.2.3'})
+        with jenkins.handle_stream('GET', 'consoleText') as resp:
+            assert not jenkins.rate_limiter._in_flight.acquire(blocking=False)
+            assert list(resp.iter_lines()) == ['a', 'b']
+        assert jenkins.version == '1.2.3'
+        assert jenkins.version == '1.2.3'
+
+    def test_release_on_error(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, rate_limiter=RateLimiter(max_in_flight=1))
+        respx_mock.head(url).mock(side_effect=[httpx.ConnectError('refused'),
+                                               MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        with pytest.raises(httpx.ConnectError):
+            jenkins.version
+        assert jenkins.version == '1.2.3'
+
+    async def test_async_release_after_close(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, rate_limiter=RateLimiter(max_in_flight=1))
+        respx_mock.get(f'{url}consoleText').respond(content='a\nb')
+        respx_mock.head(url).respond(headers={'X-Jenkins': '1.2.3'})
+        async with jenkins.handle_stream('GET', 'consoleText') as resp:
+            assert jenkins.rate_limiter._async_in_flight.locked()
+            assert [line async for line in resp.aiter_lines()] == ['a', 'b']
+        assert not jenkins.rate_limiter._async_in_flight.locked()
+        assert await jenkins.version == '1.2.3'
+
+
+class TestAdaptiveLimiter:
+
+    async def test_increase(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=3)
+        for _ in range(10):
+            start = await limiter.acquire()
+            limiter.release(start, 0.01, httpx.Response(200))
+        assert limiter.limit == 3
+        assert limiter.in_flight == 0
+
+    @pytest.mark.parametrize('response, error',
+                             [(httpx.Response(503), None), (None, httpx.ReadTimeout('timeout'))])
+    async def test_decrease_once_for_burst(self, response, error):
+        limiter = AdaptiveLimiter(initial=8)
+        starts = [await limiter.acquire() for _ in range(4)]
+        for start in starts:
+            limiter.release(start, 0.01, response, error)
+        assert limiter.limit == 4
+        start = await limiter.acquire()
+        limiter.release(start, 0.01, response, error)
+        assert limiter.limit == 2
+
+    async def test_decrease_on_latency(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=8, latency_tolerance=2)
+        for elapsed in [0.01] * 10 + [0.1]:
+            start = await limiter.acquire()
+            limiter.release(start, elapsed, httpx.Response(200))
+        # one slow request is not a spike
+        assert limiter.limit == 8
+        start = await limiter.acquire()
+        limiter.release(start, 0.1, httpx.Response(200))
+        assert limiter.limit == 4
+
+    async def test_mixed_latency(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=20)
+        for i in range(500):
+            start = await limiter.acquire()
+            # one of five requests is expensive, e.g. depth=2
+            limiter.release(start, 0.25 if i % 5 == 4 else 0.05, httpx.Response(200))
+        assert limiter.limit == 20
+
+    async def test_cancel_request(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, adaptive_limiter=AdaptiveLimiter(initial=4))
+
+        async def slow(request):
+            await asyncio.sleep(1)
+        respx_mock.head(url).mock(side_effect=slow)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(jenkins.version, 0.01)
+        assert (jenkins.adaptive_limiter.limit, jenkins.adaptive_limiter.in_flight) == (4, 0)
+
+    async def test_limit_in_flight(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=2)
+        running = []
+
+        async def request():
+            start = await limiter.acquire()
+            running.append(1)
+            assert len(running) <= 2
+            await asyncio.sleep(0.01)
+            running.pop()
+            limiter.release(start, 0.01, httpx.Response(200))
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        assert limiter.in_flight == 0
+
+    async def test_cancel_waiter(self):
+        limiter = AdaptiveLimiter(initial=1)
+        start = await limiter.acquire()
+        task = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        limiter.release(start, 0.01, httpx.Response(200))
+        assert limiter.in_flight == 0
+
+    async def test_transport(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, adaptive_limiter=AdaptiveLimiter(initial=1))
+        respx_mock.get(f'{url}consoleText').respond(content='a\nb')
+        respx_mock.head(url).mock(side_effect=[MockResponse(502),
+                                               MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        async with jenkins.handle_stream('GET', 'consoleText') as resp:
+            assert jenkins.adaptive_limiter.in_flight == 1
+        assert jenkins.adaptive_limiter.in_flight == 0
+        with pytest.raises(httpx.HTTPStatusError):
+            await jenkins.version
+        assert await jenkins.version == '1.2.3'
+        assert jenkins.adaptive_limiter.in_flight == 0
+
+
+class TestCircuitBreaker:
+
+    def test_open_and_recover(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, circuit_breaker=CircuitBreaker(
+            failure_threshold=2, reset_timeout=0.05))
+        route = respx_mock.head(url).mock(
+            side_effect=[httpx.ConnectError('refused'), MockResponse(503),
+                         MockResponse(503), MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        with pytest.raises(httpx.ConnectError):
+            jenkins.version
+        assert jenkins.circuit_breaker.state == 'closed'
+        with pytest.raises(httpx.HTTPStatusError):
+            jenkins.version
+        assert jenkins.circuit_breaker.state == 'open'
+        with pytest.raises(CircuitOpenError):
+            jenkins.version
+        assert route.call_count == 2
+        time.sleep(0.05)
+        assert jenkins.circuit_breaker.state == 'half_open'
+        with pytest.raises(httpx.HTTPStatusError):
+            jenkins.version
+        assert jenkins.circuit_breaker.state == 'open'
+        time.sleep(0.05)
+        assert jenkins.version == '1.2.3'
+        assert jenkins.circuit_breaker.state == 'closed'
+        assert jenkins.circuit_breaker.failures == 0
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.after_request(httpx.Response(500))
+        breaker.after_request(httpx.Response(404))
+        breaker.after_request(httpx.Response(500))
+        assert breaker.state == 'closed'
+
+    def test_half_open_probes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        request = httpx.Request('GET', 'http://0.0.0.0:8080/')
+        breaker.after_request(error=httpx.ConnectError('refused'))
+        breaker.before_request(request)
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request(request)
+        breaker.reset()
+        assert breaker.state == 'closed'
+
+    async def test_cancelled_probe(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, circuit_breaker=CircuitBreaker(
+            failure_threshold=1, reset_timeout=0))
+        jenkins.circuit_breaker.after_request(error=httpx.ConnectError('refused'))
+
+        async def slow(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+        respx_mock.head(url).mock(side_effect=[slow, MockResponse(headers={'X-Jenkins': '1.2.3'})])
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(jenkins.version, 0.01)
+        assert jenkins.circuit_breaker.state == 'half_open'
+        assert await jenkins.version == '1.2.3'
+        assert jenkins.circuit_breaker.state == 'closed'
+
+    async def test_async_open(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, circuit_breaker=CircuitBreaker(failure_threshold=1),
+                               retry=Retry(backoff_factor=0))
+        route = respx_mock.head(url).respond(503)
+        with pytest.raises(CircuitOpenError):
+            await jenkins.version
+        assert route.call_count == 1
+        assert jenkins.circuit_breaker.state == 'open'
+
+
+class TestResponseCache:
+
+    def test_ttl(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(ttl=60))
+        route = respx_mock.get(f'{url}job/a/api/json').respond(json={'name': 'a'})
+        for _ in range(3):
+            assert jenkins.http_client.get(f'{url}job/a/api/json').json() == {'name': 'a'}
+        jenkins.http_client.get(f'{url}job/a/api/json', params={'tree': 'name'})
+        assert route.call_count == 2
+        assert (jenkins.cache.hits, jenkins.cache.misses) == (2, 2)
+
+    def test_revalidate(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(ttl=0))
+        route = respx_mock.get(f'{url}job/a/api/json').mock(side_effect=[
+            MockResponse(json={'name': 'a'}, headers={'ETag': '"1"'}),
+            MockResponse(304)])
+        jenkins.http_client.get(f'{url}job/a/api/json')
+        response = jenkins.http_client.get(f'{url}job/a/api/json')
+        assert response.status_code == 200
+        assert response.json() == {'name': 'a'}
+        assert route.calls.last.request.headers['If-None-Match'] == '"1"'
+        assert jenkins.cache.revalidated == 1
+
+    @pytest.mark.parametrize('ttl, responses', [(60, 1), (0, 3)])
+    def test_gzip_response(self, url, respx_mock, ttl, responses):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(ttl=ttl))
+        body = gzip.compress(b'{"name": "a"}')
+        route = respx_mock.get(f'{url}job/a/api/json').mock(side_effect=[
+            MockResponse(content=body, headers={'Content-Encoding': 'gzip', 'ETag': '"1"',
+                                                'Content-Type': 'application/json'}),
+            MockResponse(304), MockResponse(304)])
+        for _ in range(3):
+            assert jenkins.http_client.get(f'{url}job/a/api/json').json() == {'name': 'a'}
+        assert route.call_count == responses
+
+    def test_skip_stream(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(ttl=60))
+        route = respx_mock.get(f'{url}job/a/api/json').respond(json={'jobs': [{'name': 'a'}]})
+        item = Item(jenkins, f'{url}job/a/')
+        for _ in range(2):
+            assert list(item.iter_json('jobs')) == [{'name': 'a'}]
+        assert route.call_count == 2
+        assert len(jenkins.cache) == 0
+
+    def test_invalidate_by_post(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(ttl=60))
+        job = respx_mock.get(f'{url}job/a/api/json').respond(json={})
+        build = respx_mock.get(f'{url}job/a/1/api/json').respond(json={})
+        other = respx_mock.get(f'{url}job/b/api/json').respond(json={})
+        respx_mock.get(f'{url}api/json').respond(json={})
+        respx_mock.post(f'{url}job/a/build').respond(201)
+        for path in ['job/a/', 'job/a/1/', 'job/b/', '']:
+            jenkins.http_client.get(f'{url}{path}api/json')
+        jenkins.http_client.post(f'{url}job/a/build')
+        assert len(jenkins.cache) == 1
+        for path in ['job/a/', 'job/a/1/', 'job/b/']:
+            jenkins.http_client.get(f'{url}{path}api/json')
+        assert (job.call_count, build.call_count, other.call_count) == (2, 2, 1)
+
+    def test_maxsize(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache(maxsize=2))
+        respx_mock.get(url__regex=r'.*api/json').respond(json={})
+        for path in ['job/a/', 'job/b/', 'job/a/', 'job/c/']:
+            jenkins.http_client.get(f'{url}{path}api/json')
+        assert list(jenkins.cache._entries) == [f'{url}job/a/api/json',
+                                                f'{url}job/c/api/json']
+
+    def test_skip_failed_response(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, cache=ResponseCache())
+        respx_mock.get(f'{url}job/a/api/json').respond(404)
+        with pytest.raises(ItemNotFoundError):
+            jenkins.http_client.get(f'{url}job/a/api/json')
+        assert len(jenkins.cache) == 0
+
+    async def test_async_ttl(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, cache=ResponseCache(ttl=60))
+        route = respx_mock.get(f'{url}job/a/api/json').respond(json={'name': 'a'})
+        for _ in range(2):
+            response = await jenkins.http_client.get(f'{url}job/a/api/json')
+            assert response.json() == {'name': 'a'}
+        assert route.call_count == 1
+
+
+class TestSingleFlight:
+
+    def test_share_in_flight_get(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url)
+        entered, release = threading.Event(), threading.Event()
+
+        def side_effect(request):
+            entered.set()
+            release.wait(1)
+            return MockResponse(json={'jobs': []})
+        route = respx_mock.get(f'{url}api/json').mock(side_effect=side_effect)
+        results = []
+
+        def get():
+            results.append(jenkins.handle_req('GET', 'api/json', params={'tree': 'jobs'}))
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        threads[0].start()
+        entered.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        while jenkins.single_flight.shared < 3:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert route.call_count == 1
+        assert [r.json() for r in results] == [{'jobs': []}] * 4
+        jenkins.handle_req('GET', 'api/json', params={'tree': 'jobs'})
+        assert route.call_count == 2
+
+    def test_share_error(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def fail():
+            release.wait(1)
+            raise ValueError('boom')
+
+        def call():
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flight.shared < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 3
+        assert not flight._calls
+
+    def test_skip_post_and_disabled(self, url, respx_mock):
+        jenkins = _new_jenkins(Jenkins, url, single_flight=False)
+        assert jenkins.single_flight is None
+        respx_mock.get(f'{url}api/json').respond(json={})
+        jenkins.handle_req('GET', 'api/json')
+        jenkins = _new_jenkins(Jenkins, url)
+        assert jenkins._flight_key('POST', 'build', {}) is None
+        assert jenkins._flight_key('GET', 'api/json', {'headers': {}}) is None
+        assert jenkins._flight_key('GET', 'api/json', {'params': {'depth': 1}}) == \
+            f'{url}api/json?depth=1'
+
+    async def test_async_share_in_flight_get(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url)
+
+        async def side_effect(request):
+            await asyncio.sleep(0.05)
+            return MockResponse(json={'jobs': []})
+        route = respx_mock.get(f'{url}api/json').mock(side_effect=side_effect)
+        results = await asyncio.gather(*(
+            jenkins.handle_req('GET', 'api/json', params={'tree': 'jobs'}) for _ in range(5)))
+        assert route.call_count == 1
+        assert jenkins.single_flight.shared == 4
+        assert [r.json() for r in results] == [{'jobs': []}] * 5
+        assert not jenkins.single_flight._tasks
+
+    async def test_async_cancel_one_caller(self):
+        flight = SingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.05)
+            return 1
+        first = asyncio.ensure_future(flight.async_do('key', func))
+        second = asyncio.ensure_future(flight.async_do('key', func))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 1
+
+
+class TestJsonDecoder:
+
+    def test_new_json_decoder(self):
+        import json
+        orjson = pytest.importorskip('orjson')
+        assert new_json_decoder() is orjson.loads
+        assert new_json_decoder('json') is json.loads
+        assert new_json_decoder(json.loads) is json.loads
+        with pytest.raises(ImportError):
+            new_json_decoder('no_such_json')
+
+    def test_api_json(self, url, respx_mock):
+        decoded = []
+
+        def decoder(content):
+            decoded.append(content)
+            return {'content': content.decode()}
+        jenkins = _new_jenkins(Jenkins, url, json_decoder=decoder)
+        respx_mock.get(f'{url}api/json').respond(content=b'{}')
+        assert _api_json(jenkins) == {'content': '{}'}
+        assert decoded == [b'{}']
+
+    async def test_async_api_json(self, url, respx_mock):
+        jenkins = _new_jenkins(AsyncJenkins, url, json_decoder='json')
+        respx_mock.get(f'{url}api/json?depth=0&tree=jobs').respond(json={'jobs': []})
+        assert await _async_api_json(jenkins, tree='jobs') == {'jobs': []}
@@ -0,0 +1,63 @@
+import pytest
+
+from api4jenkins.index import JobIndex
+
+
+def _job(url, name, _class='hudson.model.FreeStyleProject'):
+    return {'name': name, 'url': f'{url}job/{name}/', '_class': _class}
+
+
+@pytest.fixture
+def index(url):
+    index = JobIndex()
+    index.refresh('', [_job(url, 'folder', 'com.cloudbees.hudson.plugins.folder.Folder'),
+                       _job(url, 'job')])
+    index.refresh('folder', [_job(f'{url}job/folder/', 'job'),
+                             _job(f'{url}job/folder/', 'sub')])
+    index.refresh('folder/sub', [_job(f'{url}job/folder/job/sub/', 'job')])
+    return index
+
+
+class TestJobIndex:
+
+    def test_get(self, index, url):
+        assert len(index) == 5
+        assert index.get('folder/job') == {'_class': 'hudson.model.FreeStyleProject',
+                                           'url': f'{url}job/folder/job/job/'}
+        assert index.get('folder/missing') is None
+
+    def test_expired(self, index, monkeypatch):
+        index.ttl = 10
+        assert index.get('job')
+        monkeypatch.setattr('api4jenkins.index.time.time', lambda: 1e12)
+        assert index.get('job') is None
+
+    def test_invalidate_with_sub_jobs(self, index):
+        index.invalidate('folder/sub/')
+        assert index.get('folder/sub') is None
+        assert index.get('folder/sub/job') is None
+        assert index.get('folder/job')
+        index.invalidate('folder')
+        assert len(index) == 1
+
+    def test_invalidate_same_prefix(self, index, url):
+        index.refresh('', [_job(url, 'folder'), _job(url, 'folder2')])
+        index.invalidate('folder')
+        assert index.get('folder2')
+
+    def test_refresh_remove_gone_jobs(self, index, url):
+        index.refresh('folder', [_job(f'{url}job/folder/', 'job')])
+        assert index.get('folder/sub') is None
+        assert index.get('folder/sub/job') is None
+        assert index.get('folder/job')
+
+    def test_persist(self, tmp_path, url):
+        path = tmp_path / 'jobs.db'
+        index = JobIndex(path)
+        index.refresh('', [_job(url, 'job')])
+        index.close()
+        assert JobIndex(path).get('job')['url'] == f'{url}job/job/'
+
+    def test_clear(self, index):
+        index.clear()
+        assert len(index) == 0
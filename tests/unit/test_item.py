@@ -0,0 +1,177 @@
+import json
+
+import pytest
+
+from api4jenkins.item import (AsyncItem, AttrRegistry, Item, JSONArrayParser,
+                              _custom_classes, attr_registry, new_item,
+                              register_class, resolve_class)
+from api4jenkins.job import (AsyncFreeStyleProject, AsyncProject,
+                             FreeStyleProject, Project)
+
+from .conftest import load_json
+
+
+def _parse(text, path, size):
+    parser = JSONArrayParser(path)
+    elements = []
+    for i in range(0, len(text), size):
+        elements.extend(parser.feed(text[i:i + size]))
+    parser.close()
+    return elements
+
+
+class TestJSONArrayParser:
+
+    @pytest.mark.parametrize('size', [1, 2, 7, 100000])
+    @pytest.mark.parametrize('indent', [None, 2])
+    def test_feed(self, size, indent):
+        report = load_json('report/test_report.json')
+        report['suites'] *= 3
+        text = json.dumps(report, indent=indent)
+        assert _parse(text, 'suites', size) == report['suites']
+        cases = [case for suite in report['suites'] for case in suite['cases']]
+        assert _parse(text, 'suites.cases', size) == cases
+
+    @pytest.mark.parametrize('text, expected', [
+        ('{"a": 1.5, "s": [1, -2.5e3, 456]}', [1, -2.5e3, 456]),
+        ('{"s": ["]}", {"k": "\\"]"}, null]}', ["]}", {"k": '"]'}, None]),
+        ('{"a": 1}', []),
+        ('{"s": null}', []),
+        ('{"s": []}', [])])
+    def test_values(self, text, expected):
+        assert _parse(text, 's', 1) == expected
+
+    def test_nested_missing(self):
+        assert _parse('{"s": [{"c": null}, {}, {"c": [1]}]}', 's.c', 3) == [1]
+
+    @pytest.mark.parametrize('text', ['{"s": [1, 2', '[1]', '{"s": [1x]}'])
+    def test_invalid(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            _parse(text, 's', 3)
+
+
+class TestSnapshot:
+
+    def test_snapshot(self, build, monkeypatch):
+        trees = []
+        api_json = type(build).api_json
+        monkeypatch.setattr(type(build), 'api_json', lambda self, tree='', depth=0:
+                            trees.append(tree) or api_json(self, tree, depth))
+        snapshot = build.snapshot('result', 'duration', 'timestamp')
+        assert trees == ['result,duration,timestamp']
+        data = load_json('run/workflowrun.json')
+        assert (snapshot.result, snapshot.duration) == (data['result'], data['duration'])
+        assert 'display_name' in dir(snapshot)
+        with pytest.raises(AttributeError):
+            snapshot.result = 'FAILURE'
+        with pytest.raises(TypeError):
+            snapshot._data['result'] = 'FAILURE'
+        with pytest.raises(AttributeError):
+            snapshot.not_exist
+        refreshed = snapshot.refresh()
+        assert refreshed is not snapshot
+        assert refreshed.as_dict() == snapshot.as_dict()
+        assert trees == ['result,duration,timestamp'] * 2
+
+    def test_snapshot_dynamic_attrs(self, build):
+        snapshot = build.snapshot()
+        assert snapshot.number == build.number
+
+    async def test_async_snapshot(self, async_build):
+        snapshot = await async_build.snapshot('result', 'building')
+        assert snapshot.building is False
+        assert (await snapshot.refresh()).result == snapshot.result
+
+
+class TestAttrRegistry:
+
+    @pytest.fixture(autouse=True)
+    def registry(self):
+        schema = attr_registry.as_dict()
+        attr_registry.clear()
+        yield attr_registry
+        attr_registry.clear()
+        attr_registry.warm(schema)
+
+    async def test_discover_with_probe(self, build, async_build, monkeypatch):
+        trees = []
+        api_json = type(build).api_json
+        monkeypatch.setattr(type(build), 'api_json', lambda self, tree='', depth=0:
+                            trees.append(tree) or api_json(self, tree, depth))
+        assert 'result' in build.dynamic_attrs
+        assert build.dynamic_attrs is build.dynamic_attrs
+        assert trees == ['*']
+        assert await async_build.dynamic_attrs == build.dynamic_attrs
+        assert 'WorkflowRun' in attr_registry.as_dict()
+
+    def test_warm(self, build, monkeypatch):
+        attr_registry.warm({'WorkflowRun': ['result', 'number']})
+        monkeypatch.setattr(type(build), 'api_json', None)
+        assert build.dynamic_attrs == ['result', 'number']
+        assert AttrRegistry.key(AsyncItem) == AttrRegistry.key(Item) == 'Item'
+
+
+class TestResolveClass:
+
+    @pytest.fixture(autouse=True)
+    def restore(self):
+        yield
+        _custom_classes.clear()
+        resolve_class.cache_clear()
+
+    def test_resolve_is_cached(self, jenkins, async_jenkins):
+        item = {'_class': 'hudson.model.FreeStyleProject', 'url': jenkins.url + 'job/a/'}
+        resolve_class.cache_clear()
+        assert isinstance(new_item(jenkins, 'api4jenkins.job', item), FreeStyleProject)
+        assert isinstance(new_item(jenkins, 'api4jenkins.job', item), FreeStyleProject)
+        assert isinstance(new_item(async_jenkins, 'api4jenkins.job', item), AsyncFreeStyleProject)
+        info = resolve_class.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+
+    @pytest.mark.parametrize('name', ['com.example.NewTypeProject', 'NewTypeProject'])
+    def test_register_class(self, jenkins, async_jenkins, name):
+        class NewTypeProject(Project):
+            pass
+
+        class AsyncNewTypeProject(AsyncProject):
+            pass
+        item = {'_class': 'com.example.NewTypeProject', 'url': jenkins.url + 'job/a/'}
+        with pytest.raises(AttributeError):
+            new_item(jenkins, 'api4jenkins.job', item)
+        register_class(name, NewTypeProject, AsyncNewTypeProject)
+        assert isinstance(new_item(jenkins, 'api4jenkins.job', item), NewTypeProject)
+        assert isinstance(new_item(async_jenkins, 'api4jenkins.job', item), AsyncNewTypeProject)
+
+    def test_register_overrides_module(self, jenkins, async_jenkins):
+        class MyFreeStyleProject(FreeStyleProject):
+            pass
+        item = {'_class': 'hudson.model.FreeStyleProject', 'url': jenkins.url + 'job/a/'}
+        new_item(jenkins, 'api4jenkins.job', item)
+        register_class('hudson.model.FreeStyleProject', MyFreeStyleProject)
+        assert isinstance(new_item(jenkins, 'api4jenkins.job', item), MyFreeStyleProject)
+        assert type(new_item(async_jenkins, 'api4jenkins.job', item)) is AsyncFreeStyleProject
+
+    def test_patch_to_clears_cache(self, jenkins, monkeypatch):
+        import api4jenkins.job
+        from api4jenkins import _patch_to
+
+        class FreeStyleProject(Project):
+            pass
+        item = {'_class': 'hudson.model.FreeStyleProject', 'url': jenkins.url + 'job/a/'}
+        new_item(jenkins, 'api4jenkins.job', item)
+        monkeypatch.setattr(api4jenkins.job, 'FreeStyleProject', api4jenkins.job.FreeStyleProject)
+        _patch_to('api4jenkins.job', FreeStyleProject)
+        assert type(new_item(jenkins, 'api4jenkins.job', item)) is FreeStyleProject
+
+
+class TestItemLayout:
+
+    def test_no_instance_dict(self, jenkins, async_jenkins):
+        for item in (FreeStyleProject(jenkins, jenkins.url + 'job/a/'),
+                     AsyncFreeStyleProject(async_jenkins, async_jenkins.url + 'job/a/')):
+            assert vars(item) == {}
+            assert item._request == item.jenkins.http_client.request
+
+    def test_build_getters_are_methods(self, jenkins):
+        assert 'get_last_build' not in vars(FreeStyleProject(jenkins, jenkins.url + 'job/a/'))
+        assert hasattr(Project, 'get_last_build')
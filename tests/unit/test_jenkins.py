@@ -1,13 +1,63 @@
+import sys
 import tempfile
 
+import httpx
 import pytest
-from httpx import HTTPTransport
+from httpx import HTTPTransport, Limits
 
 from api4jenkins.exceptions import BadRequestError, ItemNotFoundError
-from api4jenkins.http import _new_transport
-from api4jenkins.item import new_item, snake
+from api4jenkins.http import (_new_transport, new_async_http_client,
+                              new_http_client)
+from api4jenkins.index import JobIndex
+from api4jenkins.item import AsyncItem, Item, new_item, snake
 from api4jenkins.job import AsyncFolder, AsyncWorkflowJob, Folder, WorkflowJob
 
+from .conftest import load_json
+
+
+FOLDER = 'com.cloudbees.hudson.plugins.folder.Folder'
+JOB = 'hudson.model.FreeStyleProject'
+
+
+def _crawl_api_json(url, trees):
+    '''api_json of folders a/ -> b/ -> c/ and empty folder e/'''
+    children = {url: [('a', FOLDER), ('j1', JOB), ('e', FOLDER)],
+                f'{url}job/a/': [('b', FOLDER), ('j2', JOB)],
+                f'{url}job/a/job/b/': [('c', FOLDER)],
+                f'{url}job/a/job/b/job/c/': [('j3', JOB)],
+                f'{url}job/e/': []}
+
+    def listing(folder, levels):
+        jobs = []
+        for name, _class in children.get(folder, []):
+            job = {'_class': _class, 'url': f'{folder}job/{name}/'}
+            if levels and _class == FOLDER:
+                job['jobs'] = listing(job['url'], levels - 1)
+            jobs.append(job)
+        return jobs
+
+    def api_json(self, tree='', depth=0):
+        trees.append((self.url, tree))
+        if '{0,1}' in tree:
+            return {'jobs': [dict(job, jobs=job['jobs'][:1]) if 'jobs' in job else job
+                             for job in listing(self.url, 1)]}
+        return {'jobs': listing(self.url, tree.count('jobs[') - 1)}
+    return api_json
+
+
+def _index_api_json(url, calls):
+    jobs = {url: [{'name': 'folder', 'url': f'{url}job/folder/',
+                   '_class': 'com.cloudbees.hudson.plugins.folder.Folder'}],
+            f'{url}job/folder/': [{'name': 'pipeline', 'url': f'{url}job/folder/job/pipeline/',
+                                   '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowJob'}]}
+
+    def api_json(self, tree='', depth=0):
+        calls.append(self.url)
+        if self.url not in jobs:
+            raise ItemNotFoundError(self.url)
+        return {'jobs': jobs[self.url]}
+    return api_json
+
 
 class TestJenkins:
     def test_init(self, jenkins):
@@ -36,6 +86,20 @@ class TestJenkins:
         assert isinstance(job, type_)
         assert isinstance(jenkins[name], type_)
 
+    def test_get_job_with_one_request(self, jenkins, respx_mock):
+        job = jenkins.get_job('folder/pipeline')
+        assert job.url == f'{jenkins.url}job/folder/job/pipeline/'
+        assert respx_mock.calls.call_count == 1
+        assert respx_mock.calls.last.request.url.params['tree'] == '_class,url'
+
+    @pytest.mark.parametrize('response', [httpx.Response(200, text='<html>login</html>'),
+                                          httpx.Response(200, json={'_class': 'x', 'url': 'http://0.0.0.0:8080/job/folder/job/other/'})],
+                             ids=['not json', 'other job'])
+    def test_get_job_fallback_to_listing(self, jenkins, respx_mock, response):
+        respx_mock.routes['get_job'].mock(return_value=response)
+        assert isinstance(jenkins.get_job('folder/pipeline'), WorkflowJob)
+        assert jenkins.get_job('folder/not exist') is None
+
     @pytest.mark.parametrize(
         'headers',
         [{'X-Error': "A job already exists with the name 'folder'"}, {'X-Error': '@  is an unsafe character'}],
@@ -53,8 +117,8 @@ class TestJenkins:
         req_url = f'{jenkins.url}createItem?name=new_job'
         respx_mock.post(req_url)
         jenkins.create_job('new_job', 'xmldata')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize(
         'headers',
@@ -70,15 +134,15 @@ class TestJenkins:
         req_url = f'{jenkins.url}createItem?name=new_job&mode=copy&from=src_job'
         respx_mock.post(req_url)
         jenkins.copy_job('src_job', 'new_job')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     def test_delete_job(self, jenkins, respx_mock):
         req_url = f'{jenkins.url}job/folder/doDelete'
         respx_mock.post(req_url)
         jenkins.delete_job('folder')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize('name, exception', [('not exist', ItemNotFoundError), ('folder', AttributeError)])
     def test_build_job_fail(self, jenkins, name, exception):
@@ -105,7 +169,7 @@ class TestJenkins:
         req_url = f'{jenkins.url}job/{name}/{entry}'
         respx_mock.post(req_url).respond(headers={'Location': f'{jenkins.url}/queue/123'})
         jenkins.build_job(name.replace('/job/', '/'), **params)
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize(
         'url_entry, name', [('job/job/', 'job'), ('job/job/job/job/', 'job/job'), ('job/job/job/job', 'job/job')]
@@ -139,6 +203,62 @@ class TestJenkins:
         assert len(list(jenkins)) == 5
         assert len(list(jenkins(1))) == 5
 
+    def test_iter_jobs_stream(self, jenkins, respx_mock):
+        respx_mock.get(f'{jenkins.url}api/json').respond(json=load_json('jenkins/jenkins.json'))
+        assert list(jenkins.iter(1, stream=True)) == list(jenkins.iter(1))
+
+    def test_get_job_with_index(self, jenkins, monkeypatch, respx_mock):
+        calls = []
+        monkeypatch.setattr(Item, 'api_json', _index_api_json(jenkins.url, calls))
+        monkeypatch.setattr(jenkins, 'index', JobIndex())
+        for _ in range(3):
+            job = jenkins.get_job('folder/pipeline')
+            assert isinstance(job, WorkflowJob)
+            assert job.url == f'{jenkins.url}job/folder/job/pipeline/'
+        assert isinstance(jenkins.get_job('folder'), Folder)
+        assert calls == [f'{jenkins.url}job/folder/', jenkins.url]
+        assert jenkins.get_job('folder/missing') is None
+        assert jenkins.get_job('missing/job') is None
+        assert not respx_mock.calls
+
+    def test_index_invalidation(self, jenkins, monkeypatch, respx_mock):
+        monkeypatch.setattr(Item, 'api_json', _index_api_json(jenkins.url, []))
+        monkeypatch.setattr(jenkins, 'index', JobIndex())
+        job = jenkins.get_job('folder/pipeline')
+        respx_mock.post(f'{job.url}confirmRename').respond(
+            headers={'Location': f'{jenkins.url}job/folder/job/renamed/'})
+        job.rename('renamed')
+        assert jenkins.index.get('folder/pipeline') is None
+        job = jenkins.get_job('folder/pipeline')
+        respx_mock.post(f'{job.url}doDelete')
+        jenkins.delete_job('folder/pipeline')
+        assert jenkins.index.get('folder/pipeline') is None
+        jenkins.get_job('folder/pipeline')
+        respx_mock.post(f'{jenkins.url}job/folder/createItem')
+        jenkins.create_job('folder/pipeline', '<xml/>')
+        assert jenkins.index.get('folder/pipeline') is None
+
+    @pytest.mark.parametrize('depth,listings', [(0, 1), (1, 2), (2, 3), (3, 4)])
+    def test_crawl(self, jenkins, monkeypatch, depth, listings):
+        trees = []
+        monkeypatch.setattr(Item, 'api_json', _crawl_api_json(jenkins.url, trees))
+        jobs = list(jenkins.crawl(depth, workers=2))
+        # empty folder e/ is not listed
+        assert len(trees) == listings
+        assert all(tree in ('jobs[url]', 'jobs[url,jobs[url]{0,1}]') for _, tree in trees)
+        assert sorted(j.url for j in jobs) == sorted(j.url for j in jenkins.iter(depth))
+
+    def test_crawl_skip_removed_folder(self, jenkins, monkeypatch):
+        api_json = _crawl_api_json(jenkins.url, [])
+
+        def _api_json(self, tree='', depth=0):
+            if self.url.endswith('job/a/'):
+                raise ItemNotFoundError(self.url)
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(Item, 'api_json', _api_json)
+        assert [j.url for j in jenkins.crawl(1)][:3] == [
+            f'{jenkins.url}job/a/', f'{jenkins.url}job/j1/', f'{jenkins.url}job/e/']
+
     def test_no_class_for_item(self, jenkins):
         with pytest.raises(AttributeError) as e:
             new_item(jenkins, 'api4jenkins.job', {'_class': 'NotExistItem', 'url': 'abc'})
@@ -147,20 +267,20 @@ class TestJenkins:
         req_url = f'{folder.url}move/move'
         respx_mock.post(req_url).respond(headers={'Location': f'{jenkins.url}job/folder2/job/folder/'})
         jenkins.move_job('folder', 'folder2')
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     def test_rename(self, jenkins, folder, respx_mock):
         req_url = f'{folder.url}confirmRename?newName=folder2'
         respx_mock.post(req_url).respond(headers={'Location': f'{jenkins.url}job/folder2'})
         jenkins.rename_job('folder', 'folder2')
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     def test_dumplicate(self, jenkins, folder, respx_mock):
         respx_mock.get(f'{folder.url}config.xml')
         req_url = f'{jenkins.url}createItem?name=folder2'
         respx_mock.post(req_url)
         jenkins.duplicate_job('folder', 'folder2')
-        assert respx_mock.calls[1].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
 
 class TestAsyncJenkins:
@@ -191,6 +311,16 @@ class TestAsyncJenkins:
         assert isinstance(job, type_)
         assert isinstance(await async_jenkins[name], type_)
 
+    async def test_get_job_with_one_request(self, async_jenkins, respx_mock):
+        job = await async_jenkins.get_job('folder/pipeline')
+        assert job.url == f'{async_jenkins.url}job/folder/job/pipeline/'
+        assert respx_mock.calls.call_count == 1
+
+    async def test_get_job_fallback_to_listing(self, async_jenkins, respx_mock):
+        respx_mock.routes['get_job'].respond(200, text='<html>login</html>')
+        assert isinstance(await async_jenkins.get_job('folder/pipeline'), AsyncWorkflowJob)
+        assert await async_jenkins.get_job('folder/not exist') is None
+
     @pytest.mark.parametrize(
         'headers',
         [{'X-Error': "A job already exists with the name 'folder'"}, {'X-Error': '@  is an unsafe character'}],
@@ -208,8 +338,8 @@ class TestAsyncJenkins:
         req_url = f'{async_jenkins.url}createItem?name=new_job'
         respx_mock.post(req_url)
         await async_jenkins.create_job('new_job', 'xmldata')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize(
         'headers',
@@ -225,15 +355,15 @@ class TestAsyncJenkins:
         req_url = f'{async_jenkins.url}createItem?name=new_job&mode=copy&from=src_job'
         respx_mock.post(req_url)
         await async_jenkins.copy_job('src_job', 'new_job')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     async def test_delete_job(self, async_jenkins, respx_mock):
         req_url = f'{async_jenkins.url}job/folder/doDelete'
         respx_mock.post(req_url)
         await async_jenkins.delete_job('folder')
-        assert respx_mock.calls[0].response.status_code == 200
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.response.status_code == 200
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize('name, exception', [('not exist', ItemNotFoundError), ('folder', AttributeError)])
     async def test_build_job_fail(self, async_jenkins, name, exception):
@@ -260,7 +390,7 @@ class TestAsyncJenkins:
         req_url = f'{async_jenkins.url}job/{name}/{entry}'
         respx_mock.post(req_url).respond(headers={'Location': f'{async_jenkins.url}/queue/123'})
         await async_jenkins.build_job(name.replace('/job/', '/'), **params)
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     @pytest.mark.parametrize(
         'url_entry, name', [('job/job/', 'job'), ('job/job/job/job/', 'job/job'), ('job/job/job/job', 'job/job')]
@@ -293,6 +423,36 @@ class TestAsyncJenkins:
         assert len([j async for j in async_jenkins]) == 5
         assert len([j async for j in async_jenkins]) == 5
 
+    async def test_iter_jobs_stream(self, async_jenkins, respx_mock):
+        respx_mock.get(f'{async_jenkins.url}api/json').respond(json=load_json('jenkins/jenkins.json'))
+        jobs = [j async for j in async_jenkins.aiter(1, stream=True)]
+        assert jobs == [j async for j in async_jenkins.aiter(1)]
+
+    async def test_get_job_with_index(self, async_jenkins, monkeypatch):
+        calls = []
+        api_json = _index_api_json(async_jenkins.url, calls)
+
+        async def _api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(AsyncItem, 'api_json', _api_json)
+        monkeypatch.setattr(async_jenkins, 'index', JobIndex())
+        for _ in range(3):
+            assert isinstance(await async_jenkins.get_job('folder/pipeline'), AsyncWorkflowJob)
+        assert calls == [f'{async_jenkins.url}job/folder/']
+        assert await async_jenkins.get_job('missing/job') is None
+
+    @pytest.mark.parametrize('depth,listings', [(0, 1), (3, 4)])
+    async def test_crawl(self, async_jenkins, monkeypatch, depth, listings):
+        trees = []
+        api_json = _crawl_api_json(async_jenkins.url, trees)
+
+        async def _api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(AsyncItem, 'api_json', _api_json)
+        jobs = [j async for j in async_jenkins.crawl(depth, workers=2)]
+        assert len(trees) == listings
+        assert sorted(j.url for j in jobs) == sorted(j.url for j in [j async for j in async_jenkins.aiter(depth)])
+
     async def test_no_class_for_item(self, async_jenkins):
         with pytest.raises(AttributeError) as e:
             new_item(async_jenkins, 'api4jenkins.job', {'_class': 'NotExistItem', 'url': 'abc'})
@@ -301,20 +461,20 @@ class TestAsyncJenkins:
         req_url = f'{async_folder.url}move/move'
         respx_mock.post(req_url).respond(headers={'Location': f'{async_jenkins.url}job/folder2/job/folder/'})
         await async_jenkins.move_job('folder', 'folder2')
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     async def test_rename(self, async_jenkins, async_folder, respx_mock):
         req_url = f'{async_folder.url}confirmRename?newName=folder2'
         respx_mock.post(req_url).respond(headers={'Location': f'{async_jenkins.url}job/folder2'})
         await async_jenkins.rename_job('folder', 'folder2')
-        assert respx_mock.calls[0].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
     async def test_dumplicate(self, async_jenkins, async_folder, respx_mock):
         respx_mock.get(f'{async_folder.url}config.xml')
         req_url = f'{async_jenkins.url}createItem?name=folder2'
         respx_mock.post(req_url)
         await async_jenkins.duplicate_job('folder', 'folder2')
-        assert respx_mock.calls[1].request.url == req_url
+        assert respx_mock.calls.last.request.url == req_url
 
 
 def test_new_transport():
@@ -322,3 +482,39 @@ def test_new_transport():
     trans = _new_transport(HTTPTransport, kwargs)
     assert isinstance(trans, HTTPTransport)
     assert kwargs == {'other': '1111'}
+
+
+@pytest.mark.parametrize('new_client', [new_http_client, new_async_http_client])
+@pytest.mark.parametrize(
+    'pool, expected',
+    [
+        ({'max_connections': 10, 'max_keepalive_connections': 5, 'keepalive_expiry': 30}, (10, 5, 30)),
+        ({'keepalive_expiry': 1}, (100, 20, 1)),
+        (Limits(max_connections=3, max_keepalive_connections=1), (3, 1, 5.0)),
+    ],
+    ids=['dict', 'partial dict', 'limits'],
+)
+def test_new_client_with_pool(new_client, pool, expected):
+    client = new_client(pool=pool)
+    conn_pool = client._transport._pool
+    assert (conn_pool._max_connections, conn_pool._max_keepalive_connections,
+            conn_pool._keepalive_expiry) == expected
+
+
+def test_new_client_with_invalid_pool():
+    with pytest.raises(ValueError, match='Unknown pool options'):
+        new_http_client(pool={'max_size': 10})
+
+
+@pytest.mark.parametrize('new_client', [new_http_client, new_async_http_client])
+@pytest.mark.parametrize('kwargs', [{'http2': True}, {'pool': {'http2': True}}], ids=['kwarg', 'pool'])
+def test_new_client_with_http2(new_client, kwargs):
+    pytest.importorskip('h2')
+    client = new_client(**kwargs)
+    assert client._transport._pool._http2 is True
+
+
+def test_new_client_with_http2_without_h2(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'h2', None)
+    with pytest.raises(ImportError, match='api4jenkins\\[http2\\]'):
+        new_async_http_client(http2=True)
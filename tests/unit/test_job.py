@@ -1,8 +1,35 @@
 # encoding: utf-8
+from itertools import islice
+
+import httpx
 import pytest
 
 from api4jenkins.build import AsyncWorkflowRun, WorkflowRun
 from api4jenkins.item import snake
+from api4jenkins.job import AsyncWorkflowJob, WorkflowJob
+
+
+def _paged_api_json(builds, trees):
+    '''api_json which honors range of tree, e.g. builds[url]{0,10}'''
+    def api_json(self, tree='', depth=0):
+        trees.append(tree)
+        key, _, page = tree.partition('[')
+        if '{' not in page:
+            return {key: builds}
+        start, end = page.rsplit('{', 1)[1].rstrip('}').split(',')
+        return {key: builds[int(start):int(end)]}
+    return api_json
+
+
+@pytest.fixture
+def builds(url):
+    return [{'number': i, 'url': f'{url}job/folder/job/pipeline/{i}/',
+             '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun',
+             'result': None if i == 250 else ['SUCCESS', 'FAILURE'][i % 2],
+             'building': i == 250, 'timestamp': i * 60000, 'duration': i * 1000,
+             'actions': [{}, {'causes': [{'_class': 'hudson.triggers.TimerTrigger$TimerTriggerCause',
+                                          'shortDescription': 'Started by timer'}]}] if i % 10 == 0 else [{}]}
+            for i in range(250, 0, -1)]
 
 
 class TestFolder:
@@ -55,6 +82,40 @@ class TestProject:
         build = job[f'#{number}']
         assert isinstance(build, obj)
 
+    def test_get_build_by_number_with_one_request(self, job, respx_mock, monkeypatch):
+        monkeypatch.setattr(type(job), 'api_json', None)
+        assert job.get(52).url.endswith('/52/')
+        assert respx_mock.calls.call_count == 1
+        assert respx_mock.calls.last.request.url.params['tree'] == '_class,url'
+
+    def test_get_build_by_display_name_with_index(self, jenkins, respx_mock, monkeypatch):
+        job = WorkflowJob(jenkins, f'{jenkins.url}job/folder/job/pipeline/')
+        calls = []
+        origin = type(job).api_json
+        monkeypatch.setattr(type(job), 'api_json', lambda self, tree='', depth=0:
+                            calls.append(tree) or origin(self, tree, depth))
+        assert job.get('#52').url.endswith('/52/')
+        assert job.get('#51').url.endswith('/51/')
+        assert len(calls) == 1
+        assert job.get('#100') is None
+        assert len(calls) == 2
+
+    def test_get_build_by_repeated_display_name(self, jenkins, respx_mock, monkeypatch):
+        job = WorkflowJob(jenkins, f'{jenkins.url}job/folder/job/pipeline/')
+        builds = [{'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun', 'number': n,
+                   'displayName': 'rel', 'url': f'{job.url}{n}/'} for n in (52, 51)]
+        calls = []
+        monkeypatch.setattr(type(job), 'api_json', lambda self, tree='', depth=0:
+                            calls.append(tree) or {'builds': builds})
+        route = respx_mock.routes['check_build'].mock(side_effect=lambda request: httpx.Response(
+            200, json=builds[0]) if builds[0]['url'] in str(request.url) else httpx.Response(404))
+        assert [job.get('rel').url for _ in range(3)] == [f'{job.url}52/'] * 3
+        assert (len(calls), route.call_count) == (1, 2)
+        # build is deleted after index is built
+        del builds[0]
+        assert job.get('rel').url == f'{job.url}51/'
+        assert len(calls) == 2
+
     @pytest.mark.parametrize('key', ['firstBuild', 'lastBuild', 'lastCompletedBuild',
                                      'lastFailedBuild', 'lastStableBuild', 'lastUnstableBuild',
                                      'lastSuccessfulBuild', 'lastUnsuccessfulBuild'])
@@ -67,6 +128,73 @@ class TestProject:
         builds = list(job)
         assert len(builds) == 8
 
+    def test_iter_builds_by_page(self, job, builds, monkeypatch):
+        trees = []
+        monkeypatch.setattr(type(job), 'api_json', _paged_api_json(builds, trees))
+        assert [b.url for b in islice(job.iter(page_size=20), 20)] == [b['url'] for b in builds[:20]]
+        assert trees == ['builds[number,url]{0,20}']
+        trees.clear()
+        assert len(list(job.iter_all_builds())) == 250
+        # pages overlap by one build to detect deleted builds
+        assert trees == ['allBuilds[number,url]{0,100}', 'allBuilds[number,url]{99,199}',
+                         'allBuilds[number,url]{198,298}']
+        trees.clear()
+        assert len(list(job.iter_all_builds(page_size=None))) == 250
+        assert trees == ['allBuilds[number,url]']
+
+    @pytest.mark.parametrize('change', ['insert', 'delete'])
+    def test_iter_builds_while_changing(self, job, builds, monkeypatch, change):
+        trees = []
+        api_json = _paged_api_json(builds, trees)
+
+        def _changing(self, tree='', depth=0):
+            if len(trees) == 1:
+                if change == 'insert':
+                    builds[:0] = [dict(builds[0], number=n, url=f'{job.url}{n}/') for n in (252, 251)]
+                else:
+                    del builds[:3]
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(type(job), 'api_json', _changing)
+        numbers = [int(b.url.rstrip('/').rsplit('/', 1)[1]) for b in job.iter_all_builds(page_size=20)]
+        assert numbers == list(range(250, 0, -1))
+
+    @pytest.mark.parametrize('filters, numbers', [
+        ({'result': 'FAILURE'}, list(range(249, 0, -2))),
+        ({'building': True}, [250]),
+        ({'since': 240 * 60, 'until': 245 * 60}, [244, 243, 242, 241, 240]),
+        ({'min_duration': 248, 'max_duration': 249}, [249, 248]),
+        ({'cause': 'Started by timer', 'result': 'SUCCESS'}, list(range(240, 0, -10))),
+        ({'cause': 'TimerTriggerCause', 'since': 200 * 60}, [250, 240, 230, 220, 210, 200])],
+        ids=['result', 'building', 'time', 'duration', 'cause', 'cause class'])
+    def test_filter_builds(self, job, builds, monkeypatch, filters, numbers):
+        trees = []
+        monkeypatch.setattr(type(job), 'api_json', _paged_api_json(builds, trees))
+        assert [b.url for b in job.filter_builds(**filters)] == \
+            [f'{job.url}{n}/' for n in numbers]
+        fields = 'number,url,result,timestamp,duration,building'
+        if 'cause' in filters:
+            fields += ',actions[causes[shortDescription]]'
+        assert trees[0] == f'builds[{fields}]{{0,100}}'
+        if 'since' in filters:
+            assert len(trees) == 1
+
+    def test_filter_builds_by_result(self, job, builds, monkeypatch):
+        trees = []
+        monkeypatch.setattr(type(job), 'api_json', _paged_api_json(builds, trees))
+        assert len(list(job.filter_builds_by_result(result='SUCCESS'))) == 124
+        assert len(trees) == 3
+        with pytest.raises(ValueError):
+            list(job.filter_builds_by_result(result='not a status'))
+
+    def test_iter_all_builds_stream(self, job, respx_mock):
+        all_builds = [{'number': i, 'url': f'{job.url}{i}/',
+                       '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun'}
+                      for i in range(3, 0, -1)]
+        respx_mock.get(f'{job.url}api/json').respond(json={'allBuilds': all_builds})
+        builds = list(job.iter_all_builds(stream=True))
+        assert [b.url for b in builds] == [b['url'] for b in all_builds]
+        assert isinstance(builds[0], WorkflowRun)
+
     @pytest.mark.parametrize('action', ['enable', 'disable'])
     def test_enable_disable(self, job, respx_mock, action):
         req_url = f'{job.url}{action}'
@@ -128,6 +256,16 @@ class TestAsyncProject:
         build = await async_job[f'#{number}']
         assert isinstance(build, obj)
 
+    async def test_get_build_by_number_with_one_request(self, async_job, respx_mock):
+        assert (await async_job.get(52)).url.endswith('/52/')
+        assert respx_mock.calls.call_count == 1
+
+    async def test_get_build_by_display_name_with_index(self, async_jenkins, respx_mock, monkeypatch):
+        job = AsyncWorkflowJob(async_jenkins, f'{async_jenkins.url}job/folder/job/pipeline/')
+        assert (await job.get('#52')).url.endswith('/52/')
+        monkeypatch.setattr(type(job), 'api_json', None)
+        assert (await job.get('#51')).url.endswith('/51/')
+
     @pytest.mark.parametrize('key', ['firstBuild', 'lastBuild', 'lastCompletedBuild',
                                      'lastFailedBuild', 'lastStableBuild', 'lastUnstableBuild',
                                      'lastSuccessfulBuild', 'lastUnsuccessfulBuild'])
@@ -141,6 +279,43 @@ class TestAsyncProject:
         builds = [b async for b in async_job]
         assert len(builds) == 8
 
+    async def test_iter_builds_by_page(self, async_job, builds, monkeypatch):
+        trees = []
+        api_json = _paged_api_json(builds, trees)
+
+        async def _api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(type(async_job), 'api_json', _api_json)
+        async for build in async_job.aiter(page_size=20):
+            assert build.url == builds[0]['url']
+            break
+        assert trees == ['builds[number,url]{0,20}']
+        assert len([b async for b in async_job.iter_all_builds(page_size=200)]) == 250
+        assert len(trees) == 3
+
+    async def test_filter_builds(self, async_job, builds, monkeypatch):
+        trees = []
+        api_json = _paged_api_json(builds, trees)
+
+        async def _api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(type(async_job), 'api_json', _api_json)
+        found = [b async for b in async_job.filter_builds_by_result(result='FAILURE')]
+        assert len(found) == 125
+        assert len(trees) == 3
+        found = [b async for b in async_job.filter_builds(since=249 * 60, all_builds=True)]
+        assert [b.url for b in found] == [f'{async_job.url}250/', f'{async_job.url}249/']
+        assert trees[-1].startswith('allBuilds[')
+
+    async def test_iter_all_builds_stream(self, async_job, respx_mock):
+        all_builds = [{'number': i, 'url': f'{async_job.url}{i}/',
+                       '_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun'}
+                      for i in range(3, 0, -1)]
+        respx_mock.get(f'{async_job.url}api/json').respond(json={'allBuilds': all_builds})
+        builds = [b async for b in async_job.iter_all_builds(stream=True)]
+        assert [b.url for b in builds] == [b['url'] for b in all_builds]
+        assert isinstance(builds[0], AsyncWorkflowRun)
+
     @pytest.mark.parametrize('action', ['enable', 'disable'])
     async def test_enable_disable(self, async_job, respx_mock, action):
         req_url = f'{async_job.url}{action}'
@@ -1,20 +1,105 @@
 # encoding: utf-8
 
+import asyncio
+import time
+
 import pytest
 
 from api4jenkins.build import AsyncWorkflowRun, WorkflowRun
 from api4jenkins.job import AsyncWorkflowJob, WorkflowJob
-from api4jenkins.queue import AsyncQueueItem, QueueItem
-
-from .conftest import load_json
+from concurrent.futures import ThreadPoolExecutor
+
+from api4jenkins.item import AsyncItem, Item
+from api4jenkins.queue import (AsyncQueue, AsyncQueueItem, Queue, QueueItem,
+                               _executables_tree, _poll_tree)
+
+from .conftest import _api_json, load_json
+
+
+def _poll_api_json(types, trees):
+    '''api_json of queue item which returns given types one by one'''
+    types = iter(types)
+
+    def api_json(self, tree='', depth=0):
+        trees.append(tree)
+        if isinstance(self, (QueueItem, AsyncQueueItem)):
+            data = load_json(f'queue/{next(types)}.json')
+            if tree == _poll_tree:
+                data = {k: data[k] for k in ('_class', 'cancelled', 'executable') if k in data}
+            return data
+        return _api_json(self, tree, depth)
+    return api_json
+
+
+def _watch_api_json(left, calls):
+    '''queue listing drops item after given polls, item 3 is cancelled'''
+    polls = []
+
+    def api_json(self, tree='', depth=0):
+        calls.append(type(self).__name__)
+        if isinstance(self, (Queue, AsyncQueue)):
+            polls.append(tree)
+            return {'items': [{'id': id, 'url': f'queue/item/{id}/', 'why': 'waiting',
+                               '_class': 'hudson.model.Queue$BuildableItem'}
+                              for id, n in left.items() if len(polls) < n]}
+        if self.id == 3:
+            return {'_class': 'hudson.model.Queue$LeftItem', 'cancelled': True}
+        return {'_class': 'hudson.model.Queue$LeftItem',
+                'executable': {'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun',
+                               'url': f'{self.jenkins.url}job/folder/job/pipeline/{self.id}/'}}
+    return api_json
+
+
+def _flaky_api_json(failures, calls):
+    '''queue listing fails given times, item 1 is starting at first poll'''
+    def api_json(self, tree='', depth=0):
+        calls.append(type(self).__name__)
+        if isinstance(self, (Queue, AsyncQueue)):
+            if calls.count(type(self).__name__) <= failures:
+                raise ConnectionError('502 Bad Gateway')
+            return {'items': []}
+        if calls.count(type(self).__name__) == 1:
+            return {'_class': 'hudson.model.Queue$LeftItem', 'cancelled': False, 'executable': None}
+        return {'_class': 'hudson.model.Queue$LeftItem', 'cancelled': False,
+                'executable': {'_class': 'org.jenkinsci.plugins.workflow.job.WorkflowRun',
+                               'url': f'{self.jenkins.url}job/folder/job/pipeline/{self.id}/'}}
+    return api_json
 
 
 class TestQueue:
 
-    @pytest.mark.parametrize('id_, obj',
-                             [(1, type(None)), (669, QueueItem)])
-    def test_get(self, jenkins, id_, obj):
-        assert isinstance(jenkins.queue.get(id_), obj)
+    @pytest.mark.parametrize('id_, status, obj',
+                             [(1, 404, type(None)), (669, 200, QueueItem), ('599', 200, QueueItem)])
+    def test_get(self, jenkins, respx_mock, id_, status, obj):
+        respx_mock.get(f'{jenkins.url}queue/item/{id_}/api/json?tree=id').respond(status, json={'id': id_})
+        item = jenkins.queue.get(id_)
+        assert isinstance(item, obj)
+        assert len(respx_mock.calls) == 1
+        if item:
+            assert item.id == int(id_)
+
+    def test_get_many(self, jenkins, respx_mock):
+        items = jenkins.queue.get_many([669, '668', 1])
+        assert [item and item.id for item in items.values()] == [669, 668, None]
+        assert not respx_mock.calls
+
+    def test_get_from_watcher(self, jenkins, respx_mock):
+        watcher = jenkins.queue.watch()
+        watcher.items = {669: {'id': 669, 'url': 'queue/item/669/'}}
+        watcher.polls, watcher.polled_at = 1, time.monotonic()
+        assert jenkins.queue.get(669, watcher=watcher).id == 669
+        assert list(jenkins.queue.get_many([669, 700], watcher=watcher).values())[1] is None
+        assert not respx_mock.calls
+
+    def test_get_from_stale_watcher(self, jenkins, respx_mock):
+        watcher = jenkins.queue.watch(interval=1)
+        # watcher stopped polling long ago, item 700 left and 668 entered queue
+        watcher.items = {700: {'id': 700, 'url': 'queue/item/700/'}}
+        watcher.polls, watcher.polled_at = 1, time.monotonic() - 10
+        items = jenkins.queue.get_many([700, 668], watcher=watcher)
+        assert [item and item.id for item in items.values()] == [None, 668]
+        respx_mock.get(f'{jenkins.url}queue/item/700/api/json?tree=id').respond(404)
+        assert jenkins.queue.get(700, watcher=watcher) is None
 
     def test_iter(self, jenkins):
         items = list(jenkins.queue)
@@ -26,6 +111,43 @@ class TestQueue:
         jenkins.queue.cancel(0)
         assert respx_mock.calls[0].request.url == req_url
 
+    def test_watch(self, jenkins, monkeypatch):
+        calls = []
+        monkeypatch.setattr(Item, 'api_json', _watch_api_json({1: 2, 2: 3, 3: 2}, calls))
+        watcher = jenkins.queue.watch(interval=0.01)
+        items = [QueueItem(jenkins, f'{jenkins.url}queue/item/{id}/') for id in (1, 1, 2, 3)]
+        with ThreadPoolExecutor(4) as pool:
+            builds = list(pool.map(watcher.wait_for_build, items))
+        assert [b and b.url for b in builds] == [f'{jenkins.url}job/folder/job/pipeline/1/'] * 2 + [
+            f'{jenkins.url}job/folder/job/pipeline/2/', None]
+        assert calls.count('Queue') == watcher.polls == 3
+        assert calls.count('QueueItem') == 3
+        assert watcher.get(1) is None
+
+    def test_watch_retry(self, jenkins, monkeypatch):
+        calls = []
+        monkeypatch.setattr(Item, 'api_json', _flaky_api_json(2, calls))
+        watcher = jenkins.queue.watch(interval=0.01)
+        build = watcher.wait_for_build(QueueItem(jenkins, f'{jenkins.url}queue/item/1/'))
+        assert build.url == f'{jenkins.url}job/folder/job/pipeline/1/'
+        assert calls == ['Queue'] * 3 + ['QueueItem', 'Queue', 'QueueItem']
+
+    def test_watch_error(self, jenkins, monkeypatch):
+        calls = []
+        monkeypatch.setattr(Item, 'api_json', _flaky_api_json(100, calls))
+        watcher = jenkins.queue.watch(interval=0.01, max_errors=2)
+        with pytest.raises(ConnectionError):
+            watcher.wait_for_build(QueueItem(jenkins, f'{jenkins.url}queue/item/1/'))
+        assert calls == ['Queue'] * 2
+
+    def test_watch_timeout(self, jenkins, monkeypatch):
+        monkeypatch.setattr(Item, 'api_json', _watch_api_json({1: 100}, []))
+        watcher = jenkins.queue.watch(interval=0.01)
+        item = QueueItem(jenkins, f'{jenkins.url}queue/item/1/')
+        with pytest.raises(TimeoutError):
+            item.wait_for_build(timeout=0.05, watcher=watcher)
+        assert watcher.get(1)['why'] == 'waiting'
+
 
 class TestQueueItem:
 
@@ -58,6 +180,63 @@ class TestQueueItem:
         build = item.get_build()
         assert isinstance(build, obj)
 
+    @pytest.mark.parametrize('type_, trees',
+                             [('leftitem', [_poll_tree]),
+                              ('buildableitem', [_poll_tree, _executables_tree])])
+    def test_get_build_without_request_per_build(self, jenkins, respx_mock, monkeypatch, type_, trees):
+        recorded = []
+        monkeypatch.setattr(Item, 'api_json', _poll_api_json([type_], recorded))
+        item = QueueItem(jenkins, f'{jenkins.url}queue/item/668/')
+        assert isinstance(item.get_build(), WorkflowRun)
+        assert isinstance(item.get_build(), WorkflowRun)
+        assert recorded == trees
+        assert not respx_mock.calls
+
+    def test_wait_for_build(self, jenkins, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr('api4jenkins.queue.time.sleep', sleeps.append)
+        monkeypatch.setattr(Item, 'api_json', _poll_api_json(
+            ['waitingitem', 'blockeditem', 'buildableitem', 'buildableitem', 'leftitem'], []))
+        item = QueueItem(jenkins, f'{jenkins.url}queue/item/599/')
+        build = item.wait_for_build(max_interval=3)
+        assert build.url == f'{jenkins.url}job/folder/job/pipeline/54/'
+        assert sleeps == [0.5, 1, 2, 3]
+
+    def test_wait_for_cancelled_item(self, jenkins, monkeypatch):
+        monkeypatch.setattr('api4jenkins.queue.time.sleep', lambda _: None)
+        api_json = _poll_api_json(['waitingitem', 'leftitem'], [])
+
+        def _cancelled(self, tree='', depth=0):
+            data = api_json(self, tree, depth)
+            data.pop('executable', None)
+            data['cancelled'] = True
+            return data
+        monkeypatch.setattr(Item, 'api_json', _cancelled)
+        assert QueueItem(jenkins, f'{jenkins.url}queue/item/599/').wait_for_build() is None
+
+    def test_wait_for_left_item_without_build(self, jenkins, monkeypatch):
+        monkeypatch.setattr('api4jenkins.queue.time.sleep', lambda _: None)
+        api_json = _poll_api_json(['leftitem'] * 3, [])
+        polls = []
+
+        def _starting(self, tree='', depth=0):
+            data = api_json(self, tree, depth)
+            polls.append(tree)
+            # executor is assigned but build is not created yet
+            if len(polls) < 3:
+                data['executable'] = None
+            return data
+        monkeypatch.setattr(Item, 'api_json', _starting)
+        build = QueueItem(jenkins, f'{jenkins.url}queue/item/599/').wait_for_build()
+        assert build.url == f'{jenkins.url}job/folder/job/pipeline/54/'
+        assert len(polls) == 3
+
+    def test_wait_for_build_timeout(self, jenkins, monkeypatch):
+        monkeypatch.setattr('api4jenkins.queue.time.sleep', lambda _: None)
+        monkeypatch.setattr(Item, 'api_json', _poll_api_json(['blockeditem'] * 10, []))
+        with pytest.raises(TimeoutError):
+            QueueItem(jenkins, f'{jenkins.url}queue/item/669/').wait_for_build(timeout=2)
+
     def test_get_parameters(self, jenkins):
         item = QueueItem(jenkins, f'{jenkins.url}queue/item/668/')
         params = item.get_parameters()
@@ -71,11 +250,16 @@ class TestQueueItem:
 
 class TestAsyncQueue:
 
-    @pytest.mark.parametrize('id_, obj',
-                             [(1, type(None)), (669, AsyncQueueItem)])
-    async def test_get(self, async_jenkins, id_, obj):
+    @pytest.mark.parametrize('id_, status, obj',
+                             [(1, 404, type(None)), (669, 200, AsyncQueueItem)])
+    async def test_get(self, async_jenkins, respx_mock, id_, status, obj):
+        respx_mock.get(f'{async_jenkins.url}queue/item/{id_}/api/json?tree=id').respond(status, json={'id': id_})
         assert isinstance(await async_jenkins.queue.get(id_), obj)
 
+    async def test_get_many(self, async_jenkins):
+        items = await async_jenkins.queue.get_many([669, 1])
+        assert [item and item.id for item in items.values()] == [669, None]
+
     async def test_iter(self, async_jenkins):
         items = [i async for i in async_jenkins.queue]
         assert len(items) == 2
@@ -86,6 +270,45 @@ class TestAsyncQueue:
         await async_jenkins.queue.cancel(0)
         assert respx_mock.calls[0].request.url == req_url
 
+    async def test_watch(self, async_jenkins, monkeypatch):
+        calls = []
+        api_json = _watch_api_json({1: 2, 2: 3, 3: 2}, calls)
+
+        async def _async_api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(AsyncItem, 'api_json', _async_api_json)
+        watcher = async_jenkins.queue.watch(interval=0.01)
+        items = [AsyncQueueItem(async_jenkins, f'{async_jenkins.url}queue/item/{id}/') for id in (1, 1, 2, 3)]
+        builds = await asyncio.gather(*(item.wait_for_build(watcher=watcher) for item in items))
+        assert [b and b.url for b in builds] == [f'{async_jenkins.url}job/folder/job/pipeline/1/'] * 2 + [
+            f'{async_jenkins.url}job/folder/job/pipeline/2/', None]
+        assert calls.count('AsyncQueue') == watcher.polls == 3
+        assert calls.count('AsyncQueueItem') == 3
+
+    async def test_watch_retry(self, async_jenkins, monkeypatch):
+        calls = []
+        api_json = _flaky_api_json(2, calls)
+
+        async def _async_api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(AsyncItem, 'api_json', _async_api_json)
+        watcher = async_jenkins.queue.watch(interval=0.01)
+        build = await watcher.wait_for_build(AsyncQueueItem(async_jenkins, f'{async_jenkins.url}queue/item/1/'))
+        assert build.url == f'{async_jenkins.url}job/folder/job/pipeline/1/'
+        assert calls == ['AsyncQueue'] * 3 + ['AsyncQueueItem', 'AsyncQueue', 'AsyncQueueItem']
+
+    async def test_watch_timeout(self, async_jenkins, monkeypatch):
+        api_json = _watch_api_json({1: 100}, [])
+
+        async def _async_api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr(AsyncItem, 'api_json', _async_api_json)
+        watcher = async_jenkins.queue.watch(interval=0.01)
+        with pytest.raises(TimeoutError):
+            await watcher.wait_for_build(AsyncQueueItem(async_jenkins, f'{async_jenkins.url}queue/item/1/'), 0.05)
+        await asyncio.sleep(0.03)
+        assert watcher._task is None
+
 
 class TestAsyncQueueItem:
 
@@ -121,6 +344,21 @@ class TestAsyncQueueItem:
         monkeypatch.setattr(item, 'api_json', _api_json)
         assert isinstance(await item.get_build(), obj)
 
+    async def test_wait_for_build(self, async_jenkins, monkeypatch):
+        sleeps = []
+
+        async def _sleep(interval):
+            sleeps.append(interval)
+        api_json = _poll_api_json(['waitingitem', 'buildableitem', 'leftitem'], [])
+
+        async def _async_api_json(self, tree='', depth=0):
+            return api_json(self, tree, depth)
+        monkeypatch.setattr('api4jenkins.queue.asyncio.sleep', _sleep)
+        monkeypatch.setattr(AsyncItem, 'api_json', _async_api_json)
+        item = AsyncQueueItem(async_jenkins, f'{async_jenkins.url}queue/item/599/')
+        assert isinstance(await item.wait_for_build(), AsyncWorkflowRun)
+        assert sleeps == [0.5, 1]
+
     async def test_get_parameters(self, async_jenkins):
         item = AsyncQueueItem(
             async_jenkins, f'{async_jenkins.url}queue/item/668/')
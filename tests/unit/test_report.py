@@ -1,5 +1,7 @@
 import pytest
 
+from .conftest import load_json
+
 
 @pytest.fixture
 def suite(build):
@@ -26,6 +28,15 @@ class TestTestReport:
         assert len(list(test_report)) == 1
         assert len(list(test_report.suites)) == 1
 
+    def test_iterate_stream(self, test_report, respx_mock):
+        report = load_json('report/test_report.json')
+        respx_mock.get(f'{test_report.url}api/json').respond(json=report)
+        suites = list(test_report.iter(stream=True))
+        assert [s.raw for s in suites] == report['suites']
+        cases = list(test_report.iter_cases(stream=True))
+        assert [c.raw for c in cases] == [c.raw for c in test_report.iter_cases()]
+        assert cases[0].name == 'test_exists'
+
 
 class TestTestSuite:
 
@@ -104,6 +115,14 @@ class TestAsyncTestReport:
         assert len([s async for s in async_test_report]) == 1
         assert len([s async for s in async_test_report.suites]) == 1
 
+    async def test_iterate_stream(self, async_test_report, respx_mock):
+        report = load_json('report/test_report.json')
+        respx_mock.get(f'{async_test_report.url}api/json').respond(json=report)
+        suites = [s async for s in async_test_report.aiter(stream=True)]
+        assert [s.raw for s in suites] == report['suites']
+        cases = [c async for c in async_test_report.iter_cases(stream=True)]
+        assert [c.raw for c in cases] == [c.raw async for c in async_test_report.iter_cases()]
+
 
 class TestAsyncCoverageReport:
 